@@ -1,63 +1,149 @@
 from resources import resources
 import os
-from pathlib import Path
-import glob
-from functools import lru_cache
+import json
 
 Debug = False
 
 class SystemPath(object):
+    """
+    Поиск иконок интерфейса в resources/Icons.
+
+    Индекс строится один раз: имя файла без расширения -> пути. Он сохраняется
+    в манифест resources/icon_index.json вместе со временем изменения каждой
+    папки. При следующем запуске проверяются только папки, а дерево файлов
+    заново обходится лишь если какая-то из них изменилась.
+
+    Из записей манифеста строятся индексы: по точному имени, по папке и по
+    подстрокам имени длиной до GRAM символов для запасного поиска по подстроке.
+    """
+
+    MANIFEST_VERSION = 1
+    EXTENSIONS = (".png", ".jpg")
+    GRAM = 3
+
     def __init__(self):
         self.path = resources()
-        folder = f"{self.path}/resources/Icons"
-        allImageFile = []            
-
-        for item in glob.glob(f'{folder}/**/*.png', recursive=True):
-            if(os.path.splitext(item)[1] == ".png"):
-                allImageFile.append(((str(Path(item)),os.path.splitext(os.path.basename(item))[0])))
-                
-        for item in glob.glob(f'{folder}/**/*.jpg', recursive=True):
-            if(os.path.splitext(item)[1] == ".jpg"):
-                allImageFile.append(((str(Path(item)),os.path.splitext(os.path.basename(item))[0])))
-                
-        self.listImages = allImageFile
-        
-    @lru_cache()
+        self.root = str(self.path).replace("\\", "/")
+        self.folder = os.path.join(self.path, "resources", "Icons")
+        self.manifest_path = os.path.join(self.path, "resources", "icon_index.json")
+
+        self.entries = self._load_manifest()
+        if self.entries is None:
+            self.entries, dirs = self._scan()
+            self._save_manifest(dirs)
+
+        # Точное имя -> номера записей в порядке обхода (сначала png, потом jpg)
+        self.by_stem = {}
+        # Папка -> номера ее записей
+        self.by_dir = {}
+        # Подстрока имени (до GRAM символов) -> номера записей, в которых она есть
+        self.by_gram = {}
+        for number, (relpath, stem) in enumerate(self.entries):
+            self.by_stem.setdefault(stem, []).append(number)
+            self.by_dir.setdefault(relpath.rsplit("/", 1)[0], []).append(number)
+            grams = {stem[i:i + size] for size in range(1, self.GRAM + 1) for i in range(len(stem) - size + 1)}
+            for gram in grams:
+                self.by_gram.setdefault(gram, []).append(number)
+        # Папка запроса -> номера записей в подходящих папках
+        self._scopes = {}
+        # Кэш результатов get(), включая запасной поиск по подстроке
+        self._resolved = {}
+
+    @property
+    def listImages(self):
+        return [(f"{self.root}/{relpath}", stem) for relpath, stem in self.entries]
+
+    def _scan(self):
+        """Обходит resources/Icons, возвращает записи (относительный путь, имя) и время изменения папок"""
+        files = {extension: [] for extension in self.EXTENSIONS}
+        dirs = {}
+        for directory, subdirs, filenames in os.walk(self.folder):
+            subdirs.sort()
+            reldir = os.path.relpath(directory, self.path).replace("\\", "/")
+            dirs[reldir] = os.stat(directory).st_mtime_ns
+            for filename in sorted(filenames):
+                stem, extension = os.path.splitext(filename)
+                if extension in files:
+                    files[extension].append((f"{reldir}/{filename}", stem))
+        entries = [entry for extension in self.EXTENSIONS for entry in files[extension]]
+        if(Debug):
+            print(f"[DEBUG : Pathes] scanned {len(entries)} icons in {len(dirs)} folders")
+        return entries, dirs
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != self.MANIFEST_VERSION:
+            return None
+        dirs = manifest.get("dirs") or {}
+        if not dirs:
+            return None
+        for reldir, mtime in dirs.items():
+            try:
+                if os.stat(os.path.join(self.path, reldir)).st_mtime_ns != mtime:
+                    return None
+            except OSError:
+                return None
+        return [tuple(entry) for entry in manifest.get("entries", [])]
+
+    def _save_manifest(self, dirs):
+        manifest = {"version": self.MANIFEST_VERSION, "dirs": dirs, "entries": self.entries}
+        temp_path = f"{self.manifest_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            print(f"[Pathes] Can`t write icon index: {e}")
+
+    def _scope(self, path):
+        """Номера записей в папках, путь которых содержит path; None - без ограничения"""
+        if not path:
+            return None
+        scope = self._scopes.get(path)
+        if scope is None:
+            scope = frozenset(number for reldir, numbers in self.by_dir.items() if path in reldir
+                              for number in numbers)
+            self._scopes[path] = scope
+        return scope
+
+    def _find(self, name, path):
+        scope = self._scope(path)
+        # Точное совпадение имени
+        for number in self.by_stem.get(name, ()):
+            if scope is None or number in scope:
+                return number
+        # Запасной вариант: первый файл, имя которого содержит искомую строку.
+        # Проверяются только записи из самого короткого списка подстрок имени
+        if not name:
+            candidates = range(len(self.entries))
+        else:
+            size = min(len(name), self.GRAM)
+            candidates = min((self.by_gram.get(name[i:i + size], ()) for i in range(len(name) - size + 1)), key=len)
+        for number in candidates:
+            if (scope is None or number in scope) and name in self.entries[number][1]:
+                return number
+        return None
+
     def get(self, name : str, path : str = ""):
         if name is None:
             return None
-        find = None
         name = name.replace(".png","").replace(".jpg","")
-        
-        path_png = f"{resources()}\\{path}\\{name}.png"
-        if path_png in self.listImages:
-            return path_png
-        
-        path_jpg = f"{resources()}\\{path}\\{name}.jpg"
-        if path_jpg in self.listImages:
-            return path_jpg
-        
-        if name in self.listImages:
-            return self.listImages[name]
-        
-        for item in self.listImages:
-
-            if (name == item[1]) and (path in item[0]):
-                find = item[0]
-                return str((find).replace("\\", "/"))
-
-            if (name in item[1]) and (path in item[0]):
-                find = item[0]
-                return str((find).replace("\\", "/"))
-            
-            if (item[1].find(name) != -1) and (path in item[0]):
-                if(Debug):
-                    print(f"[DEBUG : Pathes] get path for name '{name}' | find and return : '{Path (item[0])}'  GOOD")
-                find = (item[0])
-                #return str(Path(find))
-                return str((find).replace("\\", "/"))
-                        
-        if(find == None):
-            if(Debug):
+        path = (path or "").replace("\\", "/")
+
+        key = (name, path)
+        if key in self._resolved:
+            return self._resolved[key]
+
+        number = self._find(name, path)
+        result = f"{self.root}/{self.entries[number][0]}" if number is not None else None
+        if(Debug):
+            if result is None:
                 print(f"[DEBUG : Pathes] get path for name '{name}' | ! CANT FIND FILE ! <ERROR>")
-            pass
\ No newline at end of file
+            else:
+                print(f"[DEBUG : Pathes] get path for name '{name}' | find and return : '{result}'  GOOD")
+        self._resolved[key] = result
+        return result
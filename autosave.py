@@ -0,0 +1,292 @@
+"""
+Autosave journal
+
+Edits of the open project are appended as small JSON records (one per line)
+to a journal file instead of re-saving the whole project:
+
+    {"seq": 12, "op": "mercenary", "wave": "Wave 1", "squad": "Squad 1", "index": 0, "data": {...}}
+
+Operations:
+    wave              whole wave (a wave created or reset)
+    remove_wave       wave deleted
+    wave_settings     Settings of a wave
+    add_squad         new squad (settings, empty InSquad)
+    remove_squad      squad deleted
+    squad             settings of a squad (everything except InSquad)
+    add_mercenary     mercenary inserted into a squad at a position
+    remove_mercenary  mercenary at a position removed from a squad
+    mercenary         stat of one mercenary, addressed by wave, squad and position
+    settings       GlobalSettings of the project
+    project_file   path of the project file
+
+Every `compact_records` records (or `compact_bytes` of journal) the journal
+is compacted: a snapshot of the project is taken, written on a background
+thread, and the journals it covers are deleted. Journals are numbered by
+generation; the snapshot stores the generation of the first journal that is
+not yet included in it, so a crash at any point of a compaction still
+replays correctly.
+
+A clean shutdown removes the files. Files left over at startup mean the
+previous session crashed: recover() replays the journals onto the snapshot
+and returns the project in the save format.
+"""
+import os
+import re
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from project_io import ProjectSaver, to_json_compatible
+from project_format import json_default
+
+JOURNAL_VERSION = 1
+SNAPSHOT_FILE = "snapshot.json"
+_JOURNAL_NAME = re.compile(r"^journal\.(\d+)\.jsonl$")
+
+
+def _split_global(project: dict) -> Tuple[Dict[str, Any], Optional[dict]]:
+    """Waves without GlobalSettings (kept by the first wave in the save format) and the settings themselves"""
+    waves = {}
+    settings = None
+    for name, wave in project.items():
+        if isinstance(wave, dict) and "GlobalSettings" in wave:
+            wave = dict(wave)
+            settings = wave.pop("GlobalSettings")
+        waves[name] = wave
+    return waves, settings
+
+
+def _join_global(waves: Dict[str, Any], settings: Optional[dict]) -> dict:
+    project = dict(waves)
+    if project and settings is not None:
+        first = next(iter(project))
+        project[first] = dict(project[first], GlobalSettings = settings)
+    return project
+
+
+def apply_record(state: dict, record: dict) -> None:
+    """
+    Apply one journal record to a replay state {"waves", "settings", "project_file"}
+
+    Records that point to something that no longer exists are skipped.
+    """
+    op = record.get("op")
+    waves = state["waves"]
+    wave = waves.get(record.get("wave"))
+    squads = wave.get("Squad") if isinstance(wave, dict) else None
+    squad = squads.get(record.get("squad")) if isinstance(squads, dict) else None
+    members = squad.get("InSquad") if isinstance(squad, dict) else None
+    if op == "wave":
+        waves[record["wave"]] = record["data"]
+    elif op == "remove_wave":
+        waves.pop(record["wave"], None)
+    elif op == "wave_settings":
+        if isinstance(wave, dict):
+            wave["Settings"] = record["data"]
+    elif op == "add_squad":
+        if isinstance(squads, dict):
+            squads[record["squad"]] = dict(record["data"], InSquad = [])
+    elif op == "remove_squad":
+        if isinstance(squads, dict):
+            squads.pop(record["squad"], None)
+    elif op == "squad":
+        if isinstance(squad, dict):
+            squad.update(record["data"])
+    elif op == "add_mercenary":
+        if members is not None and 0 <= record["index"] <= len(members):
+            members.insert(record["index"], record["data"])
+    elif op == "remove_mercenary":
+        if members is not None and 0 <= record["index"] < len(members):
+            members.pop(record["index"])
+    elif op == "mercenary":
+        if members is not None and 0 <= record["index"] < len(members):
+            members[record["index"]] = record["data"]
+    elif op == "settings":
+        state["settings"] = record["data"]
+    elif op == "project_file":
+        state["project_file"] = record["path"]
+
+
+class AutosaveJournal:
+    """
+    Append-only journal of project edits with background compaction
+
+    Usage:
+        journal = AutosaveJournal(folder, snapshot_provider=save_manager.snapshot)
+        recovered = journal.recover()        # previous session crashed?
+        journal.start(save_manager.snapshot(), project_file)
+        journal.record("wave_settings", wave="Wave 1", data={...})
+        journal.close()                      # clean shutdown
+    """
+
+    DEFAULT_COMPACT_RECORDS = 500
+    DEFAULT_COMPACT_BYTES = 1024 * 1024
+
+    def __init__(self, directory, snapshot_provider: Optional[Callable[[], dict]] = None,
+                 compact_records: int = DEFAULT_COMPACT_RECORDS, compact_bytes: int = DEFAULT_COMPACT_BYTES):
+        """
+        Args:
+            directory: Folder of the snapshot and journal files
+            snapshot_provider: Returns the current project in the save format (called on the GUI thread)
+            compact_records: Records after which the journal is compacted
+            compact_bytes: Journal size after which it is compacted
+        """
+        self.directory = Path(directory)
+        self.snapshot_provider = snapshot_provider
+        self.compact_records = compact_records
+        self.compact_bytes = compact_bytes
+        self.project_file: Optional[str] = None
+        self.generation = 0
+        self._journal = None
+        self._records = 0
+        self._bytes = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+        # Неоткрытые волны .gfp приходят в снимке сжатыми и распаковываются уже в фоне
+        self._saver = ProjectSaver(serializer=lambda data: json.dumps(data, default=json_default).encode("utf-8"))
+
+    @property
+    def active(self) -> bool:
+        return self._journal is not None
+
+    def _journal_path(self, generation: int) -> Path:
+        return self.directory / f"journal.{generation}.jsonl"
+
+    def _journals(self) -> List[Tuple[int, Path]]:
+        if not self.directory.is_dir():
+            return []
+        found = []
+        for entry in self.directory.iterdir():
+            match = _JOURNAL_NAME.match(entry.name)
+            if match:
+                found.append((int(match.group(1)), entry))
+        return sorted(found)
+
+    def has_session(self) -> bool:
+        """
+        Files of a session that did not shut down cleanly are present
+        """
+        return (self.directory / SNAPSHOT_FILE).exists() or bool(self._journals())
+
+    def recover(self) -> Optional[Tuple[dict, Optional[str]]]:
+        """
+        Replay the journals of a crashed session onto its last snapshot
+
+        Returns:
+            (project in the save format, project file path) or None if there is nothing to recover
+        """
+        try:
+            with open(self.directory / SNAPSHOT_FILE, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if snapshot.get("version") != JOURNAL_VERSION:
+            return None
+
+        waves, settings = _split_global(snapshot.get("project") or {})
+        state = {"waves": waves, "settings": settings, "project_file": snapshot.get("project_file")}
+        for generation, path in self._journals():
+            if generation < snapshot.get("generation", 0):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Последняя строка могла оборваться при аварии
+                        break
+                    apply_record(state, record)
+        if not state["waves"]:
+            return None
+        return _join_global(state["waves"], state["settings"]), state["project_file"]
+
+    def start(self, snapshot: dict, project_file: Optional[str] = None) -> None:
+        """
+        Begin a new session from `snapshot`; files of any previous session are removed
+        """
+        self._close_journal()
+        self._saver.wait()
+        self._remove_files()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.project_file = project_file
+        self.generation = 0
+        self._seq = 0
+        self.compact(snapshot)
+
+    def record(self, op: str, **fields) -> None:
+        """
+        Append an edit to the journal (no-op until start())
+        """
+        if self._journal is None:
+            return
+        self._seq += 1
+        fields["seq"] = self._seq
+        fields["op"] = op
+        line = json.dumps(to_json_compatible(fields)) + "\n"
+        with self._lock:
+            self._journal.write(line)
+            self._journal.flush()
+        self._records += 1
+        self._bytes += len(line)
+        if self._records >= self.compact_records or self._bytes >= self.compact_bytes:
+            self.compact()
+
+    def set_project_file(self, project_file: Optional[str]) -> None:
+        self.project_file = project_file
+        self.record("project_file", path = project_file)
+
+    def compact(self, snapshot: Optional[dict] = None) -> None:
+        """
+        Switch to a new journal and write a snapshot covering the old ones in the background
+
+        Args:
+            snapshot: Current project in the save format; taken from snapshot_provider when omitted
+        """
+        if snapshot is None:
+            if self.snapshot_provider is None:
+                return
+            snapshot = self.snapshot_provider()
+        self.generation += 1
+        generation = self.generation
+        self._close_journal()
+        self._journal = open(self._journal_path(generation), "a", encoding="utf-8")
+        self._records = 0
+        self._bytes = 0
+
+        data = {"version": JOURNAL_VERSION, "generation": generation,
+                "project_file": self.project_file, "project": snapshot}
+        self._saver.save(str(self.directory / SNAPSHOT_FILE), data,
+                         on_done = lambda path, error: error is None and self._remove_journals_before(generation))
+
+    def _remove_journals_before(self, generation: int) -> None:
+        for number, path in self._journals():
+            if number < generation:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _close_journal(self) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _remove_files(self) -> None:
+        for _, path in self._journals():
+            os.remove(path)
+        if (self.directory / SNAPSHOT_FILE).exists():
+            os.remove(self.directory / SNAPSHOT_FILE)
+
+    def close(self, discard: bool = True) -> None:
+        """
+        Stop journaling; on a clean shutdown the files are removed
+
+        Args:
+            discard: Remove the snapshot and the journals
+        """
+        self._close_journal()
+        self._saver.wait()
+        if discard:
+            self._remove_files()
@@ -0,0 +1,62 @@
+"""
+Benchmark for the game data store
+
+Compares importing the static library modules (cosmetic_libary, atribute_libary,
+weapons_libary, TemplateLibary, Icons_Archive) with opening the lazy store and
+looking up a few records. Each variant runs in a fresh interpreter so import
+caches and memory are not shared.
+
+Usage:
+    python benchmarks/bench_game_data.py
+"""
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss - base}}))
+"""
+
+SOURCE_MODULES = """
+from cosmetic_libary import Cosmetic
+from atribute_libary import Atribute
+from weapons_libary import Weapon_Libary
+from TemplateLibary import Template
+from Icons_Archive import icons
+Cosmetic["Mining Light"]; Template["T_TFBot_Giant_Scout"]; Weapon_Libary["Scout"]
+"""
+
+LAZY_STORE = """
+import game_data
+game_data.Cosmetic["Mining Light"]; game_data.Template["T_TFBot_Giant_Scout"]
+game_data.Weapon_Libary["Scout"]; game_data.Atribute; game_data.Icons
+"""
+
+
+def run(body):
+    code = MEASURE.format(root=ROOT, body=body)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    # Первый запуск строит хранилище и .pyc, он не измеряется
+    run(LAZY_STORE)
+    run(SOURCE_MODULES)
+    for title, body in (("source modules", SOURCE_MODULES), ("lazy store", LAZY_STORE)):
+        result = run(body)
+        print(f"{title:<16} {result['seconds'] * 1000:8.1f} ms   +{result['rss_kb'] / 1024:6.1f} MB RSS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark for the TF2ItemsParser binary cache
+
+Reports cold (parse items_game.txt and write the cache) and warm (load from
+the cache) times. Uses the given items_game.txt or a synthetic one.
+
+Usage:
+    python benchmarks/bench_items_cache.py [path/to/items_game.txt] [size_mb]
+"""
+import os
+import sys
+import time
+import tempfile
+import contextlib
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tf2_items_parser import TF2ItemsParser
+from bench_vdf_parser import generate_vdf
+
+
+def timed_load(items_file: str, cache_path: str) -> float:
+    parser = TF2ItemsParser(items_file, cache_path=cache_path)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(None):
+        parser.load()
+    return time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if len(sys.argv) > 1 and os.path.exists(sys.argv[1]):
+            items_file = sys.argv[1]
+        else:
+            size_mb = float(sys.argv[-1]) if len(sys.argv) > 1 else 10
+            items_file = os.path.join(temp_dir, "items_game.txt")
+            with open(items_file, "w", encoding="utf-8") as f:
+                f.write(generate_vdf(size_mb))
+
+        cache_path = os.path.join(temp_dir, "items_game.cache")
+        print(f"items_game.txt: {os.path.getsize(items_file) / 1024 / 1024:.1f} MB")
+        print(f"cold start  {timed_load(items_file, cache_path):8.3f} s")
+        print(f"cache size  {os.path.getsize(cache_path) / 1024 / 1024:8.1f} MB")
+        for run in range(3):
+            print(f"warm start  {timed_load(items_file, cache_path):8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
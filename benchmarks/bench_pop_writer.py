@@ -0,0 +1,122 @@
+"""
+Benchmark for the streaming pop-file exporter
+
+Builds a synthetic mission (100 waves by default, several squads of bots with
+weapons, attributes, tags and cosmetics) and exports it two ways:
+
+- render: the whole document built in memory by render_mission, then written
+- stream: export_mission writing through PopWriter into a file
+
+Reports time and peak traced memory of each, and checks that both produce
+the same text.
+
+Usage:
+    python benchmarks/bench_pop_writer.py [waves]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pop_writer import PopEmitter, render_mission, export_mission
+
+
+class Weapon:
+    def __init__(self, stat):
+        self.stat = stat
+
+    def get(self):
+        return self.stat
+
+
+class Bot:
+    def __init__(self, stat):
+        self.stat = stat
+
+
+def make_bot(rng, number):
+    weapons = []
+    for slot in range(3):
+        attributes = {str(i): {"Name": f"attribute {i}", "Value": rng.random()} for i in range(rng.randrange(4))}
+        weapons.append(Weapon({"Name": f"Weapon {number}-{slot}", "Attributes": attributes, "Custom": ""}))
+    return Bot({
+        "Name": f"Bot {number}", "Icon": "heavy_giant", "Health": rng.randrange(100, 50000), "Scale": 1.75,
+        "Skill": rng.randrange(4), "Weapon Restriction": rng.randrange(4), "Class": rng.randrange(9),
+        "Template": "", "Behavior": rng.randrange(4), "Tag": ["bot_giant", "nokill"][:rng.randrange(3)],
+        "AutoJump Min": -1, "AutoJump Max": -1, "Custom Parametrs": "",
+        "Primary Weapon": weapons[0], "Secondary Weapons": weapons[1], "Melee": weapons[2],
+        "Cosmetics": [str(rng.randrange(30000, 31000)) for _ in range(rng.randrange(4))],
+        "CharacterAttributes": {"0": {"Name": "move speed bonus", "Value": 0.5}},
+        "Attributes": {"MiniBoss": 1},
+    })
+
+
+def make_mission(waves, squads=6, bots=8, seed=1):
+    rng = random.Random(seed)
+    mission = []
+    number = 0
+    for wave in range(waves):
+        squad = {}
+        for index in range(squads):
+            members = []
+            for _ in range(bots):
+                number += 1
+                members.append(make_bot(rng, number))
+            squad[f"Squad {index}"] = {
+                "Name": f"wave{wave}_squad{index}", "Credits For Squad": 100, "Total Squad": 20,
+                "Max Alive Squads": 4, "Squad Spawn": 2, "SpawnPostion": rng.randrange(3),
+                "Wait Spawn Before": 5, "Wait Spawn Between": 3, "InSquad": members,
+            }
+        mission.append({
+            "Settings": {"StartWaveOutput": "Target wave_start_relay\nAction Trigger", "InitWaveOutput": "",
+                         "DoneOutput": "Target wave_finished_relay\nAction Trigger"},
+            "Squad": squad,
+        })
+    return mission
+
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    waves = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    mission = make_mission(waves)
+    emitter = PopEmitter(lambda key: f"Cosmetic {key}")
+    path = os.path.join(tempfile.mkdtemp(), "mission.pop")
+
+    def render():
+        text = render_mission(emitter, 1200, 6, mission)
+        with open(path, "w") as f:
+            f.write(text)
+        return text
+
+    def stream():
+        export_mission(path, emitter, 1200, 6, mission)
+
+    print(f"Waves: {waves}")
+    results = []
+    for title, run in (("render", render), ("stream", stream)):
+        text, elapsed, peak = measure(run)
+        if text is None:
+            # Файл читается уже после замера
+            with open(path) as f:
+                text = f.read()
+        results.append(text)
+        print(f"{title:<8} {elapsed * 1000:9.1f} ms   peak {peak / 1024 / 1024:7.2f} MB   {len(text)} chars")
+    print("identical output:", all(text == results[0] for text in results))
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark for tf2_items_parser.VDFParser
+
+Generates a synthetic items_game-like VDF file of the requested size and
+reports parse time and peak memory for in-memory and streaming parsing.
+
+Usage:
+    python benchmarks/bench_vdf_parser.py [size_mb]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tf2_items_parser import VDFParser
+
+CLASSES = ["scout", "soldier", "pyro", "demoman", "heavy", "engineer", "medic", "sniper", "spy"]
+SLOTS = ["primary", "secondary", "melee", "misc"]
+
+
+def generate_vdf(size_mb: float, seed: int = 0) -> str:
+    """Build a synthetic VDF document of roughly `size_mb` megabytes"""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    parts = ['"items_game"\n{\n\t"prefabs"\n\t{\n']
+    for i in range(200):
+        parts.append(
+            f'\t\t"prefab_{i}"\n\t\t{{\n'
+            f'\t\t\t"item_slot"\t"{rng.choice(SLOTS)}"\n'
+            f'\t\t\t"equip_region"\t"region_{i % 17}"\n'
+            f'\t\t}}\n'
+        )
+    parts.append('\t}\n\t"items"\n\t{\n')
+    size = sum(len(p) for p in parts)
+    index = 0
+    while size < target:
+        classes = "".join(f'\t\t\t\t"{c}"\t"1"\n' for c in rng.sample(CLASSES, rng.randint(1, 3)))
+        item = (
+            f'\t\t"{index}"\n\t\t{{\n'
+            f'\t\t\t"name"\t"Item {index} // not a comment {{ }}"\n'
+            f'\t\t\t"prefab"\t"prefab_{rng.randrange(200)}"\n'
+            f'\t\t\t"image_inventory"\t"backpack/player/items/item_{index}"\n'
+            f'\t\t\t"item_description"\t"Line one\\nLine \\"two\\""\n'
+            f'\t\t\t"used_by_classes"\n\t\t\t{{\n{classes}\t\t\t}}\n'
+            f'\t\t\t"attributes" {{ "attr" {{ "attribute_class" "mult_dmg" "value" "1.{index % 10}" }} }}\n'
+            f'\t\t}}\n'
+        )
+        parts.append(item)
+        size += len(item)
+        index += 1
+    parts.append('\t}\n}\n')
+    return "".join(parts)
+
+
+def measure(label: str, func) -> None:
+    # Время и память меряются отдельными прогонами: tracemalloc сильно замедляет парсер
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    items = len(result["items_game"]["items"])
+    del result
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {elapsed:8.3f} s   peak {peak / 1024 / 1024:8.1f} MB   items {items}")
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    content = generate_vdf(size_mb)
+    print(f"Synthetic VDF: {len(content) / 1024 / 1024:.1f} MB")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        f.write(content)
+        path = f.name
+    try:
+        measure("parse", lambda: VDFParser.parse(content))
+        del content
+        measure("parse_file", lambda: VDFParser.parse_file(path))
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
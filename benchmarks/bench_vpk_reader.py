@@ -0,0 +1,107 @@
+"""
+Benchmark for vpk_lib.VPKReader
+
+Generates a VPK (dir + _000 archive) with the requested number of entries and
+reports directory parsing time, single-file lookups and directory searches.
+
+Usage:
+    python benchmarks/bench_vpk_reader.py [entries]
+"""
+import os
+import sys
+import time
+import zlib
+import random
+import struct
+import tempfile
+import contextlib
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vpk_lib import VPKReader
+
+
+def generate_vpk(base_path: str, count: int, version: int = 2, seed: int = 0) -> dict:
+    """
+    Write `{base_path}_dir.vpk` and `{base_path}_000.vpk` with `count` entries
+
+    Returns:
+        Dictionary {path: content} of all generated files
+    """
+    rng = random.Random(seed)
+    tree = {}
+    data = bytearray()
+    files = {}
+    for i in range(count):
+        extension = ("vtf", "vmt", "mdl")[i % 3]
+        directory = f"materials/models/dir{i % 211}/sub{i % 13}" if i % 5 else "materials/backpack/player/items"
+        name = f"file_{i}"
+        content = os.urandom(rng.randint(16, 256))
+        preload = content[:8] if i % 4 == 0 else b""
+        rest = content[len(preload):]
+        tree.setdefault(extension, {}).setdefault(directory, []).append(
+            (name, preload, len(data), len(rest), zlib.crc32(content))
+        )
+        data += rest
+        files[f"{directory}/{name}.{extension}"] = content
+
+    raw_tree = bytearray()
+    for extension, directories in tree.items():
+        raw_tree += extension.encode() + b"\0"
+        for directory, entries in directories.items():
+            raw_tree += directory.encode() + b"\0"
+            for name, preload, offset, length, crc in entries:
+                raw_tree += name.encode() + b"\0"
+                raw_tree += struct.pack("<IHHIIH", crc, len(preload), 0, offset, length, 0xFFFF) + preload
+            raw_tree += b"\0"
+        raw_tree += b"\0"
+    raw_tree += b"\0"
+
+    if version == 1:
+        header = struct.pack("<III", VPKReader.SIGNATURE, 1, len(raw_tree))
+    else:
+        header = struct.pack("<IIIIIII", VPKReader.SIGNATURE, 2, len(raw_tree), len(data), 0, 0, 0)
+    with open(f"{base_path}_dir.vpk", "wb") as f:
+        f.write(header + raw_tree)
+    with open(f"{base_path}_000.vpk", "wb") as f:
+        f.write(data)
+    return files
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path = os.path.join(temp_dir, "pak01")
+        files = generate_vpk(base_path, count)
+        print(f"VPK entries: {count}, tree: {os.path.getsize(base_path + '_dir.vpk') / 1024 / 1024:.1f} MB")
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(None):
+            reader = VPKReader(f"{base_path}_dir.vpk")
+        print(f"open + parse tree   {time.perf_counter() - start:8.3f} s")
+
+        sample = random.Random(1).sample(sorted(files), 1000)
+        start = time.perf_counter()
+        for path in sample:
+            reader.get_entry(path)
+        print(f"1000 get_entry      {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+        start = time.perf_counter()
+        for path in sample:
+            reader.get_file_data(path)
+        print(f"1000 get_file_data  {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+        start = time.perf_counter()
+        for path in sample:
+            reader.get_file_view(path)
+        print(f"1000 get_file_view  {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(None):
+            found = list(reader.find_files("materials/models/dir7/*.vtf"))
+        print(f"find_files (dir)    {(time.perf_counter() - start) * 1000:8.3f} ms   {len(found)} files")
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
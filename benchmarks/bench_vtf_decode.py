@@ -0,0 +1,52 @@
+"""
+Benchmark for vtf2img_lib image format decoders
+
+Builds an in-memory VTF file for every supported image format and reports
+decode time per format.
+
+Usage:
+    python benchmarks/bench_vtf_decode.py [size]
+"""
+import io
+import os
+import sys
+import time
+import struct
+import contextlib
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from vtf2img_lib.buffer import Buffer
+    from vtf2img_lib.header import Header
+    from vtf2img_lib.parser import Parser
+    from vtf2img_lib.image_formats import registry
+
+
+def build_vtf(width: int, height: int, image_format: int, image_data: bytes) -> bytes:
+    """Build a minimal VTF 7.2 file with a single hi-res image"""
+    header = struct.pack(
+        "<4sIIIHHIHH4x3f4xfIBIBBH",
+        b"VTF\0", 7, 2, 80, width, height, 0, 1, 0,
+        0.0, 0.0, 0.0, 1.0, image_format, 1, 0xFFFFFFFF, 0, 0, 1,
+    )
+    return header.ljust(80, b"\0") + image_data
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    print(f"Image size: {size}x{size}")
+    for image_format, decoder in sorted(registry.items()):
+        # Размер данных берется из самого декодера
+        header = Header(Buffer(build_vtf(size, size, image_format, b"")))
+        image_size = decoder(header, None).image_size
+        data = build_vtf(size, size, image_format, os.urandom(image_size))
+
+        start = time.perf_counter()
+        image = Parser.from_bytes(data).get_image()
+        elapsed = time.perf_counter() - start
+        print(f"{decoder.__name__:<10} {elapsed * 1000:9.2f} ms   {image.size[0]}x{image.size[1]} {image.mode}")
+
+
+if __name__ == "__main__":
+    main()
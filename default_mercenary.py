@@ -1,5 +1,5 @@
-from Icons_Archive import icons 
-import weapons_libary
+from game_data import Icons as icons
+import game_data
 from resources import resources
 from pathlib import Path
 
@@ -21,9 +21,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
         
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Scout"]["Primary"]["Scattergun"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Scout"]["Secondary"]["Pistol"],
-        "Melee" : weapons_libary.Weapon_Libary["Scout"]["Melee"]["Bat"],
+        "Primary Weapon" : game_data.Weapon_Libary["Scout"]["Primary"]["Scattergun"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Scout"]["Secondary"]["Pistol"],
+        "Melee" : game_data.Weapon_Libary["Scout"]["Melee"]["Bat"],
         
         "Tag_Attributes": [],
         "Custom Parametrs" :  """""",
@@ -47,9 +47,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
     
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Soldier"]["Primary"]["Rocket Launcher"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Soldier"]["Secondary"]["Shotgun"],
-        "Melee" : weapons_libary.Weapon_Libary["Soldier"]["Melee"]["Shovel"],
+        "Primary Weapon" : game_data.Weapon_Libary["Soldier"]["Primary"]["Rocket Launcher"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Soldier"]["Secondary"]["Shotgun"],
+        "Melee" : game_data.Weapon_Libary["Soldier"]["Melee"]["Shovel"],
     
         "Tag_Attributes": [],
         "Custom Parametrs" :  """""",
@@ -72,9 +72,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
     
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Pyro"]["Primary"]["Flame Thrower"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Pyro"]["Secondary"]["Shotgun"],
-        "Melee" : weapons_libary.Weapon_Libary["Pyro"]["Melee"]["Fire Axe"],
+        "Primary Weapon" : game_data.Weapon_Libary["Pyro"]["Primary"]["Flame Thrower"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Pyro"]["Secondary"]["Shotgun"],
+        "Melee" : game_data.Weapon_Libary["Pyro"]["Melee"]["Fire Axe"],
     
         "Tag_Attributes": [],
         "Custom Parametrs" :  """""",
@@ -97,9 +97,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
     
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Demoman"]["Primary"]["Grenade Launcher"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Demoman"]["Secondary"]["Stickybomb Launcher"],
-        "Melee" : weapons_libary.Weapon_Libary["Demoman"]["Melee"]["Bottle"],
+        "Primary Weapon" : game_data.Weapon_Libary["Demoman"]["Primary"]["Grenade Launcher"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Demoman"]["Secondary"]["Stickybomb Launcher"],
+        "Melee" : game_data.Weapon_Libary["Demoman"]["Melee"]["Bottle"],
     
         "Tag_Attributes": [],
         "Custom Parametrs" :  """""",
@@ -122,9 +122,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
     
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Heavy"]["Primary"]["Festive Minigun"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Heavy"]["Secondary"]["Shotgun"],
-        "Melee" : weapons_libary.Weapon_Libary["Heavy"]["Melee"]["The Killing Gloves of Boxing"],
+        "Primary Weapon" : game_data.Weapon_Libary["Heavy"]["Primary"]["Festive Minigun"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Heavy"]["Secondary"]["Shotgun"],
+        "Melee" : game_data.Weapon_Libary["Heavy"]["Melee"]["The Killing Gloves of Boxing"],
     
         "Tag_Attributes": [],
         "Custom Parametrs" :  """""",
@@ -152,9 +152,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
     
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Engineer"]["Primary"]["Shotgun"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Engineer"]["Secondary"]["Pistol"],
-        "Melee" : weapons_libary.Weapon_Libary["Engineer"]["Melee"]["Wrench"],
+        "Primary Weapon" : game_data.Weapon_Libary["Engineer"]["Primary"]["Shotgun"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Engineer"]["Secondary"]["Pistol"],
+        "Melee" : game_data.Weapon_Libary["Engineer"]["Melee"]["Wrench"],
     
         "Tag_Attributes": [],
         "Custom Parametrs" :  """""",
@@ -177,9 +177,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
     
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Medic"]["Primary"]["Syringe Gun"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Medic"]["Secondary"]["Medi Gun"],
-        "Melee" : weapons_libary.Weapon_Libary["Medic"]["Melee"]["Bonesaw"],
+        "Primary Weapon" : game_data.Weapon_Libary["Medic"]["Primary"]["Syringe Gun"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Medic"]["Secondary"]["Medi Gun"],
+        "Melee" : game_data.Weapon_Libary["Medic"]["Melee"]["Bonesaw"],
     
         "Tag_Attributes": [],
         "Custom Parametrs" :  """""",
@@ -207,9 +207,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
     
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Sniper"]["Primary"]["Rifle"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Sniper"]["Secondary"]["SMG"],
-        "Melee" : weapons_libary.Weapon_Libary["Sniper"]["Melee"]["Kukri"],
+        "Primary Weapon" : game_data.Weapon_Libary["Sniper"]["Primary"]["Rifle"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Sniper"]["Secondary"]["SMG"],
+        "Melee" : game_data.Weapon_Libary["Sniper"]["Melee"]["Kukri"],
     
         "Tag_Attributes": [],
         "Custom Parametrs" :  str,
@@ -232,9 +232,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
     
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Spy"]["Primary"]["Revolver"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Spy"]["Secondary"]["Sapper"],
-        "Melee" : weapons_libary.Weapon_Libary["Spy"]["Melee"]["Knife"],
+        "Primary Weapon" : game_data.Weapon_Libary["Spy"]["Primary"]["Revolver"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Spy"]["Secondary"]["Sapper"],
+        "Melee" : game_data.Weapon_Libary["Spy"]["Melee"]["Knife"],
         
         "Tag_Attributes": [],
         "Custom Parametrs" :  """""",
@@ -258,9 +258,9 @@ Mercenary = {
         "Tag" : [],
         "Cosmetics" : [],
         
-        "Primary Weapon" : weapons_libary.Weapon_Libary["Scout"]["Primary"]["Scattergun"],
-        "Secondary Weapons" : weapons_libary.Weapon_Libary["Scout"]["Secondary"]["Pistol"],
-        "Melee" : weapons_libary.Weapon_Libary["Scout"]["Melee"]["Bat"],
+        "Primary Weapon" : game_data.Weapon_Libary["Scout"]["Primary"]["Scattergun"],
+        "Secondary Weapons" : game_data.Weapon_Libary["Scout"]["Secondary"]["Pistol"],
+        "Melee" : game_data.Weapon_Libary["Scout"]["Melee"]["Bat"],
         
         "Tag_Attributes": [],
         "Custom Parametrs" :  """""",
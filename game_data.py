@@ -0,0 +1,294 @@
+"""
+Compact store for the static game-data libraries
+
+cosmetic_libary.py, atribute_libary.py, weapons_libary.py, TemplateLibary.py
+and Icons_Archive.py are large dict literals: importing them builds every
+object up front. `python game_data.py build` compiles them into a single
+binary store (resources/game_data.store) made of an index and one marshal
+record per top-level key.
+
+The libraries are exposed as lazy mappings with the same names and dict
+interface (Cosmetic, Atribute, Weapon_Libary, Template, Icons). A library is
+opened on first attribute access and a record is decoded on first lookup.
+Decoded records are kept, so changes made to them stay visible, as with the
+original dicts.
+
+If the store is missing or older than the source modules, it is rebuilt from
+them; if it cannot be written, the source modules are used directly.
+"""
+import os
+import sys
+import gc
+import mmap
+import struct
+import marshal
+import importlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, MutableMapping, Optional, Tuple
+
+from resources import resources
+
+# Имя библиотеки -> (модуль-источник, имя словаря в модуле)
+SOURCES: Dict[str, Tuple[str, str]] = {
+    "Cosmetic": ("cosmetic_libary", "Cosmetic"),
+    "Atribute": ("atribute_libary", "Atribute"),
+    "Weapon_Libary": ("weapons_libary", "Weapon_Libary"),
+    "Template": ("TemplateLibary", "Template"),
+    "Icons": ("Icons_Archive", "icons"),
+}
+
+STORE_MAGIC = b"GFDS"
+STORE_VERSION = 1
+_HEADER = struct.Struct("<4sII")
+
+
+def store_path() -> Path:
+    return Path(resources()) / "resources" / "game_data.store"
+
+
+def _source_path(module_name: str) -> Path:
+    return Path(resources()) / f"{module_name}.py"
+
+
+def _source_fingerprint() -> Dict[str, Tuple[int, int]]:
+    """
+    Size and mtime of every source module that exists on disk
+    """
+    fingerprint = {}
+    for module_name, _ in SOURCES.values():
+        try:
+            stat = os.stat(_source_path(module_name))
+        except OSError:
+            continue
+        fingerprint[module_name] = (stat.st_size, stat.st_mtime_ns)
+    return fingerprint
+
+
+def build_store(path: Optional[Path] = None) -> Path:
+    """
+    Compile the source modules into the binary store
+
+    Layout: header (magic, version, index length), marshal'ed index
+    {"sources": fingerprint, "libraries": {name: (keys, offsets, lengths)}},
+    then the marshal'ed records. Offsets are relative to the end of the index.
+
+    Args:
+        path: Output file, resources/game_data.store by default
+
+    Returns:
+        Path of the written store
+    """
+    path = Path(path) if path is not None else store_path()
+    libraries = {}
+    blobs = []
+    offset = 0
+    for name, (module_name, attribute) in SOURCES.items():
+        data = getattr(importlib.import_module(module_name), attribute)
+        keys, offsets, lengths = [], [], []
+        for key, value in data.items():
+            blob = marshal.dumps(value)
+            keys.append(key)
+            offsets.append(offset)
+            lengths.append(len(blob))
+            blobs.append(blob)
+            offset += len(blob)
+        libraries[name] = (tuple(keys), tuple(offsets), tuple(lengths))
+
+    index = marshal.dumps({"sources": _source_fingerprint(), "libraries": libraries})
+    temp_path = path.with_name(f"{path.name}.tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(STORE_MAGIC, STORE_VERSION, len(index)))
+            f.write(index)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            os.remove(temp_path)
+    return path
+
+
+class _Store:
+    """
+    Read-only view of a store file: index in memory, records in a memory map
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = _HEADER.unpack_from(self._map, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            self._map.close()
+            raise ValueError(f"Unsupported game data store: {path}")
+        index = marshal.loads(self._map[_HEADER.size:_HEADER.size + index_length])
+        self.sources: Dict[str, Tuple[int, int]] = index["sources"]
+        self.libraries: Dict[str, Tuple[tuple, tuple, tuple]] = index["libraries"]
+        self._data_offset = _HEADER.size + index_length
+
+    def is_fresh(self) -> bool:
+        """
+        The store matches the source modules (sources absent from disk, e.g. in a frozen build, are not checked)
+        """
+        current = _source_fingerprint()
+        return all(tuple(self.sources.get(name, ())) == fingerprint for name, fingerprint in current.items())
+
+    def read(self, offset: int, length: int) -> Any:
+        start = self._data_offset + offset
+        return marshal.loads(self._map[start:start + length])
+
+
+class LazyLibrary(MutableMapping):
+    """
+    Dict-like view of one library of the store; records are decoded on first access
+    """
+
+    def __init__(self, store: _Store, name: str):
+        keys, offsets, lengths = store.libraries[name]
+        self.name = name
+        self._store = store
+        self._locations: Dict[Any, Tuple[int, int]] = dict(zip(keys, zip(offsets, lengths)))
+        self._order = list(keys)
+        self._loaded: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        try:
+            return self._loaded[key]
+        except KeyError:
+            pass
+        location = self._locations[key]
+        with self._lock:
+            if key not in self._loaded:
+                self._loaded[key] = self._store.read(*location)
+            return self._loaded[key]
+
+    def __setitem__(self, key, value) -> None:
+        if key not in self._locations and key not in self._loaded:
+            self._order.append(key)
+        self._loaded[key] = value
+
+    def __delitem__(self, key) -> None:
+        if key not in self._locations and key not in self._loaded:
+            raise KeyError(key)
+        self._locations.pop(key, None)
+        self._loaded.pop(key, None)
+        self._order.remove(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._locations or key in self._loaded
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._order))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __repr__(self) -> str:
+        return f"<LazyLibrary {self.name}: {len(self)} records, {len(self._loaded)} loaded>"
+
+
+_store: Optional[_Store] = None
+_store_lock = threading.Lock()
+_libraries: Dict[str, MutableMapping] = {}
+
+
+def _open_store() -> Optional[_Store]:
+    """
+    Open the store, rebuilding it when it is missing or stale
+    """
+    global _store
+    if _store is not None:
+        return _store
+    path = store_path()
+    try:
+        store = _Store(path)
+        if store.is_fresh():
+            _store = store
+            return _store
+    except (OSError, ValueError, EOFError, struct.error):
+        pass
+    # Прежнее состояние сборщика восстанавливается: его может выключить и загрузка кэша предметов в фоне
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        build_store(path)
+        _store = _Store(path)
+    except (OSError, ValueError) as e:
+        print(f"Error building game data store: {e}")
+        _store = None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return _store
+
+
+def get_library(name: str) -> MutableMapping:
+    """
+    Get a library by name (one of SOURCES)
+
+    Returns:
+        A LazyLibrary, or the source module's dict if the store is unavailable
+    """
+    library = _libraries.get(name)
+    if library is not None:
+        return library
+    with _store_lock:
+        if name not in _libraries:
+            store = _open_store()
+            if store is not None and name in store.libraries:
+                _libraries[name] = LazyLibrary(store, name)
+            else:
+                module_name, attribute = SOURCES[name]
+                _libraries[name] = getattr(importlib.import_module(module_name), attribute)
+        return _libraries[name]
+
+
+def __getattr__(name: str):
+    # Библиотеки открываются при первом обращении: game_data.Cosmetic и т.п.
+    if name in SOURCES:
+        return get_library(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def find_weapon_info(weapon_name):
+    """
+    Поиск информации об оружии в библиотеке Weapon_Libary.
+
+    :param weapon_name: Название оружия для поиска.
+    :return: Словарь с информацией о классе, типе оружия и его названии, или None.
+    """
+    for class_name, weapon_types in get_library("Weapon_Libary").items():
+        for weapon_type, weapons in weapon_types.items():
+            for weapon in weapons.values():
+                if weapon["name"].lower() == weapon_name.lower():
+                    return {
+                        "Class": class_name,
+                        "Type": weapon_type,
+                        "name": weapon["name"]
+                    }
+    return None
+
+
+def find_robot_by_name(robot_name):
+    """
+    Ищет робота по имени и выводит имя блока, в котором он находится.
+
+    :param robot_name: Имя робота для поиска.
+    :return: Имя блока, если найдено; None в противном случае.
+    """
+    for block_name, robot_data in get_library("Template").items():
+        if robot_data.get("Name") == robot_name:
+            return block_name
+    print(f"Robot with name '{robot_name}' not found in the library.")
+    return None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        output = build_store(Path(sys.argv[2]) if len(sys.argv) > 2 else None)
+        print(f"Game data store written to {output} ({output.stat().st_size} bytes)")
+    else:
+        print("Usage: python game_data.py build [output_path]")
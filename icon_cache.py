@@ -0,0 +1,195 @@
+"""
+Persistent icon thumbnail cache
+
+Decoded item icons are stored as PNG files named after a hash of the VPK
+entry path, the entry CRC32 and the requested size. A game update changes the
+CRC32 of a texture, so stale thumbnails are never served. The total size of the
+cache is bounded: least recently used thumbnails are evicted first, and the
+recency order survives restarts through the file modification times.
+"""
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from PIL import Image
+
+
+class IconCache:
+    """
+    Content-addressed, size-bounded LRU store of icon thumbnails on disk
+
+    Attributes:
+        cache_dir: Directory holding the thumbnails
+        max_bytes: Maximum total size of the thumbnails
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that had to decode the icon
+        evictions: Number of thumbnails removed to stay under max_bytes
+    """
+
+    EXTENSION = ".png"
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) the cache directory and index its thumbnails
+
+        Args:
+            cache_dir: Directory holding the thumbnails
+            max_bytes: Maximum total size of the thumbnails
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load_index()
+
+    @staticmethod
+    def make_key(entry_path: str, crc32: int, size: Optional[int]) -> str:
+        """
+        Build the cache key of a thumbnail
+
+        Args:
+            entry_path: Path of the VTF file inside the VPK
+            crc32: CRC32 of the VTF file stored in the VPK directory
+            size: Requested thumbnail size, None for the full image
+
+        Returns:
+            Hex digest used as the file name
+        """
+        raw = f"{entry_path.lower()}|{crc32 & 0xFFFFFFFF:08x}|{size or 0}"
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.EXTENSION}"
+
+    def _load_index(self) -> None:
+        """
+        Index thumbnails left by previous runs, oldest first
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        found = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(self.EXTENSION) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                found.append((stat.st_mtime_ns, entry.name[:-len(self.EXTENSION)], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, entry_path: str, crc32: int, size: Optional[int] = None) -> Optional[str]:
+        """
+        Look up a thumbnail
+
+        Args:
+            entry_path: Path of the VTF file inside the VPK
+            crc32: CRC32 of the VTF file stored in the VPK directory
+            size: Requested thumbnail size, None for the full image
+
+        Returns:
+            Path to the PNG file, or None when it is not cached
+        """
+        key = self.make_key(entry_path, crc32, size)
+        path = self._path(key)
+        with self._lock:
+            if key in self._entries and path.exists():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                try:
+                    # Время изменения хранит порядок LRU между запусками
+                    os.utime(path)
+                except OSError:
+                    pass
+                return str(path).replace("\\", "/")
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self.misses += 1
+            return None
+
+    def put(self, entry_path: str, crc32: int, size: Optional[int], image: Image.Image) -> Optional[str]:
+        """
+        Store a thumbnail, evicting the least recently used ones if needed
+
+        Args:
+            entry_path: Path of the VTF file inside the VPK
+            crc32: CRC32 of the VTF file stored in the VPK directory
+            size: Requested thumbnail size, None for the full image
+            image: Decoded icon
+
+        Returns:
+            Path to the PNG file, or None if it could not be written
+        """
+        key = self.make_key(entry_path, crc32, size)
+        path = self._path(key)
+        temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            image.save(temp_path, 'PNG')
+            os.replace(temp_path, path)
+            file_size = path.stat().st_size
+        except OSError as e:
+            print(f"Error writing icon cache file: {e}")
+            if temp_path.exists():
+                os.remove(temp_path)
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = file_size
+            self._total_bytes += file_size
+            self._evict()
+        return str(path).replace("\\", "/")
+
+    def _evict(self) -> None:
+        """
+        Remove least recently used thumbnails until the cache fits max_bytes
+        """
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, file_size = self._entries.popitem(last=False)
+            self._total_bytes -= file_size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """
+        Remove every thumbnail from the cache
+        """
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache counters
+
+        Returns:
+            Dict with hits, misses, evictions, entries and bytes
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+        }
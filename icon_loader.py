@@ -0,0 +1,153 @@
+"""
+Asynchronous icon loading for the item grids
+
+Icons are resolved (items_game lookup, VPK read, VTF decode, thumbnail cache)
+on a background QThreadPool. Finished QImages are delivered back to the GUI
+thread through a queued signal. Every request belongs to a generation:
+cancel() starts a new one, drops queued jobs and discards results of jobs that
+were already running, so a new search never receives icons of the old one.
+"""
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from PyQt6 import QtCore, QtGui
+
+
+class _IconJob(QtCore.QRunnable):
+    """Resolve and load one icon on a worker thread"""
+
+    def __init__(self, loader: "IconLoader", request_id: int, generation: int, key):
+        super().__init__()
+        self.loader = loader
+        self.request_id = request_id
+        self.generation = generation
+        self.key = key
+        self.setAutoDelete(True)
+
+    def run(self):
+        if not self.loader.is_current(self.generation):
+            return
+        path = None
+        image = QtGui.QImage()
+        try:
+            path = self.loader.resolver(self.key)
+            if path and self.loader.is_current(self.generation):
+                # QImage можно загружать вне GUI-потока, QPixmap - нельзя
+                image = QtGui.QImage(path)
+        except Exception as e:
+            print(f"Error loading icon '{self.key}': {e}")
+        if self.loader.is_current(self.generation):
+            self.loader.iconReady.emit(self.request_id, image, path or "")
+
+
+class IconLoader(QtCore.QObject):
+    """
+    Background icon pipeline with placeholders and cancellation
+
+    Usage:
+        loader = IconLoader(get_icon_from_game)
+        label.setPixmap(loader.placeholder(64))
+        loader.request(key, lambda image, path: label.setPixmap(QtGui.QPixmap.fromImage(image)))
+        loader.cancel()  # e.g. when the search text changes
+
+    Callbacks run on the GUI thread and receive the decoded QImage (null if the
+    icon could not be resolved) and the path of the PNG ("" if none).
+    """
+
+    iconReady = QtCore.pyqtSignal(int, QtGui.QImage, str)
+
+    def __init__(self, resolver: Callable[[object], Optional[str]], max_threads: Optional[int] = None, parent=None):
+        """
+        Args:
+            resolver: Function returning the PNG path of an icon key, called on worker threads
+            max_threads: Worker count, the Qt default (number of CPU cores) when omitted
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.resolver = resolver
+        # Собственный пул: clear() не должен снимать задачи других загрузчиков
+        self.pool = QtCore.QThreadPool(self)
+        if max_threads is not None:
+            self.pool.setMaxThreadCount(max_threads)
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        self._next_id = 0
+        self._callbacks: Dict[int, Tuple[int, Callable]] = {}
+        self._placeholders: Dict[int, QtGui.QPixmap] = {}
+        self.iconReady.connect(self._deliver, QtCore.Qt.ConnectionType.QueuedConnection)
+
+    def is_current(self, generation: int) -> bool:
+        with self._generation_lock:
+            return generation == self._generation
+
+    def request(self, key, callback: Callable[[QtGui.QImage, str], None]) -> int:
+        """
+        Queue an icon for background loading
+
+        Args:
+            key: Icon key passed to the resolver
+            callback: Called on the GUI thread with (QImage, path) once the icon is ready
+
+        Returns:
+            Request id
+        """
+        with self._generation_lock:
+            generation = self._generation
+        self._next_id += 1
+        request_id = self._next_id
+        self._callbacks[request_id] = (generation, callback)
+        self.pool.start(_IconJob(self, request_id, generation, key))
+        return request_id
+
+    def cancel(self) -> None:
+        """
+        Drop every pending request; results of running jobs are discarded
+        """
+        with self._generation_lock:
+            self._generation += 1
+        self.pool.clear()
+        self._callbacks.clear()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """
+        Block until all queued jobs are finished (used on shutdown)
+        """
+        return self.pool.waitForDone(msecs)
+
+    def placeholder(self, size: int = 64) -> QtGui.QPixmap:
+        """
+        Pixmap shown while an icon is loading
+
+        Args:
+            size: Side of the square placeholder
+
+        Returns:
+            A shared QPixmap
+        """
+        pixmap = self._placeholders.get(size)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(size, size)
+            pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+            painter = QtGui.QPainter(pixmap)
+            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+            painter.setPen(QtCore.Qt.PenStyle.NoPen)
+            painter.setBrush(QtGui.QColor(70, 70, 70))
+            margin = size // 8
+            painter.drawRoundedRect(QtCore.QRectF(margin, margin, size - 2 * margin, size - 2 * margin), size / 8, size / 8)
+            painter.end()
+            self._placeholders[size] = pixmap
+        return pixmap
+
+    @QtCore.pyqtSlot(int, QtGui.QImage, str)
+    def _deliver(self, request_id: int, image: QtGui.QImage, path: str) -> None:
+        entry = self._callbacks.pop(request_id, None)
+        if entry is None:
+            return
+        generation, callback = entry
+        if not self.is_current(generation):
+            return
+        try:
+            callback(image, path)
+        except RuntimeError:
+            # Виджет успел удалиться до прихода иконки
+            pass
@@ -0,0 +1,339 @@
+"""
+Unified SQLite catalog of items, weapons, cosmetics, attributes and robot templates
+
+The catalog is a local database built from items_game.txt (through a loaded
+TF2ItemsParser) and from the game_data libraries. Names are searchable through
+an FTS5 trigram index (substring search; SQLite older than 3.34 has no
+trigram tokenizer, and names are then searched with LIKE), and class, slot, equip region,
+quality and effect are indexed columns, so the pickers run indexed queries
+instead of scanning Python dicts.
+
+The database is rebuilt only when one of its sources changes.
+"""
+import os
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import game_data
+
+# Источники записей каталога
+ITEMS_GAME = "items_game"
+COSMETIC = "cosmetic"
+WEAPON = "weapon"
+ATTRIBUTE = "attribute"
+TEMPLATE = "template"
+
+
+class ItemCatalog:
+    """
+    SQLite catalog with FTS5 name search
+
+    Tables:
+        items: one row per record (source, key, name, slot, quality, effect, item_class, position)
+        item_classes / item_regions: many-to-many class and equip region links
+        items_fts: FTS5 trigram index over names, if the SQLite build supports it
+    """
+
+    CATALOG_VERSION = 1
+    SHORT_QUERY = 3  # триграммный индекс не ищет строки короче трех символов
+
+    SCHEMA = """
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE items (
+            id INTEGER PRIMARY KEY,
+            source TEXT NOT NULL,
+            key TEXT NOT NULL,
+            name TEXT NOT NULL,
+            name_lower TEXT NOT NULL,
+            slot TEXT,
+            quality TEXT,
+            effect TEXT,
+            item_class TEXT,
+            position INTEGER NOT NULL
+        );
+        CREATE INDEX items_source_key ON items (source, key);
+        CREATE INDEX items_source_name ON items (source, name_lower);
+        CREATE INDEX items_slot ON items (slot, source);
+        CREATE INDEX items_quality ON items (quality, source);
+        CREATE INDEX items_effect ON items (effect, source);
+        CREATE TABLE item_classes (item_id INTEGER NOT NULL, class TEXT NOT NULL);
+        CREATE INDEX item_classes_class ON item_classes (class, item_id);
+        CREATE TABLE item_regions (item_id INTEGER NOT NULL, region TEXT NOT NULL);
+        CREATE INDEX item_regions_region ON item_regions (region, item_id);
+    """
+    FTS_SCHEMA = "CREATE VIRTUAL TABLE items_fts USING fts5(name, content='items', content_rowid='id', tokenize='trigram')"
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.has_fts = self._fts_exists()
+
+    def _fts_exists(self) -> bool:
+        try:
+            return self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'").fetchone() is not None
+        except sqlite3.DatabaseError:
+            return False
+
+    def close(self) -> None:
+        self.connection.close()
+
+    # ------------------------------------------------------------------ build
+
+    @staticmethod
+    def _file_fingerprint(path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _sources_fingerprint(self, parser) -> str:
+        return json.dumps({
+            "version": self.CATALOG_VERSION,
+            "items_game": self._file_fingerprint(getattr(parser, "file_path", None)) if parser else None,
+            "game_data": game_data._source_fingerprint(),
+            "store": self._file_fingerprint(game_data.store_path()),
+        }, sort_keys=True)
+
+    def _stored_fingerprint(self) -> Optional[str]:
+        try:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'sources'").fetchone()
+        except sqlite3.DatabaseError:
+            return None
+        return row[0] if row else None
+
+    def is_fresh(self, parser=None) -> bool:
+        return self._stored_fingerprint() == self._sources_fingerprint(parser)
+
+    def build(self, parser=None, force: bool = False) -> bool:
+        """
+        (Re)build the catalog when its sources changed
+
+        Args:
+            parser: Loaded TF2ItemsParser, items_game rows are skipped when None
+            force: Rebuild even if the catalog is up to date
+
+        Returns:
+            True if the catalog was rebuilt
+        """
+        fingerprint = self._sources_fingerprint(parser)
+        if not force and self._stored_fingerprint() == fingerprint:
+            return False
+
+        with self._lock:
+            connection = self.connection
+            tables = [row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'items_fts_%'")]
+            for table in tables:
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+            connection.executescript(self.SCHEMA)
+            try:
+                connection.execute(self.FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError as e:
+                # Триграммы появились в SQLite 3.34 (или FTS5 нет вовсе) - поиск пойдет через LIKE
+                print(f"[Catalog] FTS5 trigram index unavailable ({e}), falling back to LIKE search")
+                self.has_fts = False
+
+            with connection:
+                rows, classes, regions = self._collect(parser)
+                connection.executemany(
+                    "INSERT INTO items (id, source, key, name, name_lower, slot, quality, effect, item_class, position)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                connection.executemany("INSERT INTO item_classes VALUES (?, ?)", classes)
+                connection.executemany("INSERT INTO item_regions VALUES (?, ?)", regions)
+                if self.has_fts:
+                    connection.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+                connection.execute("INSERT INTO meta VALUES ('sources', ?)", (fingerprint,))
+            connection.execute("ANALYZE")
+        return True
+
+    @staticmethod
+    def _lower(value) -> Optional[str]:
+        return value.lower() if isinstance(value, str) and value else None
+
+    def _collect(self, parser) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        """
+        Gather catalog rows from every source
+        """
+        rows, classes, regions = [], [], []
+
+        def add(source, key, name, slot=None, quality=None, effect=None, item_class=None,
+                class_names: Iterable = (), region_names: Iterable = ()):
+            if not isinstance(name, str) or not name:
+                return
+            item_id = len(rows) + 1
+            rows.append((item_id, source, str(key), name, name.lower(), self._lower(slot),
+                         self._lower(quality), self._lower(effect), item_class, item_id))
+            classes.extend((item_id, class_name) for class_name in {self._lower(c) for c in class_names} if class_name)
+            regions.extend((item_id, region) for region in {self._lower(r) for r in region_names} if region)
+
+        index = parser._get_index() if parser is not None else None
+        if index is not None:
+            for item_id, flat in index.flat.items():
+                used_by = flat.get("used_by_classes")
+                class_names = [name for name, flag in used_by.items() if flag == "1"] if isinstance(used_by, dict) else []
+                region_names = []
+                if isinstance(flat.get("equip_region"), str):
+                    region_names.append(flat["equip_region"])
+                if isinstance(flat.get("equip_regions"), dict):
+                    region_names.extend(flat["equip_regions"])
+                add(ITEMS_GAME, item_id, flat.get("name"), flat.get("item_slot"), flat.get("item_quality"),
+                    item_class=flat.get("item_class"), class_names=class_names, region_names=region_names)
+
+        for key, cosmetic in game_data.Cosmetic.items():
+            add(COSMETIC, key, cosmetic.get("Name", key), slot="cosmetic", item_class=cosmetic.get("Id"),
+                class_names=cosmetic.get("Class") or [])
+
+        for class_name, weapon_types in game_data.Weapon_Libary.items():
+            for weapon_type, weapons in weapon_types.items():
+                for key, weapon in weapons.items():
+                    # item_class хранит класс персонажа в исходном написании (ключ Weapon_Libary)
+                    add(WEAPON, key, weapon.get("name", key), slot=weapon_type, item_class=class_name,
+                        class_names=[class_name])
+
+        for key, attribute in game_data.Atribute.items():
+            add(ATTRIBUTE, key, attribute.get("Name", key), effect=attribute.get("Effect"))
+
+        for key, template in game_data.Template.items():
+            add(TEMPLATE, key, template.get("Name", key), item_class=template.get("ClassIcon"),
+                class_names=[template.get("Class")])
+
+        return rows, classes, regions
+
+    # ------------------------------------------------------------------ queries
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        with self._lock:
+            return self.connection.execute(sql, tuple(params)).fetchall()
+
+    def find(self, source: Optional[str] = None, class_name: Optional[str] = None, slot: Optional[str] = None,
+             region: Optional[str] = None, quality: Optional[str] = None, effect: Optional[str] = None,
+             limit: Optional[int] = None) -> List[str]:
+        """
+        Keys of the records matching every given criterion, in source order
+
+        Args:
+            source: Record source (ITEMS_GAME, COSMETIC, WEAPON, ATTRIBUTE, TEMPLATE)
+            class_name: Class able to use the item
+            slot: Item slot (weapon type for WEAPON records)
+            region: Equip region
+            quality: Item quality
+            effect: Attribute effect
+            limit: Maximum number of keys
+
+        Returns:
+            List of record keys
+        """
+        sql = ["SELECT items.key FROM items"]
+        where, params = [], []
+        if class_name:
+            sql.append("JOIN item_classes ON item_classes.item_id = items.id AND item_classes.class = ?")
+            params.append(class_name.lower())
+        if region:
+            sql.append("JOIN item_regions ON item_regions.item_id = items.id AND item_regions.region = ?")
+            params.append(region.lower())
+        for column, value in (("source", source), ("slot", slot), ("quality", quality), ("effect", effect)):
+            if value:
+                where.append(f"items.{column} = ?")
+                params.append(value if column == "source" else value.lower())
+        if where:
+            sql.append("WHERE " + " AND ".join(where))
+        sql.append("ORDER BY items.position")
+        if limit:
+            sql.append("LIMIT ?")
+            params.append(limit)
+        return [row[0] for row in self._query(" ".join(sql), params)]
+
+    def search(self, text: str, source: Optional[str] = None, limit: Optional[int] = None) -> List[str]:
+        """
+        Keys of the records whose name contains `text` (case-insensitive)
+
+        Results are ranked: exact name, name prefix, then other matches in source order.
+
+        Args:
+            text: Substring to search for
+            source: Restrict to one source
+            limit: Maximum number of keys
+
+        Returns:
+            List of record keys
+        """
+        text = (text or "").strip().lower()
+        if not text:
+            return []
+        escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        select = ("SELECT items.key, items.name_lower = ? AS exact,"
+                  " items.name_lower LIKE ? ESCAPE '\\' AS prefix")
+        params: List = [text, f"{escaped}%"]
+        if self.has_fts and len(text) >= self.SHORT_QUERY:
+            sql = f"{select} FROM items_fts JOIN items ON items.id = items_fts.rowid WHERE items_fts MATCH ?"
+            params.append('"' + text.replace('"', '""') + '"')
+        else:
+            sql = f"{select} FROM items WHERE items.name_lower LIKE ? ESCAPE '\\'"
+            params.append(f"%{escaped}%")
+        if source:
+            sql += " AND items.source = ?"
+            params.append(source)
+        sql += " ORDER BY exact DESC, prefix DESC, items.position"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [row[0] for row in self._query(sql, params)]
+
+    def get_by_name(self, name: str, source: str) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Records of a source with exactly this name (case-insensitive)
+
+        Returns:
+            List of (key, slot, item_class) tuples
+        """
+        return self._query(
+            "SELECT key, slot, item_class FROM items WHERE source = ? AND name_lower = ? ORDER BY position",
+            (source, (name or "").lower()))
+
+    def classes_of(self, key: str, source: str) -> List[str]:
+        return [row[0] for row in self._query(
+            "SELECT item_classes.class FROM items JOIN item_classes ON item_classes.item_id = items.id"
+            " WHERE items.source = ? AND items.key = ?", (source, str(key)))]
+
+    def find_weapon_info(self, weapon_name: str) -> Optional[Dict]:
+        """
+        Indexed equivalent of game_data.find_weapon_info
+        """
+        for key, slot, class_name in self.get_by_name(weapon_name, WEAPON):
+            weapon_type = slot_title(slot, class_name)
+            weapon = game_data.Weapon_Libary.get(class_name, {}).get(weapon_type, {}).get(key)
+            if weapon is not None:
+                return {"Class": class_name, "Type": weapon_type, "name": weapon["name"]}
+        return None
+
+    def find_robot_by_name(self, robot_name: str) -> Optional[str]:
+        """
+        Indexed equivalent of game_data.find_robot_by_name (exact, case-sensitive name)
+        """
+        for key, _, _ in self.get_by_name(robot_name, TEMPLATE):
+            if game_data.Template[key].get("Name") == robot_name:
+                return key
+        print(f"Robot with name '{robot_name}' not found in the library.")
+        return None
+
+
+def slot_title(slot: Optional[str], class_name: str) -> Optional[str]:
+    """
+    Original spelling of a lower-cased weapon type of a class (e.g. 'primary' -> 'Primary')
+    """
+    for weapon_type in game_data.Weapon_Libary[class_name]:
+        if weapon_type.lower() == slot:
+            return weapon_type
+    return slot
@@ -0,0 +1,228 @@
+"""
+Virtualized item grid (model/view) for the weapon and cosmetic pickers
+
+Items are rows of a QAbstractListModel shown by a QListView in icon mode and
+painted by a delegate. Only visible cells are painted, and an icon is requested
+from the background IconLoader the first time its cell is painted. Filtering by
+name is done by a QSortFilterProxyModel, without rebuilding the model.
+"""
+from typing import Callable, Dict, Optional
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from icon_loader import IconLoader
+
+
+class ItemGridModel(QtCore.QAbstractListModel):
+    """
+    List model of items: each row is an (item key, item stat) pair
+
+    Roles:
+        DisplayRole: item name
+        DecorationRole: icon QPixmap (a placeholder while the icon is loading)
+        ForegroundRole: name color (halloween / Rome items are highlighted)
+        KeyRole: item key
+        StatRole: item stat dict
+    """
+
+    KeyRole = QtCore.Qt.ItemDataRole.UserRole + 1
+    StatRole = QtCore.Qt.ItemDataRole.UserRole + 2
+
+    ICON_SIZE = 64
+
+    COLOR_NORMAL = QtGui.QColor(217, 210, 41)
+    COLOR_HALLOWEEN = QtGui.QColor(56, 243, 171)
+    COLOR_ROME = QtGui.QColor(200, 120, 35)
+
+    def __init__(self, resolver: Callable[[object], Optional[str]],
+                 fallback: Optional[Callable[[dict], Optional[str]]] = None, parent=None):
+        """
+        Args:
+            resolver: Function returning the PNG path of an item key (run on worker threads)
+            fallback: Function returning a local icon path for an item stat when the resolver fails
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.fallback = fallback
+        self.icon_loader = IconLoader(resolver, parent=self)
+        self.items: Optional[dict] = None
+        self._keys = []
+        self._stats = []
+        self._rows: Dict[object, int] = {}
+        self._pixmaps: Dict[int, QtGui.QPixmap] = {}
+        self._requested = set()
+
+    def set_items(self, items: Optional[dict]) -> None:
+        """
+        Replace the rows of the model; pending icon requests are cancelled
+
+        Args:
+            items: Dict of item key -> item stat
+        """
+        self.icon_loader.cancel()
+        self.beginResetModel()
+        self.items = items
+        self._keys = list(items) if items else []
+        self._stats = [items[key] for key in self._keys]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._pixmaps = {}
+        self._requested = set()
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._keys)
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._keys):
+            return None
+        row = index.row()
+        stat = self._stats[row]
+
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return stat.get("name", "Unknown") if stat is not None else "Add"
+        if role == QtCore.Qt.ItemDataRole.DecorationRole:
+            return self._icon(row)
+        if role == QtCore.Qt.ItemDataRole.ForegroundRole:
+            name = (stat or {}).get("name", "").lower()
+            if "hwn" in name or "halloween" in name:
+                return self.COLOR_HALLOWEEN
+            if (stat or {}).get("Rome"):
+                return self.COLOR_ROME
+            return self.COLOR_NORMAL
+        if role == self.KeyRole:
+            return self._keys[row]
+        if role == self.StatRole:
+            return stat
+        return None
+
+    def _icon(self, row: int) -> QtGui.QPixmap:
+        """
+        Icon of a row; the first call for a row queues the background load
+        """
+        pixmap = self._pixmaps.get(row)
+        if pixmap is not None:
+            return pixmap
+
+        stat = self._stats[row]
+        if stat is not None and stat.get("ready_icon"):
+            pixmap = QtGui.QPixmap(stat["ready_icon"])
+            self._pixmaps[row] = pixmap
+            return pixmap
+
+        if row not in self._requested and stat is not None:
+            self._requested.add(row)
+            key = self._keys[row]
+            self.icon_loader.request(key, lambda image, path, key = key: self._on_icon_ready(key, image, path))
+        return self.icon_loader.placeholder(self.ICON_SIZE)
+
+    def _on_icon_ready(self, key, image: QtGui.QImage, path: str) -> None:
+        row = self._rows.get(key)
+        if row is None:
+            return
+        stat = self._stats[row]
+        if image.isNull() and self.fallback is not None:
+            path = self.fallback(stat)
+            image = QtGui.QImage(path) if path else image
+        stat["ready_icon"] = path
+        if image.isNull():
+            return
+        self._pixmaps[row] = QtGui.QPixmap.fromImage(image).scaled(
+            self.ICON_SIZE, self.ICON_SIZE,
+            QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+            QtCore.Qt.TransformationMode.SmoothTransformation)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [QtCore.Qt.ItemDataRole.DecorationRole])
+
+
+class ItemFilterProxyModel(QtCore.QSortFilterProxyModel):
+    """
+    Case-insensitive name filter over an ItemGridModel
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterRole(QtCore.Qt.ItemDataRole.DisplayRole)
+        self.setFilterCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
+
+    def set_search(self, text: Optional[str]) -> int:
+        """
+        Filter rows by a name substring
+
+        Args:
+            text: Substring to search for, empty to show every row
+
+        Returns:
+            Number of rows left
+        """
+        self.setFilterFixedString(text or "")
+        return self.rowCount()
+
+
+class ItemGridDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints a grid cell: rounded background, icon and item name
+    """
+
+    CELL_SIZE = QtCore.QSize(130, 80)
+    ICON_RECT = QtCore.QRect(34, 8, 64, 64)
+    NAME_RECT = QtCore.QRect(0, 60, 130, 20)
+
+    BACKGROUND = QtGui.QColor(47, 47, 47)
+    BACKGROUND_HOVER = QtGui.QColor(61, 61, 61)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QtGui.QFont("TF2 Build", 7)
+
+    def sizeHint(self, option, index) -> QtCore.QSize:
+        return self.CELL_SIZE
+
+    def paint(self, painter: QtGui.QPainter, option, index: QtCore.QModelIndex) -> None:
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        rect = option.rect
+        hovered = bool(option.state & QtWidgets.QStyle.StateFlag.State_MouseOver)
+
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        painter.setBrush(self.BACKGROUND_HOVER if hovered else self.BACKGROUND)
+        painter.drawRoundedRect(QtCore.QRectF(rect), 10, 10)
+
+        pixmap = index.data(QtCore.Qt.ItemDataRole.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(self.ICON_RECT.translated(rect.topLeft()), pixmap)
+
+        painter.setPen(index.data(QtCore.Qt.ItemDataRole.ForegroundRole) or ItemGridModel.COLOR_NORMAL)
+        painter.setFont(self.font)
+        painter.drawText(self.NAME_RECT.translated(rect.topLeft()), QtCore.Qt.AlignmentFlag.AlignCenter,
+                         index.data(QtCore.Qt.ItemDataRole.DisplayRole) or "")
+        painter.restore()
+
+
+def create_item_view(parent=None) -> QtWidgets.QListView:
+    """
+    Create a QListView configured as an icon grid
+
+    Args:
+        parent: Parent widget
+
+    Returns:
+        The list view
+    """
+    view = QtWidgets.QListView(parent)
+    view.setViewMode(QtWidgets.QListView.ViewMode.IconMode)
+    view.setResizeMode(QtWidgets.QListView.ResizeMode.Adjust)
+    view.setMovement(QtWidgets.QListView.Movement.Static)
+    view.setFlow(QtWidgets.QListView.Flow.LeftToRight)
+    view.setWrapping(True)
+    view.setUniformItemSizes(True)
+    view.setSpacing(5)
+    view.setLayoutMode(QtWidgets.QListView.LayoutMode.Batched)
+    view.setBatchSize(200)
+    view.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+    view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+    view.setMouseTracking(True)
+    view.viewport().setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+    view.setItemDelegate(ItemGridDelegate(view))
+    return view
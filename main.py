@@ -5,6 +5,10 @@ import os
 import random
 import json
 
+# === Профилирование запуска (--profile-startup) ===
+import startup_profiler
+startup_profiler.install()
+
 # === PyQt6 и связанные библиотеки ===
 from PyQt6 import QtCore, QtGui, QtWidgets
 
@@ -22,18 +26,18 @@ import keyboard
 # === Импорт ресурсов и библиотек приложения ===
 from resources import resources
 from Pathes import SystemPath
-_systemPath = SystemPath()
+with startup_profiler.phase("icon index"):
+    _systemPath = SystemPath()
 
-import weapons_libary
-import atribute_libary
+import game_data
 import default_mercenary as default_stat
-from Icons_Archive import icons as Icons_Archive
-from TemplateLibary import Template, find_robot_by_name
+from game_data import Icons as Icons_Archive
+from game_data import Template
 from colorpicker import ColorPicker
 
 # === Импорт конкретных структур из библиотек ===
-from atribute_libary import Atribute
-from weapons_libary import Weapon_Libary
+from game_data import Atribute
+from game_data import Weapon_Libary
 
 # === Работа с 3D сценой ===
 from viewer import ModelViewer
@@ -44,9 +48,17 @@ from pop_file_parser.parser import Mission
 from pop_file_parser.valve_parser import ValveFormat
 
 # === Работа с парсингом игровых файлов ===
-from tf2_items_parser import TF2ItemsParser
 from vtf2img_lib import parser as vtf2img_parser
-import vpk
+from icon_cache import IconCache
+from icon_loader import IconLoader
+from item_grid import ItemGridModel, ItemFilterProxyModel, create_item_view
+from search_controller import SearchController, IncrementalMatcher
+from pop_writer import PopEmitter, export_mission, project_waves
+from project_io import ProjectSaver, to_json_compatible
+from autosave import AutosaveJournal
+from project_format import EncodedWave, LazyProject, PROJECT_EXTENSION, read_project, project_bytes
+from item_catalog import ITEMS_GAME
+from startup_loader import GameResources, PARSER, CATALOG, TEXTURES
 
 class windowColor(object):
     global SquadSettingsGlobal
@@ -224,7 +236,7 @@ class Ui_MainWindow(object):
         self.Main.show()
         
     def GenerateWindow(self):
-        self.app = QtWidgets.QApplication(sys.argv)
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
         self.Main = QtWidgets.QMainWindow()
         
     def GeneralInterface(self, MainWindow):    
@@ -361,7 +373,7 @@ class Ui_MainWindow(object):
         self.load_mission_button.setStyleSheet("QPushButton{background-color: rgb(48, 48, 48);font: 9pt \"TF2 Build\";border-bottom-left-radius: 7px;border-bottom-right-radius: 7px;}QPushButton:hover{background-color: rgb(64, 64, 64);}")
         self.load_mission_button.setCheckable(True)
         self.load_mission_button.setObjectName("load_mission_button")
-        self.load_mission_button.clicked.connect(lambda: SaveManagerGlobal.Load())
+        self.load_mission_button.clicked.connect(lambda: run_when_items_loaded(SaveManagerGlobal.Load))
                 
         self.clearAllMission = QtWidgets.QPushButton(parent=self.centralwidget)
         self.clearAllMission.setGeometry(QtCore.QRect(720, 0, 113, 30))
@@ -1414,7 +1426,8 @@ class AddButtonInWaveList(object):
             self.AllMercenary.clear()
             self.AllMercenary = []
             
-        _AddButtonInWaveList.AddButton("Add", command=lambda: Adding_New_Mercenary_To_Wave())
+        # Новому наемнику нужно оружие из items_game: до загрузки клик откладывается
+        _AddButtonInWaveList.AddButton("Add", command=lambda: run_when_items_loaded(Adding_New_Mercenary_To_Wave, queue = True))
     
     def DeleteGlobalButton(self):
         buttonMercenaryActive.deleteLater()
@@ -1493,8 +1506,6 @@ class Ui_GroupBox(QtWidgets.QMainWindow):
         # Central widget and layout
         central_widget = QtWidgets.QWidget(self.Box)
         
-        self.Box.resizeEvent = lambda event: print("") # Placeholder for resize event handling
-        
         self.Box.setCentralWidget(central_widget)
         main_layout = QtWidgets.QVBoxLayout(central_widget)
         main_layout.setContentsMargins(10, 10, 10, 10)
@@ -1509,7 +1520,7 @@ class Ui_GroupBox(QtWidgets.QMainWindow):
             "font: 11pt \"TF2\";border:0;border-radius: 7px;background-color: rgb(61, 61, 61);color: rgb(255, 255, 255);"
         )
         Seach_lineedit.setObjectName("Seach_lineedit")
-        Seach_lineedit.editingFinished.connect(lambda: self.Search(Seach_lineedit.text()))
+        self.searchController = SearchController(self.Search, parent=Seach_lineedit).attach(Seach_lineedit)
         search_layout.addWidget(Seach_lineedit)
 
         Seach_icon = QtWidgets.QLabel()
@@ -1522,11 +1533,10 @@ class Ui_GroupBox(QtWidgets.QMainWindow):
         search_layout.setStretch(1, 0)
         main_layout.addLayout(search_layout)
 
-        # Scalable scroll area for items
-        Cosmitis_list = QtWidgets.QScrollArea()
-        Cosmitis_list.setWidgetResizable(True)
+        # Виртуализированная сетка предметов: рисуются только видимые ячейки
+        Cosmitis_list = create_item_view()
         Cosmitis_list.setStyleSheet(
-            "QWidget{background-color: rgba(0, 0, 0, 0);border:0;}"
+            "QListView{background-color: rgba(0, 0, 0, 0);border:0;}"
             ":handle, QWidget:vertical  {border-radius: 10px;background-color: rgb(86, 86, 86);width: 10px;min-height: 30px;max-width: 50px;}"
             ":handle, QWidget:horizontal  {border-radius: 5px;background-color: rgb(86, 86, 86);width: 5px;min-width: 10px;max-width: 10px;}"
             ":sub-line, QWidget:vertical{background-color: rgba(51, 51, 51, 255);}"
@@ -1535,26 +1545,10 @@ class Ui_GroupBox(QtWidgets.QMainWindow):
             "QWidget::add-page:vertical, QWidget::sub-page:vertical {background-color: rgb(51, 51, 51);}"
         )
         Cosmitis_list.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        Cosmitis_list.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        Cosmitis_list.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading | QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        Cosmitis_list.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         Cosmitis_list.setObjectName("Cosmitis_list")
 
-        # Contents for scroll area
-        scrollAreaWidgetContents_6 = QtWidgets.QWidget()
-        scrollAreaWidgetContents_6.setObjectName("scrollAreaWidgetContents_6")
-        verticalLayout_8 = QtWidgets.QVBoxLayout(scrollAreaWidgetContents_6)
-        verticalLayout_8.setContentsMargins(0, 0, 0, 0)
-        verticalLayout_8.setSpacing(0)
-        verticalLayout_8.setObjectName("verticalLayout_8")
-        gridLayout = QtWidgets.QGridLayout()
-        gridLayout.setObjectName("gridLayout")
-
-        Global_Components["scrollAreaWidgetContents_6"] = scrollAreaWidgetContents_6
-        Global_Components["gridLayout"] = gridLayout
-
-        verticalLayout_8.addLayout(gridLayout)
-        verticalLayout_8.addStretch(1)
-        Cosmitis_list.setWidget(scrollAreaWidgetContents_6)
+        Global_Components["item_view"] = Cosmitis_list
         main_layout.addWidget(Cosmitis_list)
 
         # Cancel button
@@ -1585,321 +1579,221 @@ class Tile():
     global Mercenary_now
     
     def __init__(self):
-        self.countButton = 0
-        self.line = 0
-        self.spacer = None
         global TileGlobal
         TileGlobal = self
-        self.buttons = []
+        self.curIndex = None
         self.firstStat = {}
-        self._setup_grid_signals()
-
-    def _setup_grid_signals(self):
-        # Подключаем обработчик изменения размера родительского виджета
-        parent_widget: QtWidgets.QWidget = Global_Components.get("UI_Box_Group_Main")
-
-        if parent_widget is not None:
-            parent_widget.resizeEvent = lambda event: self._on_parent_resize(event)
-
-    def _on_parent_resize(self, event):
-        self._relayout_buttons()
-        event.accept()
-
-    def _relayout_buttons(self):
-        parent_widget = Global_Components["scrollAreaWidgetContents_6"]
-        grid_layout = Global_Components["gridLayout"]
-        button_width = 130
-        spacing = 10  # spacing между элементами
-        grid_layout.setHorizontalSpacing(spacing)
-        grid_layout.setVerticalSpacing(spacing)
-        container_width = parent_widget.width()
-        columns = max(1, container_width // (button_width + spacing))
-
-        # Удаляем все элементы из сетки (кроме spacer)
-        for i in reversed(range(grid_layout.count())):
-            item = grid_layout.itemAt(i)
-            widget = item.widget()
-            if widget is not None and widget in self.buttons:
-                grid_layout.removeWidget(widget)
-        # Добавляем обратно с новыми координатами
-        for idx, btn in enumerate(self.buttons):
-            row = idx // columns
-            col = idx % columns
-            grid_layout.addWidget(btn, row, col, 1, 1)
-        # Spacer для заполнения пространства
-        if self.spacer is not None:
-            grid_layout.removeItem(self.spacer)
-        self.spacer = QtWidgets.QSpacerItem(
-            20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding
-        )
+        # Для поиска: исходный набор, ключ, по которому он ничего не нашел,
+        # и ключ глобального поиска, результаты которого сейчас в модели
+        self.sourceStat = None
+        self.sourceMiss = None
+        self.fallbackKey = None
+        self.view: QtWidgets.QListView = Global_Components["item_view"]
+        
+        # Модель хранит все предметы, прокси фильтрует их по имени,
+        # иконки грузятся в фоне только для ячеек, которые реально рисуются
+        self.model = ItemGridModel(get_icon_from_game,
+                                   fallback=lambda stat: _systemPath.get(stat.get("Icon", ""), "weapon"),
+                                   parent=self.view)
+        self.proxy = ItemFilterProxyModel(parent=self.view)
+        self.proxy.setSourceModel(self.model)
+        self.view.setModel(self.proxy)
+        self.view.clicked.connect(self._on_item_clicked)
 
-        grid_layout.addItem(self.spacer, (len(self.buttons) // columns) + 1, 0, 1, columns)
-        
     def Clear(self):
-        if len(self.buttons) > 0:
-            for item in self.buttons:
-                item.deleteLater()
-            self.buttons.clear()
+        self.fallbackKey = None
+        self.proxy.set_search("")
+        self.model.set_items({})
 
     def SearchDelete(self, key : str = None , stat : dict = {}):
-        _stat = stat.keys()
-        find = {}
-        
-        for index in _stat:
-            item = parser.get_item_by_key(index)
-            if "name" in item:
-                item_name = item["name"].title()
-                if key is not None and key.title() in item_name:
-                    find[index] = item
-                    
+        key = key or ""
+        
         def filtered_items():
-            criteria = {
-                'used_by_classes': Mercenary_now.stat['Class Name'].lower(),
-                'equip_region' : "hat",	
-            }
-            return parser.filter_items(criteria)   
-               
-        if len(find) > 0 and len(key) > 0:
-            self.Clear()
-            self.AddButton(items = find)
-            
-        elif len(key) >= 0 or len(find) <= 0 :
-            items = parser.get_items_by_name(key)
-
-            if items:
-                self.firstStat = {}
-                for item in items:
-                    if item[0] not in self.firstStat:
-                        self.firstStat[item[0]] = item[1]
-                        
-                if len(self.firstStat) > 0:
-                    self.Clear()
-                    self.AddButton(self.firstStat)
-            else:
-                self.Clear()
-                self.AddButton(filtered_items())
+            return catalog_items(item_catalog.find(ITEMS_GAME, class_name = Mercenary_now.stat['Class Name'], region = "hat"))
+        
+        def narrows(previous):
+            # Поиск по подстроке: уточнение ключа может только сузить результат
+            return bool(previous) and previous.lower() in key.lower()
+        
+        if self.sourceStat is not stat:
+            self.sourceStat = stat
+            self.sourceMiss = None
+        
+        # Сначала фильтруем через прокси то, что уже в модели, без пересоздания ячеек
+        if self.model.items is not stat:
+            if narrows(self.fallbackKey):
+                # Уточнение прошлого глобального поиска: исходный набор уже ничего не нашел
+                if self.proxy.set_search(key) > 0:
+                    return
+            elif not narrows(self.sourceMiss):
+                self.AddButton(items = stat)
+        
+        if self.model.items is stat and len(key) > 0:
+            if self.proxy.set_search(key) > 0:
+                return
+            self.sourceMiss = key
+        
+        self.proxy.set_search("")
+        # Поиск по FTS-индексу каталога, нечеткий поиск парсера - только если ничего не нашлось
+        items = list(catalog_items(item_catalog.search(key, ITEMS_GAME)).items()) or parser.get_items_by_name(key)
+
+        if items:
+            self.firstStat = {}
+            for item in items:
+                if item[0] not in self.firstStat:
+                    self.firstStat[item[0]] = item[1]
+                    
+            if len(self.firstStat) > 0:
+                self.AddButton(self.firstStat)
         else:
-            self.Clear()
             self.AddButton(filtered_items())
+        self.fallbackKey = key
 
     def AddButton(self, items : dict = [], index = None):
-        self.countButton = 0
-        self.line = 0
-        self.now = 0
         if index != None:
             self.curIndex = index
-        else:
-            index = self.curIndex
             
-        # Очищаем старые кнопки
-        for btn in self.buttons:
-            try:
-                btn.deleteLater()
-                btn.setParent(None)
-            except Exception as e:
-                print(f"Error deleting button: {e}")
-        self.buttons.clear()
-
-        for item in items:
-            stat = items[item]
-            self.CreateButton(stat = stat, index = item, slot = index)
+        self.fallbackKey = None
+        self.proxy.set_search("")
+        self.model.set_items(items if isinstance(items, dict) else {})
 
-        # Перераскладываем кнопки после добавления
-        self._relayout_buttons()
-
-    def CreateButton(self, stat, index = None, slot = "Primary"):
-        Item = QtWidgets.QGroupBox(parent=Global_Components["scrollAreaWidgetContents_6"])
-        Item.setMinimumSize(QtCore.QSize(130, 80))
-        Item.setMaximumSize(QtCore.QSize(130, 80))
-        Item.setStyleSheet("border:0;")
-        Item.setObjectName("Item")
-
-        ButtonAddCosmetic = QtWidgets.QPushButton(parent=Item)
-        ButtonAddCosmetic.setGeometry(QtCore.QRect(0, 0, 131, 81))
-        ButtonAddCosmetic.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
-       
-        color_rgb_item = "rgb(217, 210, 41)"
-        if "hwn" in stat.get("name","").lower() or "halloween" in stat.get("name","").lower():
-            color_rgb_item = "rgb(56, 243, 171)"
-            styleSheet = ("background-color: rgb(47, 47, 47);"
-                          "border-left:   1px solid;"
-                          "border-right:  1px solid;"
-                          "border-top:    1px solid;"
-                          "border-bottom: 1px solid;"
-                          f"border-color:  {color_rgb_item};"
-                          "border-radius: 10px;"
-                          "color:rgb(183, 45, 43);")
-        elif stat.get("Rome"):
-            color_rgb_item = "rgb(200, 120, 35)"
-            styleSheet = ("background-color: rgb(47, 47, 47);"
-                          "border-left:   1px solid;"
-                          "border-right:  1px solid;"
-                          "border-top:    1px solid;"
-                          "border-bottom: 1px solid;"
-                          f"border-color:  {color_rgb_item};"
-                          "border-radius: 10px;"
-                          "color:rgb(183, 45, 43);")
-            
-        styleSheetName = f"color: {color_rgb_item};font: 7pt \"TF2 Build\";"
-        styleSheet = (
-            "background-color: rgb(47, 47, 47);"
-            "border-radius: 10px;")        
-        
-        ButtonAddCosmetic.setStyleSheet(styleSheet)
-        ButtonAddCosmetic.setIconSize(QtCore.QSize(90, 90))
-        ButtonAddCosmetic.setObjectName("ButtonAddCosmetic")
-        ButtonAddCosmetic.setMouseTracking(True)
-
-        Name = QtWidgets.QLabel(parent=Item)
-        Name.setGeometry(QtCore.QRect(0, 60, 131, 21))
-        Name.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
-        Name.setStyleSheet(styleSheetName)
-        Name.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        Name.setObjectName("Name")
-        Name.setMouseTracking(False)
-
-        Icon = QtWidgets.QFrame(parent=Item)
-        Icon.setGeometry(QtCore.QRect(34, 8, 64, 64))
-        Icon.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
-        Icon.setMouseTracking(False)
-        Icon.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
-        Icon.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
-        Icon.setObjectName("Icon")
-                
+    def _on_item_clicked(self, proxy_index : QtCore.QModelIndex):
+        source_index = self.proxy.mapToSource(proxy_index)
+        stat = self.model.data(source_index, ItemGridModel.StatRole)
         if stat is None:
-            item_icon = _systemPath.get("Plus")
-            Name.setText("Add")
-        else: 
-            item_icon = get_icon_from_game(index)
-                
-            if item_icon is None:
-                item = stat.get("Icon", "")
-                item_icon = _systemPath.get(item, "weapon")  
-                         
-            Name.setText(stat.get("name", "Unknown"))
-            Icon.setStyleSheet(f'border-image: url({item_icon}); width: 64px; height: 64px; min-width: 32px; min-height: 32px; max-width: 128px; max-height: 128px;')
-            stat["index_item"] = index
-            
-        stat["ready_icon"] = item_icon
+            return
+        
+        stat["index_item"] = self.model.data(source_index, ItemGridModel.KeyRole)
         
         if "Id" in stat:
-            atributet = Button_Weapon_Atribute(stat, slot)
+            atributet = Button_Weapon_Atribute(stat, self.curIndex)
         else:
             atributet = Button_Cosmetic_Atribute(stat)
-        
-        ButtonAddCosmetic.clicked.connect(lambda x: atributet.get())
-        
-        Icon.mousePressEvent = (lambda x: atributet.get())
-        Name.mousePressEvent = (lambda x: atributet.get())
+        atributet.get()
 
-        self.buttons.append(Item)
+
+class SaveNotifier(QtCore.QObject):
+    """Передает результат фоновой записи проекта в поток интерфейса"""
+    finished = QtCore.pyqtSignal(str, str)  # файл, текст ошибки ("" при успехе)
 
 
 class SaveManager(object):
     def __init__(self):
         super().__init__()
+        # Запись на диск идет в фоновом потоке, окно не ждет сериализации
+        self.saver = ProjectSaver()
+        # Файл -> (имя проекта, выбран ли файл в диалоге); проект станет текущим после успешной записи
+        self.pending_names = {}
+        self.notifier = SaveNotifier()
+        self.notifier.finished.connect(self.on_saved)
+
+    @staticmethod
+    def mercenary_snapshot(item):
+        """Состояние наемника в формате сохранения; сам наемник не изменяется"""
+        if not isinstance(item, Mercenary):
+            return item
+        stat = dict(item.stat)
+        for slot in ("Primary Weapon", "Secondary Weapons", "Melee"):
+            if isinstance(stat[slot], WeaponData):
+                stat[slot] = stat[slot].get()
+        return stat
+
+    def snapshot(self) -> dict:
+        """
+        Copy of the project in the save format
 
-    def Save(self):
+        Taken on the GUI thread; shares no mutable data with the live waves,
+        squads and mercenaries, so it can be written from another thread.
+        """
         global WaveManagerGlobal
         global InitSettingsGlobal
-        
+
+        waveList = {}
+        for key, value in WaveManagerGlobal.waveList.items():
+            # Пропускаем все объекты, которые являются классами (например, QPushButton)
+            if isinstance(value, type) or (hasattr(value, "__class__") and "PyQt" in str(type(value))):
+                continue
+            waveList[key] = self.wave_snapshot(value)
+
+        first = next(iter(waveList))
+        if isinstance(waveList[first], EncodedWave):
+            # Первая волна хранит GlobalSettings, поэтому ее приходится распаковать
+            waveList[first] = waveList[first].decode()
+        waveList[first]["GlobalSettings"] = InitSettingsGlobal.Get()
+        return to_json_compatible(waveList)
+
+    def wave_snapshot(self, wave) -> dict:
+        """
+        Copy of one wave in the save format (without GlobalSettings)
+
+        A wave of a .gfp project that was never opened stays an EncodedWave:
+        it is decoded, if at all, by the serializer on the saver thread.
+        """
+        if isinstance(wave, dict) and wave.get("Name") in WaveManagerGlobal.pendingWaves:
+            return WaveManagerGlobal.pendingWaves[wave["Name"]]
+        if isinstance(wave, dict):
+            # Удаляем параметр 'button', если он есть и это QPushButton
+            wave = {k: v for k, v in wave.items() if not (k == "button" and "QPushButton" in str(type(v)))}
+            if isinstance(wave.get("Squad"), dict):
+                wave["Squad"] = {
+                    name: dict(squad, InSquad = [self.mercenary_snapshot(item) for item in squad["InSquad"]])
+                    for name, squad in wave["Squad"].items()
+                }
+        return to_json_compatible(wave)
+
+    def Save(self):
         global project_file
         global generalGlobal
         global path_project_file
         
         missionName = f'{generalGlobal.buttonsGlobal["mapName_text"].text()}_{generalGlobal.buttonsGlobal["MissionName_text"].text()}'
+        chosen = project_file == None
         try:
-            if project_file == None:
+            if chosen:
                 Tk().withdraw()
-                name = fd.asksaveasfile(title="Save Project", filetypes = [('Json Project', '*.json')], initialfile= missionName)
+                name = fd.asksaveasfile(title="Save Project", filetypes = PROJECT_FILETYPES, initialfile= missionName)
                 Tk().destroy()
                 
                 if name != None and len(name.name) > 0:
                     name = name.name
-                    path_project_file = name
                 else:
                     return
             else:
                 name = project_file
         except:return
         
-        waveList = {}
-        for key, value in WaveManagerGlobal.waveList.items():
-            # Пропускаем все объекты, которые являются классами (например, QPushButton)
-            # или содержат параметр 'button' с объектом QPushButton
-            if isinstance(value, type) or (hasattr(value, "__class__") and "PyQt" in str(type(value))):
-                continue
-            # Удаляем параметр 'button', если он есть и это QPushButton
-            if isinstance(value, dict) and "button" in value:
-                btn = value["button"]
-                # Проверяем, что это действительно QPushButton
-                if "QPushButton" in str(type(btn)):
-                    value = value.copy()
-                    value.pop("button")
-            waveList[key] = value
-            
-        waveList[next(iter(waveList))]["GlobalSettings"] = InitSettingsGlobal.Get()
-        
-        for _squad in waveList:
-            squad =     waveList[_squad]["Squad"]
-            primary =   dict
-            secondary = dict
-            melee =     dict
-            
-            if len(squad) > 0:
-                for squadItem in squad:
-                    squadItem = squad[squadItem]["InSquad"]
-                    allInSquad = []
-                    
-                    for _item in squadItem:
-                        item = squadItem[squadItem.index(_item)]
-                        
-                        if isinstance(item, Mercenary):
-                            if isinstance(item.stat["Primary Weapon"], WeaponData):
-                                primary =   item.stat["Primary Weapon"].get()
-                            else:
-                                primary =   item.stat["Primary Weapon"]
-                                
-                            if isinstance(item.stat["Secondary Weapons"], WeaponData):
-                                secondary =   item.stat["Secondary Weapons"].get()
-                            else:
-                                secondary =   item.stat["Secondary Weapons"]
-                                
-                            if isinstance(item.stat["Melee"], WeaponData):
-                                melee =   item.stat["Melee"].get()
-                            else:
-                                melee =   item.stat["Melee"]
-                                
-                            item.stat["Primary Weapon"] = primary
-                            item.stat["Secondary Weapons"] = secondary
-                            item.stat["Melee"] = melee
-                        if isinstance(item, Mercenary):
-                            allInSquad.append(item.stat)
-                        else:
-                            allInSquad.append(item)
-
-                    squadItem.clear()
-                    squadItem.extend(allInSquad)
-                    
         if len(name) > 1:
-            out_file = open(f'{name.replace(".json", "")}.json', "w")
-            def convert_paths(obj):
-                if isinstance(obj, dict):
-                    return {k: convert_paths(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_paths(i) for i in obj]
-                elif hasattr(obj, "as_posix"):
-                    return str(obj)
-                else:
-                    return obj
-            exit_file = convert_paths(waveList)
-
-            json.dump(exit_file, out_file)
-
-            out_file.close()
-            project_file = name
-            
-        self.Load(True)
+            # Снимок делается здесь, запись с переименованием временного файла - в фоне.
+            # Модель в памяти не меняется, поэтому перезагружать проект не нужно
+            snapshot = self.snapshot()
+            path = self.project_path(name)
+            # Формат файла выбирается по расширению: .gfp - двоичный, иначе JSON
+            self.pending_names[path] = (name, chosen)
+            self.saver.save(path, snapshot, serializer = lambda data: project_bytes(path, data),
+                            on_done = lambda path, error: self.notifier.finished.emit(path, "" if error is None else str(error)))
+            # Журнал автосохранения сжимается тем же снимком сразу: правки после него уже пишутся в новый журнал
+            if autosave.active:
+                autosave.compact(snapshot)
+
+    def on_saved(self, path : str, error : str):
+        """Результат фоновой записи (в потоке интерфейса): проект становится текущим только после успешной записи"""
+        global project_file
+        global path_project_file
+        name, chosen = self.pending_names.pop(path, (None, False))
+        if error:
+            Tk().withdraw()
+            from tkinter import messagebox
+            print(f"[ERROR] Failed to save project: {error}")
+            messagebox.showerror('Gray Factory', 'Error: File cannot be saved! \n' + error)
+            Tk().destroy()
+            return
+        if name is None:
+            return
+        project_file = name
+        if chosen or path_project_file is None:
+            path_project_file = name
+        if autosave.active and autosave.project_file != name:
+            autosave.set_project_file(name)
         
     def Load(self, oldSave : bool = False):
         global project_file
@@ -1908,7 +1802,7 @@ class SaveManager(object):
             name = path_project_file
         else:
             Tk().withdraw()
-            name = fd.askopenfilename(title="Select Project", filetypes = [('Json Project', '*.json')])
+            name = fd.askopenfilename(title="Select Project", filetypes = PROJECT_FILETYPES)
             name.replace(".json", "")
             Tk().destroy()
             
@@ -1916,26 +1810,13 @@ class SaveManager(object):
             if len(name) <= 0:
                 return
         try:
-            f = open(f'{name.replace(".json", "")}.json')
-            data = json.load(f)
-            global WaveManagerGlobal
-            WaveManagerGlobal.clearAll()
-            global SquadSettingsGlobal
-            SquadSettingsGlobal.ClearSettingsSquad()
-            SquadSettingsGlobal.clearSquad()
-            global InitSettingsGlobal
-            
-            InitSettingsGlobal.SetFromSave(data[next(iter(data))]["GlobalSettings"])
-            
-            for item in data:
-                waveItem = {}
-                waveItem[item] = data[item]
-                WaveManagerGlobal.SetFromSave(waveItem)
-                
+            # JSON читается целиком, у .gfp разбирается только открытая волна
+            data = read_project(self.project_path(name))
+            self.LoadData(data)
             project_file = name
-            
-            WaveManagerGlobal.setWave(next(iter(WaveManagerGlobal.waveList)))
-            f.close()
+            # Журнал автосохранения начинается заново от загруженного проекта
+            if autosave.active:
+                autosave.start(self.snapshot(), project_file)
             
         except Exception as e:
             Tk().withdraw()
@@ -1944,6 +1825,41 @@ class SaveManager(object):
             messagebox.showerror('Gray Factory', 'Error: File cannot be uploaded! \n' + str(e))
             Tk().destroy()
 
+    @staticmethod
+    def project_path(name : str) -> str:
+        """Файл проекта: .gfp как есть, остальные имена - JSON"""
+        if name.endswith(PROJECT_EXTENSION):
+            return name
+        return f'{name.replace(".json", "")}.json'
+
+    def LoadData(self, data):
+        """
+        Replace the open project with `data` in the save format
+
+        Args:
+            data: Project dict, or a LazyProject whose waves other than the first
+                  are only decoded when opened
+        """
+        global WaveManagerGlobal
+        WaveManagerGlobal.clearAll()
+        global SquadSettingsGlobal
+        SquadSettingsGlobal.ClearSettingsSquad()
+        SquadSettingsGlobal.clearSquad()
+        global InitSettingsGlobal
+        
+        InitSettingsGlobal.SetFromSave(data[next(iter(data))]["GlobalSettings"])
+        
+        first = next(iter(data))
+        for item in data:
+            if isinstance(data, LazyProject) and item != first:
+                WaveManagerGlobal.SetPendingFromSave(item, data.encoded(item))
+                continue
+            waveItem = {}
+            waveItem[item] = data[item]
+            WaveManagerGlobal.SetFromSave(waveItem)
+        
+        WaveManagerGlobal.setWave(next(iter(WaveManagerGlobal.waveList)))
+
 
 class InitialSettings(object):
     def __init__(self):
@@ -1995,6 +1911,7 @@ class InitialSettings(object):
             print("[ERROR] Failed to save restart time:", e)
         global WaveManagerGlobal
         WaveManagerGlobal.CountingWave()
+        autosave.record("settings", data = self.Get())
 
 
 class WaveManager(object):
@@ -2002,6 +1919,8 @@ class WaveManager(object):
     def __init__(self):
         self.waveCurrent = None
         self.waveList = {}
+        # Волны .gfp, которые еще не открывались: имя -> EncodedWave
+        self.pendingWaves = {}
         
         self.waveCount = 0
         self.allWave = []
@@ -2035,6 +1954,7 @@ class WaveManager(object):
             self.components["WaveSelect_text"].setText(self.waveCurrent)
             self.setWave(self.waveCurrent)
             self.CountingWave()
+            journal_wave(wave)
             return
 
         # Найти индекс текущей волны
@@ -2047,6 +1967,7 @@ class WaveManager(object):
             wave_to_remove = self.waveList.pop(self.waveCurrent, None)
             if wave_to_remove:
                 self.allWave.pop(current_index)
+                autosave.record("remove_wave", wave = self.waveCurrent)
 
             # Удалить кнопку из интерфейса
             button_to_remove = next(
@@ -2085,6 +2006,7 @@ class WaveManager(object):
         
         self.waveList.clear()
         self.waveList = {}
+        self.pendingWaves = {}
         
         self.spacerItem = None
         
@@ -2093,31 +2015,33 @@ class WaveManager(object):
         
         SquadSettingsGlobal.ClearSettingsSquad()
         
-    def SetFromSave(self, list : dict):
+    def BuildWave(self, wave : dict, queue : int) -> dict:
+        """Создает отряды и наемников сохраненной волны"""
         _Squads = {}
-        
+        for squad in wave["Squad"] or wave["Squads"]:
+            createSquad = SquadSettingsGlobal.SetSquadFromSettings(wave["Squad"][squad])
+            _Squads[createSquad["Name"]] = createSquad
+        return {
+            "Name": wave.get("Name"),
+            "Wave Queue": queue,
+            "Squad": _Squads,
+            "Support": [],
+            "Money": wave.get("Money"),
+            "Settings": {
+                "Description":      wave.get("Settings", {}).get("Description"),
+                "Sound":            wave.get("Settings", {}).get("Sound"),
+                "StartWaveOutput":  wave.get("Settings", {}).get("StartWaveOutput"),
+                "InitWaveOutput":   wave.get("Settings", {}).get("InitWaveOutput"),
+                "DoneOutput":       wave.get("Settings", {}).get("DoneOutput"),
+                "Custom":           wave.get("Settings", {}).get("Custom"),
+            }
+        }
+
+    def SetFromSave(self, list : dict):
         for wave in list:
             wave = list[wave]
             self.waveCount += 1
-            
-            for squad in wave["Squad"] or wave["Squads"]:
-                createSquad = SquadSettingsGlobal.SetSquadFromSettings(wave["Squad"][squad])
-                _Squads[createSquad["Name"]] = createSquad
-                Wave = {
-                    "Name": wave.get("Name"),
-                    "Wave Queue": self.waveCount,
-                    "Squad": _Squads,
-                    "Support": [],
-                    "Money": wave.get("Money"),
-                    "Settings": {
-                        "Description":      wave.get("Settings", {}).get("Description"),
-                        "Sound":            wave.get("Settings", {}).get("Sound"),
-                        "StartWaveOutput":  wave.get("Settings", {}).get("StartWaveOutput"),
-                        "InitWaveOutput":   wave.get("Settings", {}).get("InitWaveOutput"),
-                        "DoneOutput":       wave.get("Settings", {}).get("DoneOutput"),
-                        "Custom":           wave.get("Settings", {}).get("Custom"),
-                    }
-                }
+            Wave = self.BuildWave(wave, self.waveCount)
             
             self.waveList[Wave["Name"]] = Wave
             self.allWave.append(Wave)
@@ -2127,6 +2051,54 @@ class WaveManager(object):
             self.AddButtonToGlobal(Wave["Name"])
             
         self.setSettings()
+
+    def SetPendingFromSave(self, name : str, encoded : EncodedWave):
+        """
+        Adds a wave of a .gfp project without decoding it
+
+        The wave gets its button and money; squads and mercenaries are created
+        by LoadPendingWave when the wave is opened.
+
+        Args:
+            name: Wave name
+            encoded: Compressed record of the wave
+        """
+        self.waveCount += 1
+        Wave = {
+            "Name": name,
+            "Wave Queue": self.waveCount,
+            "Squad": {},
+            "Support": [],
+            "Money": encoded.money,
+            "Settings": {},
+        }
+        self.waveList[name] = Wave
+        self.allWave.append(Wave)
+        self.pendingWaves[name] = encoded
+        
+        global _AddButtonInWaveList
+        _AddButtonInWaveList.clear()
+        self.AddButtonToGlobal(name)
+
+    def LoadPendingWave(self, name : str):
+        """Создает отряды и наемников неоткрытой волны; словарь волны остается тем же объектом"""
+        encoded = self.pendingWaves.pop(name, None)
+        if encoded is None:
+            return
+        Wave = self.waveList[name]
+        Wave.update(self.BuildWave(encoded.decode(), Wave["Wave Queue"]))
+
+    def ExportWaves(self) -> list:
+        """
+        Waves for the pop-file exporter; unopened waves are read from the file without creating widgets
+        """
+        waves = []
+        for name, wave in self.waveList.items():
+            if name in self.pendingWaves:
+                waves.extend(project_waves({name: self.pendingWaves[name].decode()}))
+            else:
+                waves.append(wave)
+        return waves
                 
     def AddButton(self, name, param):
         self.globalButtons[name] = param
@@ -2183,6 +2155,7 @@ class WaveManager(object):
                 "DoneOutput" : self.globalButtons["DoneOutput"].toPlainText(),
                 "Custom" : self.globalButtons["Custom"].toPlainText(),
             }
+            autosave.record("wave_settings", wave = self.waveCurrent, data = self.waveList[self.waveCurrent]["Settings"])
 
     def setSettings(self):
         if len(self.waveList) > -1 and self.waveCurrent != None:
@@ -2200,6 +2173,8 @@ class WaveManager(object):
         global InitSettingsGlobal
         InitSettingsGlobal.setMoney()
         if waveName in self.waveList:
+            # Волна .gfp разбирается при первом открытии
+            self.LoadPendingWave(waveName)
             self.waveCurrent = waveName
             global CurrentWave
             CurrentWave = self.waveList[self.waveCurrent]
@@ -2280,6 +2255,7 @@ class WaveManager(object):
         
         Wave["button"] = self.AddButtonToGlobal(Wave["Name"])
         self.setSettings()
+        journal_wave(Wave)
         
         return self.waveList[Wave["Name"]]["Squad"]
     
@@ -2314,6 +2290,7 @@ class WaveManager(object):
         _AddButtonInWaveList.clear()
         Wave["button"] = self.AddButtonToGlobal(Wave["Name"])
         self.setSettings()
+        journal_wave(Wave)
         
         return self.waveList[Wave["Name"]]["Squad"]
     
@@ -2483,11 +2460,15 @@ class SquadSettings(object):
             return
         _squad = self.SquadList[squad_name]["InSquad"]
         if Mercenary_now in _squad:
+            place = mercenary_place(Mercenary_now)
             _squad.remove(Mercenary_now)
+            if place is not None:
+                autosave.record("remove_mercenary", wave = CurrentWave["Name"], squad = place[0], index = place[1])
             if len(_squad) == 0:
                 self.SquadList.pop(squad_name, None)
                 if "Squad" in CurrentWave and squad_name in CurrentWave["Squad"]:
                     CurrentWave["Squad"].pop(squad_name, None)
+                    autosave.record("remove_squad", wave = CurrentWave["Name"], squad = squad_name)
                 self.curLocalSquad = None if not self.SquadList else next(iter(self.SquadList))
             if self.curLocalSquad is not None and self.curLocalSquad in self.SquadList:
                 self.OpenSquad(self.curLocalSquad)
@@ -2536,6 +2517,8 @@ class SquadSettings(object):
 
         CurrentWave.setdefault("Squad", {})[Squad["Name"]] = Squad
         WaveManagerGlobal.CountingWave()
+        autosave.record("add_squad", wave = CurrentWave["Name"], squad = Squad["Name"],
+                        data = {k: v for k, v in Squad.items() if k != "InSquad"})
         return Squad["Name"]
 
     def ColorUpdate(self, Settings):
@@ -2596,6 +2579,7 @@ class SquadSettings(object):
             self.SquadList.pop(item, None)
             if "Squad" in CurrentWave and item in CurrentWave["Squad"]:
                 CurrentWave["Squad"].pop(item, None)
+                autosave.record("remove_squad", wave = CurrentWave["Name"], squad = item)
                 
         #for key in ["WaitForAll_spawn_text", "WaitForAll_dead_text", "Squad Name"]:
         #    if key in self.OperatingButtons:
@@ -2644,8 +2628,10 @@ class SquadSettings(object):
         global Mercenary_now
         if Mercenary_now != None:
             Mercenary_now.ChangeMySquad(Squad["Name"])
+            journal_mercenary(Mercenary_now)
             
         self.SquadList[self.curLocalSquad].update(Squad)
+        journal_squad(self.SquadList[self.curLocalSquad])
         self.OpenSquad(self.curLocalSquad)
         self.clearSquad()
 
@@ -2799,8 +2785,8 @@ class Mercenary(object):
                 # Функция для поиска типа оружия
                 def find_weapon_type(weapon_class, weapon_type):
                     nonlocal findType
-                    for weapon in weapons_libary.Weapon_Libary[weapon_class][weapon_type]:
-                        weapon_data = weapons_libary.Weapon_Libary[weapon_class][weapon_type][weapon]
+                    for weapon in game_data.Weapon_Libary[weapon_class][weapon_type]:
+                        weapon_data = game_data.Weapon_Libary[weapon_class][weapon_type][weapon]
                         if weapon_data["Id"].lower() == atr.lower() or weapon_data["name"].lower() == atr.lower():
                             atrWeapon[atr]["Type"] = weapon_type
                             findType = True
@@ -2812,7 +2798,7 @@ class Mercenary(object):
                         find_weapon_type(_template["Class"].title(), weapon_type)
 
             elif now_atr:
-                lib = atribute_libary.Atribute
+                lib = game_data.Atribute
                 if item in lib:
                     atrWeapon[now_atr]["Attributes"][item] = lib[item]
                     atrWeapon[now_atr]["Attributes"][item]["Value"] = atr
@@ -2879,13 +2865,13 @@ class Mercenary(object):
         
         atrbutes = {}
         for Atribute in _template["CharacterAttributes"]:
-            if Atribute.lower() in atribute_libary.Atribute:
-                atr = atribute_libary.Atribute[Atribute]
+            if Atribute.lower() in game_data.Atribute:
+                atr = game_data.Atribute[Atribute]
                 atr["Value"] = _template["CharacterAttributes"][Atribute]
                 atrbutes[atr["Name"]] = atr
 
         if "ItemAttributes" in _template and "ItemName" in _template["ItemAttributes"]:
-            weapon_data = weapons_libary.find_weapon_info(_template["ItemAttributes"]["ItemName"].title())
+            weapon_data = item_catalog.find_weapon_info(_template["ItemAttributes"]["ItemName"].title())
         else:
             weapon_data = None
             
@@ -2902,9 +2888,9 @@ class Mercenary(object):
             elif weapon_data["Type"] == "Melee":
                 Attributes_melee = get_weapon_atr
 
-        Primary =   WeaponData(Class=_template["Class"].title(), WeaponType="Primary",      weaponName=next(iter(weapons_libary.Weapon_Libary[_template["Class"].title()]["Primary"])), attrubutes =   Attributes_primary)
-        Secondary = WeaponData(Class=_template["Class"].title(), WeaponType="Secondary",    weaponName=next(iter(weapons_libary.Weapon_Libary[_template["Class"].title()]["Secondary"])), attrubutes = Attributes_secondary)
-        Melee =     WeaponData(Class=_template["Class"].title(), WeaponType="Melee",        weaponName=next(iter(weapons_libary.Weapon_Libary[_template["Class"].title()]["Melee"])), attrubutes =     Attributes_melee)
+        Primary =   WeaponData(Class=_template["Class"].title(), WeaponType="Primary",      weaponName=next(iter(game_data.Weapon_Libary[_template["Class"].title()]["Primary"])), attrubutes =   Attributes_primary)
+        Secondary = WeaponData(Class=_template["Class"].title(), WeaponType="Secondary",    weaponName=next(iter(game_data.Weapon_Libary[_template["Class"].title()]["Secondary"])), attrubutes = Attributes_secondary)
+        Melee =     WeaponData(Class=_template["Class"].title(), WeaponType="Melee",        weaponName=next(iter(game_data.Weapon_Libary[_template["Class"].title()]["Melee"])), attrubutes =     Attributes_melee)
 
         cosmeticslist = []
         if "Items" in _template:
@@ -2913,7 +2899,7 @@ class Mercenary(object):
                     continue
                 item_title = item.title()
                 
-                weapon_find = weapons_libary.find_weapon_info(item_title)
+                weapon_find = item_catalog.find_weapon_info(item_title)
                 index_name = parser.get_item_by_name(item_title)
                 
                 if weapon_find != None:
@@ -2985,13 +2971,13 @@ class Mercenary(object):
             return
                 
         if toClass == "Tank":
-            Primary =   WeaponData(Class="Scout", WeaponType="Primary",             weaponName=next(iter(weapons_libary.Weapon_Libary["Scout"]["Primary"])))
-            Secondary = WeaponData(Class="Scout", WeaponType="Secondary",           weaponName=next(iter(weapons_libary.Weapon_Libary["Scout"]["Secondary"])))
-            Melee =     WeaponData(Class="Scout", WeaponType="Melee",               weaponName=next(iter(weapons_libary.Weapon_Libary["Scout"]["Melee"])))
+            Primary =   WeaponData(Class="Scout", WeaponType="Primary",             weaponName=next(iter(game_data.Weapon_Libary["Scout"]["Primary"])))
+            Secondary = WeaponData(Class="Scout", WeaponType="Secondary",           weaponName=next(iter(game_data.Weapon_Libary["Scout"]["Secondary"])))
+            Melee =     WeaponData(Class="Scout", WeaponType="Melee",               weaponName=next(iter(game_data.Weapon_Libary["Scout"]["Melee"])))
         else:
-            Primary =   WeaponData(Class=toClass.title(), WeaponType="Primary",     weaponName=next(iter(weapons_libary.Weapon_Libary[toClass.title()]["Primary"])))
-            Secondary = WeaponData(Class=toClass.title(), WeaponType="Secondary",   weaponName=next(iter(weapons_libary.Weapon_Libary[toClass.title()]["Secondary"])))
-            Melee =     WeaponData(Class=toClass.title(), WeaponType="Melee",       weaponName=next(iter(weapons_libary.Weapon_Libary[toClass.title()]["Melee"])))
+            Primary =   WeaponData(Class=toClass.title(), WeaponType="Primary",     weaponName=next(iter(game_data.Weapon_Libary[toClass.title()]["Primary"])))
+            Secondary = WeaponData(Class=toClass.title(), WeaponType="Secondary",   weaponName=next(iter(game_data.Weapon_Libary[toClass.title()]["Secondary"])))
+            Melee =     WeaponData(Class=toClass.title(), WeaponType="Melee",       weaponName=next(iter(game_data.Weapon_Libary[toClass.title()]["Melee"])))
         
         self.stat = {
             "Name" : default_stat.Mercenary[toClass].get("Name"),
@@ -3205,6 +3191,7 @@ class Mercenary(object):
         
         self.update_squad_icon()
         self.update_icons()
+        journal_mercenary(self)
     
     def change_first_weapon_def(self, stat_weapon = None, gunIndex = str):
         if stat_weapon != None:
@@ -3233,10 +3220,14 @@ class Mercenary(object):
             icon = info.get('Icon')
             
             if icon is None:
-                item = parser.get_item_by_name(info.get('Name'))
+                if game_resources.is_ready():
+                    item = parser.get_item_by_name(info.get('Name'))
 
-                if item:
-                    icon = get_icon_from_game(item[0])                    
+                    if item:
+                        icon = get_icon_from_game(item[0])
+                else:
+                    # Иконка из игры подставится после загрузки, окно не ждет парсер и VPK
+                    game_resources.when_ready(lambda: Mercenary_now is self and self.update_weapon_icon(info, gunIndex))
             
         if gunIndex == 0:
             General_Information_Robot["Primary label_7"].setText(name)
@@ -3338,7 +3329,7 @@ class Atributes:
     global Mercenary_now
     def __init__(self, stat = None, scrollAreaWidgetContents_5 = None, verticalLayout_4 = None, horizontalLayout_2 = None):
         
-        self.atribut = atribute_libary.Atribute
+        self.atribut = game_data.Atribute
         
         self.stat = stat
         self.scrollAreaWidgetContents_5 = scrollAreaWidgetContents_5
@@ -3347,12 +3338,16 @@ class Atributes:
         self.spacer_2 = None
         self.ListButton = []
         self.AllButtonTile = []
+        self.TileByName = {}
+        self.tileSearch = None
+        self.tileVisible = None
         self.activeStats = {}
         self.AddDefault()
 
     def AddButtonToGeneral(self, stat = None, button = None):
 
         if button is not None:
+            self.TileByName.pop(stat["Name"].title(), None)
             self.DeleteFromList(button)
         #self.exit_select() #close window
         
@@ -3516,6 +3511,7 @@ class Atributes:
         verticalLayout.setObjectName("verticalLayout")
 
         self.verticalLayout = verticalLayout
+        self.ClearTile()
         self.FillTileAtribute()
         verticalLayout_8.addLayout(verticalLayout)
         
@@ -3535,7 +3531,7 @@ class Atributes:
         Cancel.clicked.connect(lambda : self.exit_select())
         mainLayout.addWidget(Cancel)
         
-        Seach_lineedit.editingFinished.connect(lambda: self.Search(Seach_lineedit.text()))
+        self.searchController = SearchController(self.Search, parent=Seach_lineedit).attach(Seach_lineedit)
         
         QtCore.QMetaObject.connectSlotsByName(GroupBox)
         GroupBox.show()
@@ -3619,6 +3615,10 @@ class Atributes:
             Icon.setStyleSheet(f"border-image: url({_systemPath.get('Plus')}); background-color: rgba(255, 255, 255, 0);")
             
         self.AllButtonTile.append(Item)
+        if stat is not None:
+            self.TileByName[stat["Name"].title()] = Item
+            if self.tileVisible is not None:
+                Item.setVisible(stat["Name"].title() in self.tileVisible)
         
         if self.spacer is not None:
             self.verticalLayout.removeItem(self.spacer)
@@ -3657,23 +3657,30 @@ class Atributes:
                 try: item.deleteLater()
                 except:pass
             self.AllButtonTile.clear()
+        self.TileByName = {}
+        self.tileSearch = None
+        self.tileVisible = None
             
     def FillTileAtribute(self, key = ""):
-        if len(key) > 0:
-            self.ClearTile()
-        
-        for item in self.atribut:
-            if len(key) > 0:
-                if key.lower() in self.atribut[item]["Name"].lower():
-                    self.AddButton(self.atribut[item])
-            else: 
+        # Кнопки создаются один раз, поиск только показывает и скрывает их
+        if self.tileSearch is None:
+            self.tileSearch = IncrementalMatcher({stat["Name"].title(): stat["Name"] for stat in self.atribut.values()})
+            for item in self.atribut:
                 self.AddButton(self.atribut[item])
+                
+        self.tileVisible = set(self.tileSearch.match(key))
+        self.scrollAreaWidgetContents_6.setUpdatesEnabled(False)
+        for name, button in self.TileByName.items():
+            button.setVisible(name in self.tileVisible)
+        self.scrollAreaWidgetContents_6.setUpdatesEnabled(True)
     
     def Search(self, searchText):
         self.FillTileAtribute(key = searchText)
 
     def DeleteFromList(self, button):
         try:
+            if button in self.AllButtonTile:
+                self.AllButtonTile.remove(button)
             button.deleteLater()
         except Exception as e:
             print(f"[ERROR] <Atributes> Could not delete button {button}: {e}")
@@ -4067,6 +4074,7 @@ class cosmetic_list:
         self.countButton = 0
         self.spacer = None
         self.allButtons = []
+        self.icon_loader = IconLoader(get_icon_from_game)
 
         # Make the scroll area and its contents scalable
         self.Cosmitis_list.setWidgetResizable(True)
@@ -4078,6 +4086,7 @@ class cosmetic_list:
         self.scrollAreaWidgetContents_6.setUpdatesEnabled(False)
 
     def clear(self):
+        self.icon_loader.cancel()
         if len(self.allButtons) > 0:
             for item in self.allButtons:
                 item.deleteLater()
@@ -4102,9 +4111,8 @@ class cosmetic_list:
                     stat = parser.get_item_by_key(item_key)
 
                     if stat:
-                        if "ready_icon" not in stat:
-                            index = parser.get_item_by_name(stat.get("name"))
-                            stat["ready_icon"] = get_icon_from_game(index[0])
+                        if "index_item" not in stat:
+                            stat["index_item"] = item_key
                         
                         self.AddButton(stat)
                     else:
@@ -4113,10 +4121,6 @@ class cosmetic_list:
                     print(f"Error processing cosmetic item {item}: {str(e)}")
                     continue
         else:
-            if "ready_icon" not in list_items:
-                index = parser.get_item_by_name(list_items.get("name"))
-                list_items["ready_icon"] = get_icon_from_game(index[0])
-                
             self.AddButton(list_items)
             
     def AddButton(self, stat = None):
@@ -4172,7 +4176,7 @@ class cosmetic_list:
             frame_5.setStyleSheet(f"border-image: url({_systemPath.get('Plus')});\n")
             label_15.setText("Add")
             
-            Item_2.mousePressEvent = (lambda x: open_addition_panel(self.filtered_items()))
+            Item_2.mousePressEvent = (lambda x: run_when_items_loaded(lambda: open_addition_panel(self.filtered_items())))
             
             frame_5.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
             label_15.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
@@ -4180,7 +4184,25 @@ class cosmetic_list:
         else:
             name_item = stat.get("name", "Unknow")
             label_15.setText(name_item)
-            frame_5.setStyleSheet(f"border-image: url({stat['ready_icon']});\n")
+            
+            if stat.get("ready_icon"):
+                frame_5.setStyleSheet(f"border-image: url({stat['ready_icon']});\n")
+            else:
+                # Иконка грузится в фоне, до этого в рамке серая заглушка
+                frame_5.setStyleSheet("background-color: rgb(70, 70, 70); border-radius: 6px;\n")
+                
+                def on_icon_ready(image, item_icon, stat = stat, frame_5 = frame_5):
+                    if not item_icon:
+                        return
+                    stat["ready_icon"] = item_icon
+                    frame_5.setStyleSheet(f"border-image: url({item_icon});\n")
+                    
+                index = stat.get("index_item")
+                if index is None:
+                    found = parser.get_item_by_name(stat.get("name"))
+                    index = found[0] if found else None
+                if index is not None:
+                    self.icon_loader.request(index, on_icon_ready)
 
             DeleteCosmeticButton = QtWidgets.QPushButton(parent=Item_2)
             DeleteCosmeticButton.setGeometry(QtCore.QRect(106, 4, 20, 20))
@@ -4242,7 +4264,7 @@ class cosmetic_list:
                               #"sleeves", 
                               #"right_shoulder"],	
         }
-        return parser.filter_items(criteria)
+        return catalog_items(item_catalog.find(ITEMS_GAME, class_name = criteria['used_by_classes'], region = criteria['equip_region']))
         
     def DeleteCosmetic(self, stat, Item_2):
         self.allButtons.remove(Item_2)
@@ -4256,7 +4278,7 @@ class WeaponData(object):
             return
 
         if weaponName != None:
-            weapon = weapons_libary.Weapon_Libary[Class][WeaponType].get(weaponName, None)
+            weapon = game_data.Weapon_Libary[Class][WeaponType].get(weaponName, None)
 
             if weapon is None:
                 weapon_find = parser.get_item_by_name(weaponName)
@@ -4275,7 +4297,7 @@ class WeaponData(object):
                         "Icon": weapon_find.get("image_inventory", ""),
                     }
         else:
-            weapon = weapons_libary.Weapon_Libary[Class][WeaponType][next(iter(weapons_libary.Weapon_Libary[Class][WeaponType]))]
+            weapon = game_data.Weapon_Libary[Class][WeaponType][next(iter(game_data.Weapon_Libary[Class][WeaponType]))]
         
         if weapon["Icon"] is None or weapon["Icon"] == "" or weapon["Icon"] == "None":
             index = parser.get_item_by_name(weapon["Id"])
@@ -4711,12 +4733,15 @@ class WeaponsAtributeMenu(QtWidgets.QMainWindow):
         self.AtributesInterface()
 
     def initAtr(self):
-        self.atribut = atribute_libary.Atribute
+        self.atribut = game_data.Atribute
         
         self.ListButtonAccepted = []
         self.spacer_2 = None
         self.ListButton = []
         self.AllButtonTile = []
+        self.TileByName = {}
+        self.tileSearch = None
+        self.tileVisible = None
         self.activeStats = {}
 
     def AtributesInterface(self):
@@ -4773,7 +4798,7 @@ class WeaponsAtributeMenu(QtWidgets.QMainWindow):
         Seach_lineedit.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.ArrowCursor))
         Seach_lineedit.setStyleSheet("font: 11pt \"TF2\";border:0;border-radius: 7px;background-color: rgb(61, 61, 61);color: rgb(255, 255, 255);")
         Seach_lineedit.setObjectName("Seach_lineedit")
-        Seach_lineedit.editingFinished.connect(lambda: self.Search(Seach_lineedit.text()))
+        self.searchController = SearchController(self.Search, parent=Seach_lineedit).attach(Seach_lineedit)
    
         Seach_icon = QtWidgets.QFrame(parent=Seach_lineedit)
         Seach_icon.setGeometry(QtCore.QRect(234, 3, 16, 16))
@@ -4862,16 +4887,23 @@ class WeaponsAtributeMenu(QtWidgets.QMainWindow):
                 except Exception as e:
                     print(f"Error deleting item: {e}")
             self.AllButtonTile.clear()
+        self.TileByName = {}
+        self.tileSearch = None
+        self.tileVisible = None
 
     def FillTileAtribute(self, key = ""):
-        self.ClearTile()
-        for item in self.atribut:
-            if len(key) > 0:
-                if key.lower() in self.atribut[item]["Name"].lower():
-                    self.AddButton(self.atribut[item])
-            else:
+        # Кнопки создаются один раз, поиск только показывает и скрывает их
+        if self.tileSearch is None:
+            self.tileSearch = IncrementalMatcher({stat["Name"].title(): stat["Name"] for stat in self.atribut.values()})
+            for item in self.atribut:
                 self.AddButton(self.atribut[item])
 
+        self.tileVisible = set(self.tileSearch.match(key))
+        self.scrollAreaWidgetContents_6.setUpdatesEnabled(False)
+        for name, button in self.TileByName.items():
+            button.setVisible(name in self.tileVisible)
+        self.scrollAreaWidgetContents_6.setUpdatesEnabled(True)
+
     def Search(self, searchText):
         self.FillTileAtribute(key = searchText)
 
@@ -4933,6 +4965,10 @@ class WeaponsAtributeMenu(QtWidgets.QMainWindow):
             Icon.setStyleSheet(f"border-image: url({_systemPath.get('Plus','Interface')}); background-color: rgba(255, 255, 255, 0);")
         
         self.AllButtonTile.append(Item)
+        if stat is not None:
+            self.TileByName[stat["Name"].title()] = Item
+            if self.tileVisible is not None:
+                Item.setVisible(stat["Name"].title() in self.tileVisible)
         
         if self.spacer != None:
             self.verticalLayout.removeItem(self.spacer)
@@ -4944,12 +4980,15 @@ class WeaponsAtributeMenu(QtWidgets.QMainWindow):
 
     def DeleteButtonAttribute(self, button):
         try:
+            if button in self.AllButtonTile:
+                self.AllButtonTile.remove(button)
             button.deleteLater()
         except Exception as e:
             print(f"Error deleting button: {e}")
             
     def AddButtonToGeneral(self, stat = None, button = None):
         if button is not None:
+            self.TileByName.pop(stat["Name"].title(), None)
             self.DeleteButtonAttribute(button)
             
         ButtunAddAtributes_2 = QtWidgets.QPushButton(parent=self.acceptedList)
@@ -5621,7 +5660,7 @@ class Mission_Support:
                         chosen_template = self.choose_template_robot(robot_type, is_chief, standard_health, existing_chief, wave_number)
 
                         if chosen_template:
-                            isFinded = find_robot_by_name(chosen_template["Name"])
+                            isFinded = item_catalog.find_robot_by_name(chosen_template["Name"])
                             if isFinded:
                                 if is_chief:
                                     existing_chief = True
@@ -5859,11 +5898,12 @@ class Mission_Support:
         }
         mercenary = Create_Mercenary_From_Save(list=create_stat, squadName=squadName, isGenerated=True)
         
-        if chosen_template and find_robot_by_name(chosen_template["Name"]) != None and robot.robot_type != "Tank":
-            mercenary.change_to_template(find_robot_by_name(chosen_template["Name"]), robot.cosmetics, robot_tag or [])
+        if chosen_template and item_catalog.find_robot_by_name(chosen_template["Name"]) != None and robot.robot_type != "Tank":
+            mercenary.change_to_template(item_catalog.find_robot_by_name(chosen_template["Name"]), robot.cosmetics, robot_tag or [])
         else:
             mercenary.change_class(robot.robot_type, True)
             mercenary.Set_Stat(create_stat)
+        journal_mercenary(mercenary, "add_mercenary")
         
         return mercenary
     
@@ -6246,7 +6286,7 @@ class MissionGeneratorWindow(QtWidgets.QMainWindow):
             }
         """
         )
-        self.generate_button.clicked.connect(self.generate_mission)
+        self.generate_button.clicked.connect(lambda: run_when_items_loaded(self.generate_mission, queue = True))
 
         self.cancel_button = QtWidgets.QPushButton("Cancel")
         self.cancel_button.setStyleSheet(
@@ -6790,7 +6830,6 @@ class General(object):
     
     def __init__(self):
         self.buttonsGlobal = {}
-        self.FinalCode = ""
 
     def bindExportButton(self, button):
         button.clicked.connect(self.createWavePop)
@@ -6798,306 +6837,13 @@ class General(object):
     def buttonAdd(self, name, param):
         self.buttonsGlobal[name] = param
 
-    def createMission(self):
-        initSettings = InitSettingsGlobal.returnConfiguration()
-        return (
-            f"""// MVM mission for Team Fortress 2
-// Created by Zane Tf2 in program Gray Factory
-
-#base robot_giant.pop
-#base robot_standard.pop
-#base robot_gatebot.pop
-
-WaveSchedule
-{{
-    StartingCurrency    {initSettings[0]}
-    RespawnWaveTime     {int(self.buttonsGlobal['fixedRespawn_text'].text())}
-    CanBotsAttackWhileInSpawnRoom	no
-"""
-        )
-
-    def createWaveSettings(self, wave):
-        settings = wave["Settings"]
-        text = "\n    Wave\n    {\n        WaitWhenDone 65\n        Checkpoint Yes\n"
-
-        if settings.get("Description"):
-            text += f'Description     "{settings["Description"]}"\n'
-        if settings.get("Sound"):
-            text += f'Sound   "{settings["Sound"]}"\n'
-
-        for key, output in {"StartWaveOutput": "StartWaveOutput", "InitWaveOutput": "InitWaveOutput", "DoneOutput": "DoneOutput"}.items():
-            if len(settings[key].replace("}", "").replace("\n", "")) > 5:
-                text += f"\n        {output}\n        {{\n{settings[key].replace('}', '')}\n        }}"
-
-        if settings.get("Custom"):
-            text += f"\n{settings['Custom']}"
-
-        return text
-
-    def createSquad(self, squadSettings):
-        spawn_positions = {
-            0: "spawnbot",
-            1: "spawnbot_mission_sniper",
-            2: "spawnbot_mission_spy",
-        }
-        spawnPos = spawn_positions.get(squadSettings['SpawnPostion'], squadSettings['SpawnPostion'])
-
-        conf = (
-            f"""
-        WaveSpawn
-        {{
-            Name   "{squadSettings['Name']}"
-            TotalCurrency   {squadSettings['Credits For Squad']}
-            TotalCount  {squadSettings['Total Squad']}
-            MaxActive   {squadSettings['Max Alive Squads']}
-            SpawnCount  {squadSettings['Squad Spawn']}
-"""
-        )
-
-        conf += self.addWaitParams(
-            squadSettings.get("Wait For All Spawn"),
-            squadSettings.get("Wait For All Dead"),
-            squadSettings.get("Wait Spawn Before"),
-            squadSettings.get("Wait Spawn Between"),
-        )
-
-        conf += f'            Where	"{spawnPos}"\n'
-        if squadSettings.get("Squad Is Support"):
-            conf += "            Support 1\n"
-        if squadSettings.get("Random Choice"):
-            conf += "            RandomChoice 1\n"
-        if squadSettings.get("Random Spawn"):
-            conf += "            RandomSpawn 1\n"
-        return conf
-
-    def addWaitParams(self, wait_all_spawn, wait_all_dead, wait_spawn_before, wait_spawn_between):
-        conf = ""
-        if wait_all_spawn:
-            conf += f'            WaitForAllSpawned "{wait_all_spawn}"\n'
-        if wait_all_dead:
-            conf += f'            WaitForAllDead "{wait_all_dead}"\n'
-        if wait_spawn_before:
-            conf += f"            WaitBeforeStarting {wait_spawn_before}\n"
-        if wait_spawn_between:
-            conf += f"            WaitBetweenSpawns {wait_spawn_between}\n"
-        return conf
-    
-    def createMercenary(self, wave):
-        Mers = ""
-        
-        if len(wave["Squad"]) > -1:
-            for squad_name, squad_data in wave["Squad"].items():
-                if len(squad_data["InSquad"]) > 0:
-                    Mers += self.createSquad(squad_data)
-                    Mers += "\n            Squad\n            {"
-                    
-                    for pers in squad_data["InSquad"]:
-                        Skill = ["Easy", "Normal", "Hard", "Expert"][pers.stat["Skill"]]
-                        WeaponRestrictions = ["All", "PrimaryOnly", "SecondaryOnly", "MeleeOnly"][pers.stat["Weapon Restriction"]]
-                        class_names = [
-                            "Scout", "Soldier", "Pyro", "Demoman", "HeavyWeapons",
-                            "Engineer", "Medic", "Sniper", "Spy", "Tank"
-                        ]
-                        className = class_names[pers.stat["Class"]]
-
-                        if pers.stat["Class"] == 9 or className == "Tank":
-                            Mers += self.generateTank(pers, wave["Squad"][squad_name]["SpawnPostion"])
-                        elif pers.stat["Template"]:
-                            Mers += self.generateTemplate(pers)
-                        else:
-                            Mers += self.generateTFBot(pers, Skill, WeaponRestrictions, className)
-                    
-                    Mers += "\n            }\n        }"
-            Mers += "\n    }"
-        return Mers
-    
-    def generateTemplate(self, pers):
-        bot = (f"\n                TFBot\n                {{\n                    Template {pers.stat['Template']}\n                ")
-
-        _behavior = ["None", "Push", "Iddler", "Mobber"][pers.stat["Behavior"]]
-        if _behavior != "None":
-            bot += f"\n				    BehaviorModifiers  {_behavior}"
-        
-        bot += self.generateTags(pers.stat["Tag"])
-        bot += self.generateCharacterAttributes(pers)
-        bot += self.generateAttributesGlobal(pers)
-        if int(pers.stat["AutoJump Min"]) > -1 or int(pers.stat["AutoJump Max"]) > -1:
-            bot += self.autoJump(pers)
-        bot += self.generateWeapons(pers)
-        bot += self.generateCosmetics(pers.stat["Cosmetics"])
-        bot += self.generateCustom(pers)
-        bot += "\n                }"
-        return bot
-    
-    def generateTFBot(self, pers : Mercenary, Skill, WeaponRestrictions, className):
-        bot = (
-            f"""
-                TFBot
-                {{
-                    Name    "{pers.stat['Name']}"
-                    ClassIcon  {pers.stat['Icon']}
-                    Health  {pers.stat['Health']}
-                    Class  {className}
-                    Skill  {Skill}
-                    Scale   {pers.stat['Scale']}
-            """
-        )
-        if WeaponRestrictions != "All":
-            bot += f"\n				    WeaponRestrictions  {WeaponRestrictions}"
-
-        _behavior = ["None", "Push", "Iddler", "Mobber"][pers.stat["Behavior"]]
-        if _behavior != "None":
-            bot += f"\n				    BehaviorModifiers  {_behavior}"
-        
-        bot += self.generateTags(pers.stat["Tag"])
-        bot += self.generateCharacterAttributes(pers)
-        bot += self.generateAttributesGlobal(pers)
-        if int(pers.stat["AutoJump Min"]) > -1 or int(pers.stat["AutoJump Max"]) > -1:
-            bot += self.autoJump(pers)
-        bot += self.generateWeapons(pers)
-        bot += self.generateCosmetics(pers.stat["Cosmetics"])
-        bot += self.generateCustom(pers)
-        bot += "\n                }"
-        return bot
-    
-    def autoJump(self, pers):
-        return f"""
-                    AutoJumpMin {pers.stat['AutoJump Min']}
-                    AutoJumpMax {pers.stat['AutoJump Max']}
-                    """
-
-    def generateCustom(self, pers : Mercenary):
-        return "".join(f'\n{pers.stat["Custom Parametrs"]}')
-    
-    def generateTank(self, pers, spawn_position):
-        return (
-            f"""
-                Tank
-                {{
-                    Health  {pers.stat['Health']}
-                    Speed   65
-                    StartingPathTrackNode {spawn_position}
-                    OnKilledOutput
-                    {{
-                        Target	boss_dead_relay
-                        Action	Trigger
-                    }}
-                    OnBombDroppedOutput
-                    {{
-                        Target	boss_deploy_relay
-                        Action	Trigger
-                    }}
-                }}
-            """
-        )
-
-    def generateTags(self, tags):
-        return "".join(f'\n                    Tag   "{tag}"' for tag in tags)
-
-    def generateCharacterAttributes(self, pers):
-        """
-        Генерирует текстовый блок для CharacterAttributes в формате:
-        CharacterAttributes
-        {
-            "name"    value
-        }
-        """
-        attributes = ""
-
-        if "CharacterAttributes" in pers.stat and len(pers.stat["CharacterAttributes"]) > 0:
-            attributes += "\n                    CharacterAttributes"
-            attributes += "\n                    {"
-            
-            for key, attribute in pers.stat["CharacterAttributes"].items():
-                # Проверяем, что атрибут имеет ключи "Name" и "Value"
-                if isinstance(attribute, dict) and "Name" in attribute and "Value" in attribute:
-                    name = attribute["Name"]
-                    value = attribute["Value"]
-                    attributes += f'\n                        "{name}"    {value}'
-                else:
-                    print(f"Unexpected attribute structure for key '{key}': {attribute}")
-
-            attributes += "\n                    }"
-
-        return attributes
-    
-    def generateAttributesGlobal(self, pers):
-        attributes = ""
-
-        if "Attributes" in pers.stat:
-            if isinstance(pers.stat["Attributes"], dict):
-                for attribute in pers.stat["Attributes"]:
-                    attributes += f'\n                    Attributes    {attribute}'
-            elif isinstance(pers.stat["Attributes"], list):
-                for attribute in pers.stat["Attributes"]:
-                    print(attribute)
-                    attributes += f'\n                    Attributes    {attribute}'
-            else:
-                print(f"Unexpected Attributes structure: {pers.stat['Attributes']}")
-        return attributes
-    
-    def generateWeapons(self, pers):
-        weapons = [pers.stat["Primary Weapon"], pers.stat["Secondary Weapons"], pers.stat["Melee"]]
-        weapons_data = ""
-        
-        #if len(pers.stat["Template"]) > 0:
-        #    return weapons_data
-        
-        for weapon in weapons:
-            if not weapon:  # Пропускаем, если оружие отсутствует
-                continue
-
-            item_name = weapon.get().get("Name", "Unknown Weapon")
-            attributes = weapon.get().get("Attributes", {})
-            custom = weapon.get().get("Custom", {})
-            weapons_data += f'\n                    Item    "{item_name}"'
-
-            if attributes or len(custom) > 0:
-                # Формируем блок ItemAttributes
-                weapons_data += "\n                    ItemAttributes"
-                weapons_data += "\n                    {"
-                weapons_data += f'\n                        ItemName        "{item_name}"'
-                
-                if len(custom) > 0:  # Проверяем наличие пользовательских данных
-                    weapons_data += f"\n{custom}\n"
-                
-                # Обработка списка атрибутов
-                if isinstance(attributes, list):
-                    for item in attributes:
-                        if isinstance(item, dict) and "Name" in item and "Value" in item:
-                            weapons_data += f'\n                        "{item["Name"]}"    {str(item["Value"]).replace(",", ".")}'
-                        else:
-                            print(f"Unexpected item structure in list: {item}")
-
-                # Обработка словаря атрибутов
-                elif isinstance(attributes, dict):
-                    for key, attr in attributes.items():
-                        if isinstance(attr, dict) and "Name" in attr and "Value" in attr:
-                            weapons_data += f'\n                        "{attr["Name"]}"    {str(attr["Value"]).replace(",", ".")}'
-                        else:
-                            print(f"Unexpected attribute structure in dict: {attr}")
-                weapons_data += "\n                    }"
-
-        return weapons_data
-
-
-    def generateCosmetics(self, cosmetics):
-        allText = ""
-        for cosmetic in cosmetics:
-            item = parser.get_item_by_key(cosmetic)
-            allText += f'\n                    Item "{item["name"]}"'
-            
-        return allText
-
     def createWavePop(self):
         SquadSettingsGlobal.clearSquad()
-                
-        self.FinalCode = self.createMission()
 
-        for wave in WaveManagerGlobal.waveList.values():
-            self.FinalCode += self.createWaveSettings(wave)
-            self.FinalCode += self.createMercenary(wave)
-        self.FinalCode += '\n}'
+        # Настройки читаются до диалога: ошибка в них не должна оставлять пустой файл
+        starting_currency = InitSettingsGlobal.returnConfiguration()[0]
+        respawn_time = int(self.buttonsGlobal['fixedRespawn_text'].text())
+
         # Генерация имени миссии
         mission_name = self.buttonsGlobal['mapName_text'].text()
         mission_suffix = self.buttonsGlobal['MissionName_text'].text()
@@ -7117,9 +6863,10 @@ WaveSchedule
         if not file_dialog or not file_dialog.name:
             return
 
-        # Сохранение содержимого в файл
-        with open(f'{file_dialog.name.replace(".pop", "")}.pop', "w") as file:
-            file.write(self.FinalCode)
+        # Миссия пишется в файл по частям, без сборки всего текста в памяти
+        emitter = PopEmitter(cosmetic_name = lambda key: parser.get_item_by_key(key)["name"])
+        export_mission(f'{file_dialog.name.replace(".pop", "")}.pop', emitter,
+                       starting_currency, respawn_time, WaveManagerGlobal.ExportWaves())
 
 class Button_Weapon_Atribute:
     global Mercenary_now
@@ -7182,6 +6929,7 @@ def Adding_New_Mercenary_To_Wave(exemplar : Mercenary = None, isGenerate = False
         Mercenary_now = None
         nameSquad = SquadSettingsGlobal.CreateSquad()
         exemplar  = Mercenary(nameSquad)
+        journal_mercenary(exemplar, "add_mercenary")
         component = _AddButtonInWaveList.AddButton(exemplar)
         
         if component != False:
@@ -7226,6 +6974,9 @@ def open_weapon(*arg, type = "Primary"):
     global Mercenary_now
     if Mercenary_now == None:
         return
+    if not game_resources.is_ready():
+        run_when_items_loaded(lambda: open_weapon(type = type))
+        return
     global type_now_weapon
     global Addition_interface
 
@@ -7233,7 +6984,7 @@ def open_weapon(*arg, type = "Primary"):
         type_now_weapon = type
         Ui_GroupBox().setupUi()
         _tile  = Tile()
-        _stat = weapons_libary.Weapon_Libary[Mercenary_now.stat["Class Name"]][type]
+        _stat = game_data.Weapon_Libary[Mercenary_now.stat["Class Name"]][type]
         _tile.firstStat = _stat
         _tile.AddButton(items=_stat, index=type)
         
@@ -7244,7 +6995,7 @@ def open_weapon(*arg, type = "Primary"):
         type_now_weapon = type
         Ui_GroupBox().setupUi()
         _tile  = Tile()
-        _stat = weapons_libary.Weapon_Libary[Mercenary_now.stat["Class Name"]][type]
+        _stat = game_data.Weapon_Libary[Mercenary_now.stat["Class Name"]][type]
         _tile.firstStat = _stat
         _tile.AddButton(items=_stat, index=type)
     else:
@@ -7256,6 +7007,46 @@ def open_addition_panel(stat):
     Ui_GroupBox().setupUi(stat)
     Tile().AddButton(items = stat, index = -1)
 
+_deferred_item_action = None
+
+def run_when_items_loaded(action, queue : bool = False) -> bool:
+    """
+    Выполняет действие, которому нужны items_game и каталог: сразу, если они
+    загружены, иначе после сигнала ready. Хранится только последнее отложенное
+    действие, чтобы повторные клики во время загрузки открыли одну панель.
+    Действия с queue=True меняют проект (новые наемники, генерация), поэтому
+    откладываются все, в порядке кликов.
+    """
+    global _deferred_item_action
+    if game_resources.is_ready():
+        action()
+        return True
+    if queue:
+        game_resources.when_ready(action)
+        return False
+    if _deferred_item_action is None:
+        game_resources.when_ready(_run_deferred_item_action)
+    _deferred_item_action = action
+    return False
+
+def _run_deferred_item_action():
+    global _deferred_item_action
+    action, _deferred_item_action = _deferred_item_action, None
+    if action is not None:
+        action()
+
+def catalog_items(keys : list) -> dict:
+    """Предметы items_game по ключам из каталога, в порядке каталога"""
+    items = {}
+    for key in keys:
+        item = parser.get_item_by_key(key)
+        if item is not None:
+            items[key] = item
+    return items
+
+# Размер, до которого декодируются иконки предметов (самая большая иконка в интерфейсе 90x90)
+ICON_DECODE_SIZE = 90
+
 def get_icon_from_game(iconKey : int) -> str:
     item = parser.get_item_by_key(iconKey)
     
@@ -7280,33 +7071,26 @@ def get_icon_from_game(iconKey : int) -> str:
             return None
         
         try:
-            pakfile = vpk_file_texture.get_file(item_icon_path)
+            icon_meta = vpk_file_texture.get_file_meta(item_icon_path)
         except:
             try:
                 item_icon_path = f"materials/backpack/weapons/c_models/c_{name}.vtf"
-                pakfile = vpk_file_texture.get_file(item_icon_path)
+                icon_meta = vpk_file_texture.get_file_meta(item_icon_path)
             except:
                 return None
-            
-        temp_path = Path(f"{resources()}/resources/temp")
-
-        temp_vtf = f"{temp_path}/temp.vtf"
-        if not os.path.exists(temp_path):
-            os.makedirs(temp_path)
-            
-        pakfile.save(temp_vtf)
         
-        vtf_parser = vtf2img_parser.Parser(temp_vtf)
-        image = vtf_parser.get_image()
+        # Повторные показы берутся с диска: ни VPK, ни декодер VTF не трогаются
+        cached = icon_cache.get(item_icon_path, icon_meta["crc32"], ICON_DECODE_SIZE)
+        if cached is not None:
+            return cached
         
-        name_image_file_clear = iconKey.replace("'", "")
-        image_name = f'{temp_path}/{name_image_file_clear}.png'
-        image.save(image_name)
+        pakfile = vpk_file_texture.get_file(item_icon_path)
+        # VTF декодируется прямо из памяти, без временного temp.vtf
+        vtf_parser = vtf2img_parser.Parser.from_bytes(pakfile.read())
+        # Иконки показываются не больше 90x90: декодируется ближайший подходящий мипмап
+        image = vtf_parser.get_image(max_size=ICON_DECODE_SIZE)
         
-        if os.path.exists(image_name):
-            return str(image_name).replace("\\", "/")
-        else:
-            return None
+        return icon_cache.put(item_icon_path, icon_meta["crc32"], ICON_DECODE_SIZE, image)
         
     except AttributeError as e:
         print(f"Image URL not found for icon key '{iconKey}': {e}")
@@ -7316,9 +7100,77 @@ def close_app():
     """Закрытие приложения и очистка временных файлов"""
     if Addition_interface is not None:
         Addition_interface.close()
+    # Папка temp осталась от старых версий: иконки теперь живут в icon_cache
     temp = Path(f"{resources()}/resources/temp")
     if temp.exists():
         shutil.rmtree(temp)
+    print(f"Icon cache: {icon_cache.stats()}")
+    # Незаписанный проект не должен потеряться при выходе
+    SaveManagerGlobal.saver.wait()
+    # Штатный выход: журнал автосохранения больше не нужен
+    autosave.close()
+
+def journal_wave(wave : dict = None):
+    """Записывает волну целиком в журнал автосохранения: новую или очищенную волну"""
+    wave = CurrentWave if wave is None else wave
+    if autosave.active and isinstance(wave, dict) and wave.get("Name") in WaveManagerGlobal.waveList:
+        autosave.record("wave", wave = wave["Name"], data = SaveManagerGlobal.wave_snapshot(wave))
+
+def journal_squad(squad : dict):
+    """Записывает настройки отряда текущей волны (без состава)"""
+    if not autosave.active or not isinstance(CurrentWave, dict):
+        return
+    for key, value in CurrentWave.get("Squad", {}).items():
+        if value is squad:
+            autosave.record("squad", wave = CurrentWave["Name"], squad = key,
+                            data = {k: v for k, v in squad.items() if k != "InSquad"})
+            return
+
+def mercenary_place(mercenary):
+    """Отряд (ключ в текущей волне) и позиция наемника в нем, или None"""
+    if not isinstance(CurrentWave, dict):
+        return None
+    for key, squad in CurrentWave.get("Squad", {}).items():
+        for index, item in enumerate(squad["InSquad"]):
+            if item is mercenary:
+                return key, index
+    return None
+
+def journal_mercenary(mercenary, op : str = "mercenary"):
+    """
+    Записывает параметры наемника по его месту в отряде текущей волны
+
+    Args:
+        mercenary: Наемник
+        op: "mercenary" - изменение, "add_mercenary" - новый наемник
+    """
+    if not autosave.active:
+        return
+    place = mercenary_place(mercenary)
+    if place is not None:
+        autosave.record(op, wave = CurrentWave["Name"], squad = place[0], index = place[1],
+                        data = SaveManager.mercenary_snapshot(mercenary))
+
+def start_autosave():
+    """
+    Предлагает восстановить проект после аварийного завершения и начинает журнал автосохранения
+    """
+    global project_file
+    global path_project_file
+    recovered = autosave.recover() if autosave.has_session() else None
+    if recovered is not None:
+        data, recovered_file = recovered
+        answer = QtWidgets.QMessageBox.question(
+            app.Main, "Gray Factory",
+            "The previous session was not closed properly.\nRestore unsaved changes?")
+        if answer == QtWidgets.QMessageBox.StandardButton.Yes:
+            try:
+                SaveManagerGlobal.LoadData(data)
+                project_file = recovered_file
+                path_project_file = recovered_file
+            except Exception as e:
+                print(f"[ERROR] Failed to restore autosave: {e}")
+    autosave.start(SaveManagerGlobal.snapshot(), project_file)
         
 colorQuality = {
     "Unique" :      "217, 210, 41",
@@ -7338,6 +7190,8 @@ colorQuality = {
 # === Глобальные менеджеры и основные объекты приложения ===
 generalGlobal = General()
 SaveManagerGlobal = SaveManager()
+# Журнал правок проекта на случай аварийного завершения
+autosave = AutosaveJournal(Path(resources()) / "resources" / "autosave", snapshot_provider = SaveManagerGlobal.snapshot)
 InitSettingsGlobal = InitialSettings()
 WaveManagerGlobal = WaveManager()
 CustomAtributeGlobal = CustomAtributes()
@@ -7365,6 +7219,7 @@ AnchorModel = None
 # === Переменные для работы с файлами и проектом ===
 project_file = None
 path_project_file = None
+PROJECT_FILETYPES = [('Json Project', '*.json'), ('Gray Factory Project', f'*{PROJECT_EXTENSION}')]
 
 # === Переменные для текущего состояния и выбора ===
 listButtonForMercenary = []
@@ -7508,32 +7363,66 @@ def get_game_path(resources_func) -> Path:
         else:
             print("Ошибка сохранения конфигурации, попробуйте еще раз.")
 
-GamePath = get_game_path(resources)
+with startup_profiler.phase("game path"):
+    GamePath = get_game_path(resources)
 
 items_file = Path(os.path.join(f"{GamePath}/scripts/items", 'items_game.txt'))
 vpk_file = f"{GamePath}/tf2_textures_dir.vpk"
-vpk_file_texture = vpk.open(vpk_file)
-
-if items_file is not None:
-    try:
-        parser = TF2ItemsParser(items_file)
-        parser.load()
-        #all_game_items = parser.get_all_items()
-        #print(f"\nTotal items loaded: {len(all_game_items)}")
-        
-    except ImportError as e:
-        print(f"Ошибка импорта: {e}")
-        sys.exit(1)
-else:
-    print(f"Файл items_game.txt не найден по пути: {items_file}")
-    sys.exit(1)
+with startup_profiler.phase("icon cache"):
+    icon_cache = IconCache(Path(resources()) / "resources" / "icon_cache")
+
+# items_game, каталог и VPK загружаются в фоне, пока строится окно.
+# Прокси ведут себя как сами объекты и ждут загрузки, только если обратиться к ним раньше
+game_resources = GameResources(
+    items_file, vpk_file,
+    items_cache = Path(resources()) / "resources" / "items_game.cache",
+    catalog_path = Path(resources()) / "resources" / "item_catalog.db")
+parser = game_resources.proxy(PARSER)
+item_catalog = game_resources.proxy(CATALOG)
+vpk_file_texture = game_resources.proxy(TEXTURES)
+
+def show_splash(qt_app) -> QtWidgets.QSplashScreen:
+    """Заставка на время построения главного окна"""
+    pixmap = QtGui.QPixmap(_systemPath.get("icon_gray_factory.png", 'icon') or "")
+    if not pixmap.isNull():
+        pixmap = pixmap.scaled(256, 256, QtCore.Qt.AspectRatioMode.KeepAspectRatio, QtCore.Qt.TransformationMode.SmoothTransformation)
+    splash = QtWidgets.QSplashScreen(pixmap)
+    splash.showMessage("Loading...", QtCore.Qt.AlignmentFlag.AlignBottom | QtCore.Qt.AlignmentFlag.AlignHCenter, QtGui.QColor("white"))
+    splash.show()
+    qt_app.processEvents()
+    return splash
+
+def on_game_resources_failed(message : str):
+    """Без items_game и VPK редактор работать не может"""
+    print(f"Ошибка загрузки файлов игры: {message}")
+    QtWidgets.QMessageBox.critical(None, "Gray Factory", f"Не удалось загрузить файлы игры:\n{message}")
+    QtWidgets.QApplication.exit(1)
 
 if __name__ == "__main__":
-    app = Ui_MainWindow()
+    qt_app = QtWidgets.QApplication(sys.argv)
+    splash = show_splash(qt_app)
+    game_resources.failed.connect(on_game_resources_failed)
+    game_resources.start()
+
+    with startup_profiler.phase("main window"):
+        app = Ui_MainWindow()
+    splash.finish(app.Main)
+
+    # Пока предметы загружаются, об этом напоминает заголовок окна
+    title = app.Main.windowTitle()
+    if not game_resources.is_ready():
+        app.Main.setWindowTitle(f"{title} - loading game items...")
+    game_resources.when_ready(lambda: app.Main.setWindowTitle(title))
+    # Восстановленному проекту нужны предметы игры, поэтому журнал стартует после загрузки
+    game_resources.when_ready(start_autosave)
 
     if Addition_interface is not None:
         Addition_interface.close()
         
     app.app.aboutToQuit.connect(close_app)
+    # Отчет пишется, когда окно показано и файлы игры загружены
+    if startup_profiler.ENABLED:
+        game_resources.when_ready(lambda: QtCore.QTimer.singleShot(0, startup_profiler.finish))
+        game_resources.failed.connect(lambda message: startup_profiler.finish())
     
     sys.exit(app.app.exec())
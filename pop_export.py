@@ -0,0 +1,248 @@
+"""
+Headless pop-file exporter
+
+Renders saved projects (the JSON written by SaveManager.Save) to .pop files
+without Qt or Tk. The text comes from the same PopEmitter the editor uses, so
+the output matches General.createWavePop. Several projects are exported in
+parallel on a process pool.
+
+Cosmetic names are looked up in items_game.txt, which is parsed (through its
+cache) only if a project actually contains cosmetics.
+
+Usage:
+    python pop_export.py project.json [more.json ...] [-o OUT_DIR] [-j JOBS] [--mission-name]
+                         [--game TF_DIR | --items-game ITEMS_GAME_TXT]
+"""
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from resources import resources
+from pop_writer import PopEmitter, export_mission, project_waves
+
+# Значения полей главного окна, пока пользователь их не менял
+DEFAULT_STARTING_CURRENCY = 400
+DEFAULT_RESPAWN_TIME = 5
+
+
+class ExportResult(NamedTuple):
+    project: str
+    output: Optional[str]
+    size: int
+    error: Optional[str]
+
+
+def load_project(path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def project_settings(project: dict) -> dict:
+    """
+    GlobalSettings of a project (stored in its first wave)
+    """
+    if not project:
+        return {}
+    return project[next(iter(project))].get("GlobalSettings") or {}
+
+
+def respawn_time(settings: dict) -> int:
+    """
+    RespawnWaveTime of a project
+
+    The editor saves the text of the respawn field once it was edited and
+    keeps the integer 0 otherwise, while the field itself shows 5.
+    """
+    value = settings.get("restartTime")
+    if value is None or value == 0 or value == "":
+        return DEFAULT_RESPAWN_TIME
+    return int(value)
+
+
+def mission_name(project: dict) -> str:
+    """
+    File name the editor suggests on export: map name plus mission name
+    """
+    settings = project_settings(project)
+    name = settings.get("Map Name") or ""
+    if settings.get("Mission Name"):
+        name += f"_{settings['Mission Name']}"
+    return name
+
+
+def find_items_game(game_path=None) -> Optional[Path]:
+    """
+    items_game.txt of the given game folder, or of the one saved in resources/config.json
+    """
+    if game_path is None:
+        try:
+            with open(Path(resources()) / "resources" / "config.json", "r", encoding="utf-8") as f:
+                game_path = json.load(f).get("game_path")
+        except (OSError, ValueError):
+            return None
+    if not game_path:
+        return None
+    items_file = Path(game_path) / "scripts" / "items" / "items_game.txt"
+    return items_file if items_file.is_file() else None
+
+
+class ItemNames:
+    """
+    Cosmetic key -> item name, items_game is parsed on the first lookup
+    """
+
+    def __init__(self, items_game: Optional[Path]):
+        self.items_game = items_game
+        self._parser = None
+
+    def __call__(self, key) -> str:
+        if self._parser is None:
+            if self.items_game is None:
+                raise FileNotFoundError("items_game.txt is required for cosmetics: pass --game or --items-game")
+            from tf2_items_parser import TF2ItemsParser
+            parser = TF2ItemsParser(self.items_game, cache_path=Path(resources()) / "resources" / "items_game.cache")
+            parser.load()
+            self._parser = parser
+        item = self._parser.get_item_by_key(key)
+        if item is None:
+            raise KeyError(f"Cosmetic '{key}' is not in items_game")
+        return item["name"]
+
+
+# Имена предметов живут в процессе-обработчике, чтобы items_game разбирался один раз на процесс
+_item_names: Optional[ItemNames] = None
+
+
+def _init_worker(items_game: Optional[Path]) -> None:
+    global _item_names
+    _item_names = ItemNames(items_game)
+
+
+def output_path(project_path, project: Optional[dict] = None, output_dir=None, use_mission_name: bool = False) -> Path:
+    """
+    .pop file a project is exported to
+
+    Args:
+        project_path: Project JSON
+        project: Loaded project, needed only with use_mission_name
+        output_dir: Folder of the .pop file, the project's folder by default
+        use_mission_name: Name the file after the map and mission, as the editor suggests, instead of the project
+    """
+    project_path = Path(project_path)
+    name = (use_mission_name and mission_name(project)) or project_path.stem
+    return Path(output_dir or project_path.parent) / f"{name}.pop"
+
+
+def export_project(project_path, output) -> ExportResult:
+    """
+    Render one saved project to a .pop file
+
+    Args:
+        project_path: Project JSON
+        output: .pop file to write
+
+    Returns:
+        ExportResult with the written path and size, or the error message
+    """
+    project_path = Path(project_path)
+    try:
+        project = load_project(project_path)
+        settings = project_settings(project)
+        size = export_mission(str(output), PopEmitter(_item_names or ItemNames(None)),
+                              settings.get("money", DEFAULT_STARTING_CURRENCY), respawn_time(settings),
+                              project_waves(project))
+    except Exception as e:
+        return ExportResult(str(project_path), None, 0, f"{type(e).__name__}: {e}")
+    return ExportResult(str(project_path), str(output), size, None)
+
+
+def plan_outputs(project_paths, output_dir=None, use_mission_name: bool = False) -> List[ExportResult]:
+    """
+    Output file of every project, worked out before anything is written
+
+    A project whose output is already taken by an earlier project, or whose
+    name cannot be determined, gets an ExportResult with the error instead.
+
+    Returns:
+        One ExportResult per project, in input order; `output` is set and `error` is None for exportable ones
+    """
+    planned = []
+    owners = {}
+    for project_path in project_paths:
+        try:
+            project = load_project(project_path) if use_mission_name else None
+            output = output_path(project_path, project, output_dir, use_mission_name)
+        except Exception as e:
+            planned.append(ExportResult(str(project_path), None, 0, f"{type(e).__name__}: {e}"))
+            continue
+        # Разные написания одного пути на диске - тоже один файл
+        key = os.path.normcase(os.path.abspath(output))
+        if key in owners:
+            planned.append(ExportResult(str(project_path), None, 0, f"{output} is also written by {owners[key]}"))
+            continue
+        owners[key] = project_path
+        planned.append(ExportResult(str(project_path), str(output), 0, None))
+    return planned
+
+
+def export_projects(project_paths, output_dir=None, items_game: Optional[Path] = None,
+                    jobs: Optional[int] = None, use_mission_name: bool = False) -> List[ExportResult]:
+    """
+    Export many projects, in parallel when there is more than one
+
+    Args:
+        project_paths: Project JSON files
+        output_dir: Folder for the .pop files, next to each project by default
+        items_game: items_game.txt used for cosmetic names
+        jobs: Worker processes, the CPU count by default
+        use_mission_name: Name the files after map and mission instead of the projects
+
+    Returns:
+        One ExportResult per project, in input order; projects sharing an output file are not exported
+    """
+    results = plan_outputs(project_paths, output_dir, use_mission_name)
+    todo = [index for index, result in enumerate(results) if result.error is None]
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    paths = [results[index].project for index in todo]
+    outputs = [results[index].output for index in todo]
+    jobs = min(jobs or os.cpu_count() or 1, len(todo))
+    if jobs <= 1:
+        _init_worker(items_game)
+        exported = [export_project(path, output) for path, output in zip(paths, outputs)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(items_game,)) as pool:
+            exported = list(pool.map(export_project, paths, outputs))
+    for index, result in zip(todo, exported):
+        results[index] = result
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="pop_export", description="Export saved Gray Factory projects to .pop files")
+    parser.add_argument("projects", nargs="+", help="project JSON files")
+    parser.add_argument("-o", "--output-dir", help="folder for the .pop files (default: next to each project)")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--game", help="Team Fortress 2 'tf' folder (default: the one saved in config.json)")
+    parser.add_argument("--items-game", help="path to items_game.txt, overrides --game")
+    parser.add_argument("--mission-name", action="store_true",
+                        help="name the .pop files '<map>_<mission>' like the editor instead of after the projects")
+    args = parser.parse_args(argv)
+
+    items_game = Path(args.items_game) if args.items_game else find_items_game(args.game)
+    failed = 0
+    for result in export_projects(args.projects, args.output_dir, items_game, args.jobs, args.mission_name):
+        if result.error:
+            failed += 1
+            print(f"FAILED {result.project}: {result.error}", file=sys.stderr)
+            continue
+        print(f"{result.project} -> {result.output} ({result.size} chars)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
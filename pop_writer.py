@@ -0,0 +1,443 @@
+"""
+Streaming pop-file exporter
+
+PopEmitter walks the waves of a project and writes the mission through a
+PopWriter straight into the output file, instead of concatenating the whole
+document into one string first. The text is the same as the exporter in
+General produced before, byte for byte.
+
+PopWriter is a small buffered writer: chunks are collected in a list and
+handed to the underlying stream once `buffer_size` characters have
+accumulated. line() starts a new line indented by `depth` levels of four
+spaces, the layout used by pop files.
+
+project_waves() turns waves in the save format into the in-memory layout
+PopEmitter reads, for exports of saved projects and of .gfp waves the
+editor has not opened yet.
+"""
+import os
+import threading
+from io import StringIO
+from typing import Callable, Iterable, List, TextIO
+
+SKILLS = ["Easy", "Normal", "Hard", "Expert"]
+WEAPON_RESTRICTIONS = ["All", "PrimaryOnly", "SecondaryOnly", "MeleeOnly"]
+BEHAVIORS = ["None", "Push", "Iddler", "Mobber"]
+CLASS_NAMES = [
+    "Scout", "Soldier", "Pyro", "Demoman", "HeavyWeapons",
+    "Engineer", "Medic", "Sniper", "Spy", "Tank"
+]
+SPAWN_POSITIONS = {
+    0: "spawnbot",
+    1: "spawnbot_mission_sniper",
+    2: "spawnbot_mission_spy",
+}
+WAVE_OUTPUTS = ("StartWaveOutput", "InitWaveOutput", "DoneOutput")
+
+
+class PopWriter:
+    """
+    Buffered, indentation-aware text writer
+
+    Usage:
+        with open(path, "w") as file, PopWriter(file) as writer:
+            writer.line("WaveSpawn", 2)
+    """
+
+    INDENT = "    "
+    DEFAULT_BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, stream: TextIO, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            stream: Text stream receiving the output
+            buffer_size: Characters collected before they are written to the stream
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.written = 0
+        self._chunks = []
+        self._pending = 0
+
+    def write(self, text: str) -> None:
+        self._chunks.append(text)
+        self._pending += len(text)
+        if self._pending >= self.buffer_size:
+            self.flush()
+
+    def line(self, text: str, depth: int = 0) -> None:
+        """
+        Start a new line indented by `depth` levels
+        """
+        self.write(f"\n{self.INDENT * depth}{text}")
+
+    def flush(self) -> None:
+        if self._chunks:
+            self.stream.write("".join(self._chunks))
+            self.written += self._pending
+            self._chunks.clear()
+            self._pending = 0
+
+    def __enter__(self) -> "PopWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
+
+class PopEmitter:
+    """
+    Write a mission (WaveSchedule with its waves, squads and bots) to a PopWriter
+
+    Args:
+        cosmetic_name: Function returning the item name of a cosmetic key (items_game lookup)
+    """
+
+    def __init__(self, cosmetic_name: Callable[[str], str]):
+        self.cosmetic_name = cosmetic_name
+
+    def mission(self, w: PopWriter, starting_currency, respawn_time: int, waves: Iterable[dict]) -> None:
+        """
+        Write the whole document
+
+        Args:
+            w: Output writer
+            starting_currency: StartingCurrency value
+            respawn_time: RespawnWaveTime value
+            waves: Wave dicts with "Settings" and "Squad", in order
+        """
+        w.write(
+            f"""// MVM mission for Team Fortress 2
+// Created by Zane Tf2 in program Gray Factory
+
+#base robot_giant.pop
+#base robot_standard.pop
+#base robot_gatebot.pop
+
+WaveSchedule
+{{
+    StartingCurrency    {starting_currency}
+    RespawnWaveTime     {respawn_time}
+    CanBotsAttackWhileInSpawnRoom	no
+"""
+        )
+        for wave in waves:
+            self.wave_settings(w, wave)
+            self.mercenaries(w, wave)
+        w.write('\n}')
+
+    def wave_settings(self, w: PopWriter, wave: dict) -> None:
+        settings = wave["Settings"]
+        w.write("\n    Wave\n    {\n        WaitWhenDone 65\n        Checkpoint Yes\n")
+
+        if settings.get("Description"):
+            w.write(f'Description     "{settings["Description"]}"\n')
+        if settings.get("Sound"):
+            w.write(f'Sound   "{settings["Sound"]}"\n')
+
+        for output in WAVE_OUTPUTS:
+            if len(settings[output].replace("}", "").replace("\n", "")) > 5:
+                w.line(output, 2)
+                w.line("{", 2)
+                w.line(settings[output].replace('}', ''))
+                w.line("}", 2)
+
+        if settings.get("Custom"):
+            w.line(settings['Custom'])
+
+    def squad(self, w: PopWriter, squad_settings: dict) -> None:
+        spawn_position = SPAWN_POSITIONS.get(squad_settings['SpawnPostion'], squad_settings['SpawnPostion'])
+
+        w.line("WaveSpawn", 2)
+        w.line("{", 2)
+        w.line(f'Name   "{squad_settings["Name"]}"', 3)
+        w.line(f"TotalCurrency   {squad_settings['Credits For Squad']}", 3)
+        w.line(f"TotalCount  {squad_settings['Total Squad']}", 3)
+        w.line(f"MaxActive   {squad_settings['Max Alive Squads']}", 3)
+        w.line(f"SpawnCount  {squad_settings['Squad Spawn']}", 3)
+        w.write("\n")
+
+        self.wait_params(
+            w,
+            squad_settings.get("Wait For All Spawn"),
+            squad_settings.get("Wait For All Dead"),
+            squad_settings.get("Wait Spawn Before"),
+            squad_settings.get("Wait Spawn Between"),
+        )
+
+        w.write(f'            Where	"{spawn_position}"\n')
+        if squad_settings.get("Squad Is Support"):
+            w.write("            Support 1\n")
+        if squad_settings.get("Random Choice"):
+            w.write("            RandomChoice 1\n")
+        if squad_settings.get("Random Spawn"):
+            w.write("            RandomSpawn 1\n")
+
+    def wait_params(self, w: PopWriter, wait_all_spawn, wait_all_dead, wait_spawn_before, wait_spawn_between) -> None:
+        if wait_all_spawn:
+            w.write(f'            WaitForAllSpawned "{wait_all_spawn}"\n')
+        if wait_all_dead:
+            w.write(f'            WaitForAllDead "{wait_all_dead}"\n')
+        if wait_spawn_before:
+            w.write(f"            WaitBeforeStarting {wait_spawn_before}\n")
+        if wait_spawn_between:
+            w.write(f"            WaitBetweenSpawns {wait_spawn_between}\n")
+
+    def mercenaries(self, w: PopWriter, wave: dict) -> None:
+        for squad_name, squad_data in wave["Squad"].items():
+            if len(squad_data["InSquad"]) > 0:
+                self.squad(w, squad_data)
+                w.line("Squad", 3)
+                w.line("{", 3)
+
+                for pers in squad_data["InSquad"]:
+                    skill = SKILLS[pers.stat["Skill"]]
+                    weapon_restrictions = WEAPON_RESTRICTIONS[pers.stat["Weapon Restriction"]]
+                    class_name = CLASS_NAMES[pers.stat["Class"]]
+
+                    if pers.stat["Class"] == 9 or class_name == "Tank":
+                        self.tank(w, pers, squad_data["SpawnPostion"])
+                    elif pers.stat["Template"]:
+                        self.template(w, pers)
+                    else:
+                        self.tfbot(w, pers, skill, weapon_restrictions, class_name)
+
+                w.line("}", 3)
+                w.line("}", 2)
+        w.line("}", 1)
+
+    def template(self, w: PopWriter, pers) -> None:
+        w.line("TFBot", 4)
+        w.line("{", 4)
+        w.line(f"Template {pers.stat['Template']}", 5)
+        w.line("", 4)
+
+        behavior = BEHAVIORS[pers.stat["Behavior"]]
+        if behavior != "None":
+            w.write(f"\n				    BehaviorModifiers  {behavior}")
+        self.bot_body(w, pers)
+
+    def tfbot(self, w: PopWriter, pers, skill: str, weapon_restrictions: str, class_name: str) -> None:
+        w.line("TFBot", 4)
+        w.line("{", 4)
+        w.line(f'Name    "{pers.stat["Name"]}"', 5)
+        w.line(f"ClassIcon  {pers.stat['Icon']}", 5)
+        w.line(f"Health  {pers.stat['Health']}", 5)
+        w.line(f"Class  {class_name}", 5)
+        w.line(f"Skill  {skill}", 5)
+        w.line(f"Scale   {pers.stat['Scale']}", 5)
+        w.line("", 3)
+        if weapon_restrictions != "All":
+            w.write(f"\n				    WeaponRestrictions  {weapon_restrictions}")
+
+        behavior = BEHAVIORS[pers.stat["Behavior"]]
+        if behavior != "None":
+            w.write(f"\n				    BehaviorModifiers  {behavior}")
+        self.bot_body(w, pers)
+
+    def bot_body(self, w: PopWriter, pers) -> None:
+        """
+        Everything after the header of a TFBot block, including the closing brace
+        """
+        self.tags(w, pers.stat["Tag"])
+        self.character_attributes(w, pers)
+        self.attributes_global(w, pers)
+        if int(pers.stat["AutoJump Min"]) > -1 or int(pers.stat["AutoJump Max"]) > -1:
+            self.auto_jump(w, pers)
+        self.weapons(w, pers)
+        self.cosmetics(w, pers.stat["Cosmetics"])
+        w.line(pers.stat["Custom Parametrs"])
+        w.line("}", 4)
+
+    def auto_jump(self, w: PopWriter, pers) -> None:
+        w.line(f"AutoJumpMin {pers.stat['AutoJump Min']}", 5)
+        w.line(f"AutoJumpMax {pers.stat['AutoJump Max']}", 5)
+        w.line("", 5)
+
+    def tank(self, w: PopWriter, pers, spawn_position) -> None:
+        w.write(
+            f"""
+                Tank
+                {{
+                    Health  {pers.stat['Health']}
+                    Speed   65
+                    StartingPathTrackNode {spawn_position}
+                    OnKilledOutput
+                    {{
+                        Target	boss_dead_relay
+                        Action	Trigger
+                    }}
+                    OnBombDroppedOutput
+                    {{
+                        Target	boss_deploy_relay
+                        Action	Trigger
+                    }}
+                }}
+            """
+        )
+
+    def tags(self, w: PopWriter, tags) -> None:
+        for tag in tags:
+            w.line(f'Tag   "{tag}"', 5)
+
+    def character_attributes(self, w: PopWriter, pers) -> None:
+        if "CharacterAttributes" in pers.stat and len(pers.stat["CharacterAttributes"]) > 0:
+            w.line("CharacterAttributes", 5)
+            w.line("{", 5)
+
+            for key, attribute in pers.stat["CharacterAttributes"].items():
+                # Проверяем, что атрибут имеет ключи "Name" и "Value"
+                if isinstance(attribute, dict) and "Name" in attribute and "Value" in attribute:
+                    w.line(f'"{attribute["Name"]}"    {attribute["Value"]}', 6)
+                else:
+                    print(f"Unexpected attribute structure for key '{key}': {attribute}")
+
+            w.line("}", 5)
+
+    def attributes_global(self, w: PopWriter, pers) -> None:
+        if "Attributes" in pers.stat:
+            if isinstance(pers.stat["Attributes"], dict):
+                for attribute in pers.stat["Attributes"]:
+                    w.line(f"Attributes    {attribute}", 5)
+            elif isinstance(pers.stat["Attributes"], list):
+                for attribute in pers.stat["Attributes"]:
+                    w.line(f"Attributes    {attribute}", 5)
+            else:
+                print(f"Unexpected Attributes structure: {pers.stat['Attributes']}")
+
+    def weapons(self, w: PopWriter, pers) -> None:
+        for weapon in (pers.stat["Primary Weapon"], pers.stat["Secondary Weapons"], pers.stat["Melee"]):
+            if not weapon:  # Пропускаем, если оружие отсутствует
+                continue
+
+            stat = weapon.get()
+            item_name = stat.get("Name", "Unknown Weapon")
+            attributes = stat.get("Attributes", {})
+            custom = stat.get("Custom", {})
+            w.line(f'Item    "{item_name}"', 5)
+
+            if attributes or len(custom) > 0:
+                w.line("ItemAttributes", 5)
+                w.line("{", 5)
+                w.line(f'ItemName        "{item_name}"', 6)
+
+                if len(custom) > 0:  # Проверяем наличие пользовательских данных
+                    w.write(f"\n{custom}\n")
+
+                # Обработка списка атрибутов
+                if isinstance(attributes, list):
+                    for item in attributes:
+                        if isinstance(item, dict) and "Name" in item and "Value" in item:
+                            w.line(f'"{item["Name"]}"    {str(item["Value"]).replace(",", ".")}', 6)
+                        else:
+                            print(f"Unexpected item structure in list: {item}")
+
+                # Обработка словаря атрибутов
+                elif isinstance(attributes, dict):
+                    for attr in attributes.values():
+                        if isinstance(attr, dict) and "Name" in attr and "Value" in attr:
+                            w.line(f'"{attr["Name"]}"    {str(attr["Value"]).replace(",", ".")}', 6)
+                        else:
+                            print(f"Unexpected attribute structure in dict: {attr}")
+                w.line("}", 5)
+
+    def cosmetics(self, w: PopWriter, cosmetics) -> None:
+        for cosmetic in cosmetics:
+            w.line(f'Item "{self.cosmetic_name(cosmetic)}"', 5)
+
+
+WEAPON_SLOTS = ("Primary Weapon", "Secondary Weapons", "Melee")
+WEAPON_FIELDS = ("Name", "Icon", "Class", "Type", "ID", "Custom Name", "Description", "Custom", "Quality", "Attributes")
+
+
+class SavedWeapon:
+    """Weapon of a saved mercenary, with the get() interface of WeaponData"""
+
+    def __init__(self, stat: dict):
+        self.stat = {field: stat.get(field) for field in WEAPON_FIELDS}
+
+    def get(self, index: str = None):
+        return self.stat if index is None else self.stat[index]
+
+
+class SavedMercenary:
+    """Saved mercenary with the stat layout Mercenary.Set_Stat_from_Save produces"""
+
+    def __init__(self, stat: dict):
+        self.stat = dict(stat)
+        for slot in WEAPON_SLOTS:
+            weapon = stat.get(slot)
+            self.stat[slot] = SavedWeapon(weapon) if weapon else None
+        # В редакторе эти поля всегда заполнены, в старых сохранениях их может не быть
+        self.stat["Tag"] = stat.get("Tag") or []
+        self.stat["Cosmetics"] = stat.get("Cosmetics") or []
+        self.stat["CharacterAttributes"] = stat.get("CharacterAttributes") or {}
+        self.stat["Attributes"] = stat.get("Attributes", [])
+        for key in ("AutoJump Min", "AutoJump Max"):
+            if self.stat.get(key) in (None, ""):
+                self.stat[key] = -1
+
+
+def project_waves(project: dict) -> List[dict]:
+    """
+    Waves of a saved project in the form WaveManager keeps them in memory
+
+    Mirrors WaveManager.SetFromSave and SquadSettings.SetSquadFromSettings:
+    a mercenary belongs to a squad only if its "Squad" field names it.
+    """
+    waves = []
+    for wave in project.values():
+        squads = {}
+        for squad in (wave.get("Squad") or wave.get("Squads") or {}).values():
+            squad = dict(squad)
+            squad["InSquad"] = [SavedMercenary(mercenary) for mercenary in squad.get("InSquad", [])
+                                if mercenary.get("Squad") == squad.get("Name")]
+            squads[squad.get("Name")] = squad
+        settings = wave.get("Settings") or {}
+        waves.append({
+            "Name": wave.get("Name"),
+            "Squad": squads,
+            "Settings": {
+                "Description":      settings.get("Description"),
+                "Sound":            settings.get("Sound"),
+                "StartWaveOutput":  settings.get("StartWaveOutput") or "",
+                "InitWaveOutput":   settings.get("InitWaveOutput") or "",
+                "DoneOutput":       settings.get("DoneOutput") or "",
+                "Custom":           settings.get("Custom"),
+            },
+        })
+    return waves
+
+
+def render_mission(emitter: PopEmitter, starting_currency, respawn_time: int, waves: Iterable[dict]) -> str:
+    """
+    The mission as one string (previews and comparisons)
+    """
+    stream = StringIO()
+    with PopWriter(stream) as writer:
+        emitter.mission(writer, starting_currency, respawn_time, waves)
+    return stream.getvalue()
+
+
+def export_mission(path: str, emitter: PopEmitter, starting_currency, respawn_time: int, waves: Iterable[dict]) -> int:
+    """
+    Stream the mission into a file
+
+    The text goes to a uniquely named temporary file next to `path`, which
+    replaces the target only when the export succeeded, so an error never
+    leaves a truncated pop file behind.
+
+    Returns:
+        Number of characters written
+    """
+    # Имя уникально для процесса и потока: параллельные экспорты не мешают друг другу
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "w") as file:
+            with PopWriter(file) as writer:
+                emitter.mission(writer, starting_currency, respawn_time, waves)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return writer.written
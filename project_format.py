@@ -0,0 +1,198 @@
+"""
+Binary project format (.gfp)
+
+A project is stored as a header, a wave index and one compressed record per
+wave, so a project can be opened without decoding every wave:
+
+    header   magic b"GFPJ", version, index length      (struct "<4sHI")
+    index    JSON {"settings": GlobalSettings,
+                   "waves": [{"name", "offset", "length", "money"}, ...]}
+    records  zlib-compressed JSON of each wave, offsets relative to the end of the index
+
+LazyProject reads the file into memory and behaves like the dict the JSON
+save format produces ({wave name: wave}, GlobalSettings in the first wave);
+a wave is decompressed and parsed on first access. LazyProject.encoded()
+hands out a wave still in its compressed form (EncodedWave): snapshots of
+waves the user never opened carry it as is, encode_project() copies the
+record without decoding, and the JSON writers decode it on the saver thread
+through json_default(). JSON projects are still read by read_project() and
+both formats convert into each other:
+
+    python project_format.py mission.json mission.gfp
+"""
+import sys
+import json
+import zlib
+import struct
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Union
+
+from project_io import write_atomic
+
+PROJECT_MAGIC = b"GFPJ"
+PROJECT_VERSION = 1
+PROJECT_EXTENSION = ".gfp"
+_HEADER = struct.Struct("<4sHI")
+
+
+def is_binary_project(path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(PROJECT_MAGIC)) == PROJECT_MAGIC
+    except OSError:
+        return False
+
+
+class EncodedWave:
+    """
+    Wave kept as its compressed record; immutable, so snapshots may share it between threads
+    """
+
+    __slots__ = ("name", "record", "money")
+
+    def __init__(self, name: str, record: bytes, money=None):
+        self.name = name
+        self.record = record
+        self.money = money
+
+    def decode(self) -> dict:
+        return json.loads(zlib.decompress(self.record))
+
+
+def json_default(obj):
+    """
+    `default` hook for json.dump: decodes EncodedWave values
+    """
+    if isinstance(obj, EncodedWave):
+        return obj.decode()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_project(project: Mapping[str, Any], level: int = 6) -> bytes:
+    """
+    Encode a project in the save format into the binary format
+
+    Args:
+        project: {wave name: wave}, GlobalSettings in the first wave
+        level: zlib compression level
+
+    Returns:
+        Contents of a .gfp file
+    """
+    settings = {}
+    waves = []
+    records = []
+    offset = 0
+    for name in project:
+        wave = project[name]
+        if isinstance(wave, EncodedWave):
+            # Неоткрытая волна переносится в новый файл без распаковки
+            record, money = wave.record, wave.money
+        else:
+            if "GlobalSettings" in wave:
+                wave = dict(wave)
+                settings = wave.pop("GlobalSettings")
+            record = zlib.compress(json.dumps(wave, separators=(",", ":"), default=json_default).encode("utf-8"), level)
+            money = wave.get("Money")
+        waves.append({"name": name, "offset": offset, "length": len(record), "money": money})
+        records.append(record)
+        offset += len(record)
+    index = json.dumps({"settings": settings, "waves": waves}).encode("utf-8")
+    return b"".join([_HEADER.pack(PROJECT_MAGIC, PROJECT_VERSION, len(index)), index] + records)
+
+
+class LazyProject(Mapping):
+    """
+    Read-only project in the binary format; waves are decoded on first access
+    """
+
+    def __init__(self, data: bytes):
+        magic, version, index_length = _HEADER.unpack_from(data, 0)
+        if magic != PROJECT_MAGIC or version != PROJECT_VERSION:
+            raise ValueError("Unsupported project file")
+        index = json.loads(data[_HEADER.size:_HEADER.size + index_length])
+        self.settings: dict = index["settings"]
+        self._index: Dict[str, dict] = {wave["name"]: wave for wave in index["waves"]}
+        self._data = data
+        self._data_offset = _HEADER.size + index_length
+        self._waves: Dict[str, dict] = {}
+
+    @classmethod
+    def open(cls, path) -> "LazyProject":
+        # Файл читается целиком: он сжат и невелик, а открытый mmap мешал бы перезаписи проекта
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def encoded(self, name: str) -> EncodedWave:
+        """
+        Wave as its compressed record, without decoding it
+
+        GlobalSettings are not part of the record: use it for waves other than the first.
+        """
+        entry = self._index[name]
+        start = self._data_offset + entry["offset"]
+        return EncodedWave(name, self._data[start:start + entry["length"]], entry["money"])
+
+    def __getitem__(self, name: str) -> dict:
+        wave = self._waves.get(name)
+        if wave is None:
+            wave = self.encoded(name).decode()
+            if name == next(iter(self._index)):
+                wave["GlobalSettings"] = self.settings
+            self._waves[name] = wave
+        return wave
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._waves
+
+
+def read_project(path) -> Union[dict, LazyProject]:
+    """
+    Open a project in either format; JSON is parsed at once, the binary format lazily
+    """
+    if is_binary_project(path):
+        return LazyProject.open(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def project_bytes(path, project: Mapping[str, Any]) -> bytes:
+    """
+    File contents of `project` in the format chosen by the extension of `path`
+    """
+    if str(path).endswith(PROJECT_EXTENSION):
+        return encode_project(project)
+    return json.dumps({name: project[name] for name in project}, default=json_default).encode("utf-8")
+
+
+def convert_project(source, target) -> None:
+    """
+    Convert a project between JSON and the binary format (chosen by the extension of `target`)
+    """
+    write_atomic(str(target), project_bytes(target, read_project(source)))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="project_format",
+                                     description="Convert Gray Factory projects between JSON and the binary .gfp format")
+    parser.add_argument("source", help="project to read (.json or .gfp)")
+    parser.add_argument("target", help=f"file to write, binary if it ends with {PROJECT_EXTENSION}, JSON otherwise")
+    args = parser.parse_args(argv)
+    try:
+        convert_project(args.source, args.target)
+    except (OSError, ValueError) as e:
+        print(f"FAILED {args.source}: {e}", file=sys.stderr)
+        return 1
+    print(f"{args.source} -> {args.target} ({Path(args.target).stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
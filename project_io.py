@@ -0,0 +1,136 @@
+"""
+Project saving helpers
+
+write_atomic() replaces a file through a temporary file in the same folder,
+so a crash or a full disk during a save never leaves a truncated project.
+
+ProjectSaver writes project snapshots on a background thread. Snapshots are
+plain JSON-compatible structures taken on the GUI thread (see
+SaveManager.snapshot in main.py); the worker only serializes and writes
+them. If several saves of the same file are queued, only the newest one is
+written.
+"""
+import os
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def write_atomic(path: str, data, encoding: str = "utf-8") -> None:
+    """
+    Write bytes or text to `path` atomically
+
+    Args:
+        path: Target file
+        data: bytes, or str encoded with `encoding`
+        encoding: Text encoding
+    """
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def to_json_compatible(obj: Any) -> Any:
+    """
+    Copy dicts and lists recursively, turning path objects into strings
+
+    The result shares no mutable containers with `obj`, so it can be handed
+    to another thread while the original keeps changing.
+    """
+    if isinstance(obj, dict):
+        return {k: to_json_compatible(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [to_json_compatible(i) for i in obj]
+    elif hasattr(obj, "as_posix"):
+        return str(obj)
+    else:
+        return obj
+
+
+class ProjectSaver:
+    """
+    Background writer of project snapshots
+
+    Usage:
+        saver = ProjectSaver()
+        saver.save("mission.json", snapshot, on_done=lambda path, error: ...)
+        saver.wait()  # before the application exits
+    """
+
+    def __init__(self, serializer: Callable[[Any], bytes] = None):
+        """
+        Args:
+            serializer: Function turning a snapshot into file contents, JSON by default
+        """
+        self.serializer = serializer or (lambda snapshot: json.dumps(snapshot).encode("utf-8"))
+        self._pending: Dict[str, Tuple[Any, Optional[Callable], Callable[[Any], bytes]]] = {}
+        self._condition = threading.Condition()
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+    def save(self, path: str, snapshot: Any, on_done: Optional[Callable[[str, Optional[Exception]], None]] = None,
+             serializer: Optional[Callable[[Any], bytes]] = None) -> None:
+        """
+        Queue a snapshot for writing; replaces a queued, not yet written snapshot of the same file
+
+        Args:
+            path: Target file
+            snapshot: Data for the serializer; must not be modified afterwards
+            on_done: Called on the worker thread with the path and the error (None on success)
+            serializer: Overrides the saver's serializer for this file
+        """
+        with self._condition:
+            self._pending[path] = (snapshot, on_done, serializer or self.serializer)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="project-saver", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._pending:
+                    self._thread = None
+                    self._condition.notify_all()
+                    return
+                path = next(iter(self._pending))
+                snapshot, on_done, serializer = self._pending.pop(path)
+                self._busy = True
+            error = None
+            try:
+                write_atomic(path, serializer(snapshot))
+            except Exception as e:
+                error = e
+                print(f"[ERROR] Failed to save project '{path}': {e}")
+            try:
+                if on_done is not None:
+                    on_done(path, error)
+            except Exception as e:
+                print(f"[ERROR] Save callback failed: {e}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def is_idle(self) -> bool:
+        with self._condition:
+            return not self._pending and not self._busy
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued snapshot is written
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
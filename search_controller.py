@@ -0,0 +1,116 @@
+"""
+Debounced incremental search for the item and attribute pickers
+
+SearchController collects textChanged signals of a line edit and runs the
+search callback once the user stops typing for `delay_ms`. A newer query
+cancels the pending one, and a query equal to the last executed one is not
+run again (editingFinished right after the debounce fired is free).
+
+IncrementalMatcher does case-insensitive substring matching over a fixed set
+of candidates. When the new query extends the previous one, only the previous
+matches are scanned.
+"""
+from typing import Callable, Dict, Hashable, List, Optional
+
+from PyQt6 import QtCore, QtWidgets
+
+
+class IncrementalMatcher:
+    """
+    Substring matcher that narrows the previous result when the query grows
+
+    Args:
+        candidates: Dict of key -> searchable text, in display order
+    """
+
+    def __init__(self, candidates: Dict[Hashable, str]):
+        self._keys = list(candidates)
+        self._texts = {key: (text or "").lower() for key, text in candidates.items()}
+        self._last_query = ""
+        self._last_matches = self._keys
+
+    def match(self, query: Optional[str]) -> List[Hashable]:
+        """
+        Keys whose text contains the query, in candidate order
+
+        Args:
+            query: Substring to search for; empty matches everything
+
+        Returns:
+            List of matching keys
+        """
+        query = (query or "").lower()
+        if not query:
+            matches = self._keys
+        else:
+            # Запрос продолжает предыдущий - достаточно сузить прошлый результат
+            pool = self._last_matches if self._last_query and query.startswith(self._last_query) else self._keys
+            texts = self._texts
+            matches = [key for key in pool if query in texts[key]]
+        self._last_query = query
+        self._last_matches = matches
+        return matches
+
+
+class SearchController(QtCore.QObject):
+    """
+    Debounce and deduplicate search queries coming from a QLineEdit
+
+    Usage:
+        controller = SearchController(self.Search, parent=line_edit)
+        controller.attach(line_edit)
+    """
+
+    DEFAULT_DELAY_MS = 250
+
+    def __init__(self, callback: Callable[[str], None], delay_ms: int = DEFAULT_DELAY_MS, parent=None):
+        """
+        Args:
+            callback: Function running the search, called on the GUI thread
+            delay_ms: Debounce window in milliseconds
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.callback = callback
+        self._pending: Optional[str] = None
+        self._last: Optional[str] = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def attach(self, line_edit: QtWidgets.QLineEdit) -> "SearchController":
+        """
+        Run the search while typing (debounced) and immediately on Enter / focus loss
+        """
+        line_edit.textChanged.connect(self.set_query)
+        line_edit.editingFinished.connect(lambda: self.set_query(line_edit.text(), immediate=True))
+        return self
+
+    def set_query(self, text: str, immediate: bool = False) -> None:
+        """
+        Schedule a search; replaces any query still waiting for the debounce window
+        """
+        self._pending = text
+        if immediate:
+            self.flush()
+        else:
+            self._timer.start()
+
+    def cancel(self) -> None:
+        """
+        Drop the pending query
+        """
+        self._timer.stop()
+        self._pending = None
+
+    def flush(self) -> None:
+        """
+        Run the pending query now
+        """
+        self._timer.stop()
+        query, self._pending = self._pending, None
+        if query is None or query == self._last:
+            return
+        self._last = query
+        self.callback(query)
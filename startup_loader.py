@@ -0,0 +1,202 @@
+"""
+Background loading of the game resources
+
+Parsing items_game.txt (plus the item catalog build) and indexing the textures
+VPK used to run at import time of main.py, before any window existed.
+GameResources runs both on worker threads, so the splash and the main window
+are shown while they load; `ready` is emitted on the GUI thread once
+everything is available.
+
+Code that needs a resource either waits for readiness (when_ready) or goes
+through a ResourceProxy, which behaves like the loaded object and blocks only
+if it is used before that resource has finished loading.
+"""
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from PyQt6 import QtCore
+
+import vpk
+from tf2_items_parser import TF2ItemsParser
+from item_catalog import ItemCatalog
+
+import startup_profiler
+
+# Ресурсы, которые загружает GameResources
+PARSER = "parser"
+CATALOG = "catalog"
+TEXTURES = "textures"
+
+
+class ResourceProxy:
+    """
+    Stand-in for a resource that is still loading; attribute access waits for it
+
+    Usage:
+        parser = resources.proxy(PARSER)
+        parser.get_item_by_key(key)  # blocks until items_game is parsed
+    """
+
+    __slots__ = ("_resources", "_name")
+
+    def __init__(self, resources: "GameResources", name: str):
+        self._resources = resources
+        self._name = name
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._resources.get(self._name), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._resources.is_loaded(self._name) else "loading"
+        return f"<ResourceProxy {self._name}: {state}>"
+
+
+class GameResources(QtCore.QObject):
+    """
+    Load items_game, the item catalog and the textures VPK on worker threads
+
+    Signals:
+        loaded(str): A resource finished loading (PARSER, CATALOG or TEXTURES)
+        ready(): Every resource is loaded
+        failed(str): Loading stopped with an error message
+    """
+
+    loaded = QtCore.pyqtSignal(str)
+    ready = QtCore.pyqtSignal()
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, items_file: Path, vpk_file: str, items_cache: Path, catalog_path: Path, parent=None):
+        """
+        Args:
+            items_file: Path of scripts/items/items_game.txt
+            vpk_file: Path of tf2_textures_dir.vpk
+            items_cache: Parsed items_game cache used by TF2ItemsParser
+            catalog_path: SQLite item catalog database
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.items_file = Path(items_file)
+        self.vpk_file = vpk_file
+        self.items_cache = Path(items_cache)
+        self.catalog_path = Path(catalog_path)
+        self.error: Optional[str] = None
+        self._values: Dict[str, Any] = {}
+        self._events = {name: threading.Event() for name in (PARSER, CATALOG, TEXTURES)}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._callbacks = []
+        # Слот объекта GUI-потока: сигналы из рабочих потоков доставляются через очередь
+        self.ready.connect(self._on_ready)
+
+    def start(self) -> None:
+        """
+        Start the worker threads; does nothing if they are already running
+        """
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._run, args=(self._load_items,), name="load-items-game", daemon=True),
+                threading.Thread(target=self._run, args=(self._load_textures,), name="load-textures-vpk", daemon=True),
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def _load_items(self) -> None:
+        if not self.items_file.is_file():
+            raise FileNotFoundError(f"Файл items_game.txt не найден по пути: {self.items_file}")
+        parser = TF2ItemsParser(self.items_file, cache_path=self.items_cache)
+        with startup_profiler.phase("load items_game"):
+            parser.load()
+        self._set(PARSER, parser)
+        # Каталог пересобирается только при изменении items_game.txt или библиотек
+        with startup_profiler.phase("item catalog"):
+            catalog = ItemCatalog(self.catalog_path)
+            catalog.build(parser)
+        self._set(CATALOG, catalog)
+
+    def _load_textures(self) -> None:
+        with startup_profiler.phase("open textures vpk"):
+            self._set(TEXTURES, vpk.open(self.vpk_file))
+
+    def _run(self, load: Callable[[], None]) -> None:
+        try:
+            load()
+        except Exception as e:
+            with self._lock:
+                first = self.error is None
+                if first:
+                    self.error = f"{type(e).__name__}: {e}"
+            # Ожидающие потоки должны проснуться и получить ошибку, а не зависнуть
+            for event in self._events.values():
+                event.set()
+            if first:
+                self.failed.emit(self.error)
+
+    def _set(self, name: str, value: Any) -> None:
+        with self._lock:
+            self._values[name] = value
+            self._events[name].set()
+            # Готовность видит только поток, загрузивший последний ресурс
+            ready = self.is_ready()
+        # Сигналы - вне блокировки, как и колбэки в _on_ready
+        self.loaded.emit(name)
+        if ready:
+            self.ready.emit()
+
+    def _on_ready(self) -> None:
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._values
+
+    def is_ready(self) -> bool:
+        return self.error is None and all(name in self._values for name in self._events)
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        """
+        Get a resource, waiting for it to load
+
+        Args:
+            name: PARSER, CATALOG or TEXTURES
+            timeout: Seconds to wait, forever when omitted
+
+        Returns:
+            The loaded object
+
+        Raises:
+            RuntimeError: Loading failed or the timeout expired
+        """
+        value = self._values.get(name)
+        if value is not None:
+            return value
+        # Модуль импортирован без запуска окна - загрузка начинается по требованию
+        self.start()
+        if not self._events[name].wait(timeout):
+            raise RuntimeError(f"Game resource '{name}' is still loading")
+        if name not in self._values:
+            raise RuntimeError(f"Game resource '{name}' failed to load: {self.error}")
+        return self._values[name]
+
+    def proxy(self, name: str) -> ResourceProxy:
+        return ResourceProxy(self, name)
+
+    def when_ready(self, callback: Callable[[], None]) -> bool:
+        """
+        Run the callback on the GUI thread once every resource is loaded
+
+        Returns:
+            True if it ran immediately, False if it was deferred until `ready`
+        """
+        with self._lock:
+            # ready еще может стоять в очереди событий - тогда колбэк выполнит _on_ready
+            deferred = not self.is_ready() or bool(self._callbacks)
+            if deferred:
+                self._callbacks.append(callback)
+        if not deferred:
+            callback()
+        return not deferred
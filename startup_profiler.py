@@ -0,0 +1,245 @@
+"""
+Startup phase profiler
+
+Launch the editor with `--profile-startup` (optionally `--profile-startup=<path>`)
+to record wall time and allocation deltas of every startup phase and of every
+module imported during startup. When the first event loop iteration runs, the
+report is written as JSON (resources/startup_profile.json by default) next to
+a collapsed-stack file (`.folded`) that flamegraph.pl and speedscope read.
+
+Phases may run on worker threads: each thread gets its own stack under a
+`thread:<name>` frame. Allocation deltas come from tracemalloc and are
+process-wide, so phases that overlap in time also see each other's allocations.
+The peak of a phase includes the peaks of its nested phases. Peaks rely on
+tracemalloc.reset_peak(), which is process-wide too: a phase starting on one
+thread resets the peak other threads were tracking, so while background
+phases run the peaks of overlapping phases are lower bounds.
+
+Without the flag, phase() is a no-op and no import hook is installed.
+"""
+import sys
+import json
+import time
+import builtins
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FLAG = "--profile-startup"
+
+
+def _requested_output() -> Optional[str]:
+    for arg in sys.argv[1:]:
+        if arg == FLAG:
+            return ""
+        if arg.startswith(FLAG + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+_output = _requested_output()
+ENABLED = _output is not None
+
+
+class _Frame:
+    __slots__ = ("name", "kind", "start", "duration", "alloc", "peak", "children")
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.start = 0.0
+        self.duration = 0.0
+        self.alloc = 0
+        self.peak = 0
+        self.children: List["_Frame"] = []
+
+    def to_dict(self, origin: float) -> Dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "alloc_bytes": self.alloc,
+            "peak_bytes": self.peak,
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+
+
+_origin = time.perf_counter()
+_root = _Frame("startup", "root")
+_root.start = _origin
+_stacks = threading.local()
+_tree_lock = threading.Lock()
+_original_import = builtins.__import__
+_finished = False
+
+
+def _stack() -> List[_Frame]:
+    stack = getattr(_stacks, "frames", None)
+    if stack is None:
+        # Рабочие потоки получают свою ветку в дереве
+        if threading.current_thread() is threading.main_thread():
+            stack = [_root]
+        else:
+            frame = _Frame(threading.current_thread().name, "thread")
+            frame.start = time.perf_counter()
+            with _tree_lock:
+                _root.children.append(frame)
+            stack = [_root, frame]
+        _stacks.frames = stack
+    return stack
+
+
+# tracemalloc.reset_peak() появился в Python 3.9; без него пик участка - прирост памяти к его концу
+_HAS_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+
+def _fold_peak(frame: _Frame, peak: int) -> None:
+    # Пик считается от памяти на входе в участок; у ветки потока alloc - уже прирост
+    if frame.kind not in ("root", "thread"):
+        frame.peak = max(frame.peak, peak - frame.alloc)
+
+
+def _enter(name: str, kind: str) -> _Frame:
+    frame = _Frame(name, kind)
+    stack = _stack()
+    parent = stack[-1]
+    with _tree_lock:
+        parent.children.append(frame)
+    stack.append(frame)
+    current, peak = tracemalloc.get_traced_memory()
+    if _HAS_RESET_PEAK:
+        # reset_peak() сотрет пик, которого родитель достиг до вложенного участка
+        _fold_peak(parent, peak)
+        tracemalloc.reset_peak()
+    frame.alloc = current
+    frame.start = time.perf_counter()
+    return frame
+
+
+def _exit(frame: _Frame) -> None:
+    frame.duration = time.perf_counter() - frame.start
+    current, peak = tracemalloc.get_traced_memory()
+    if not _HAS_RESET_PEAK:
+        peak = current
+    start_alloc = frame.alloc
+    # frame.peak уже может содержать пики вложенных участков
+    _fold_peak(frame, peak)
+    frame.peak = max(frame.peak, 0)
+    frame.alloc = current - start_alloc
+    stack = _stack()
+    stack.pop()
+    # Пик вложенного участка учитывается и в родителе, пересчитанный от памяти на входе в родителя
+    parent = stack[-1]
+    if parent.kind == "thread":
+        parent.duration = time.perf_counter() - parent.start
+        parent.alloc += frame.alloc
+    elif parent is not _root:
+        parent.peak = max(parent.peak, frame.peak + start_alloc - parent.alloc)
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Record a startup phase
+
+    Usage:
+        with startup_profiler.phase("load items_game"):
+            parser.load()
+    """
+    if not ENABLED or _finished:
+        yield
+        return
+    frame = _enter(name, "phase")
+    try:
+        yield
+    finally:
+        _exit(frame)
+
+
+def _profiled_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # Учитываются только модули, которые импортируются впервые
+    if level or name in sys.modules or _finished:
+        return _original_import(name, globals, locals, fromlist, level)
+    frame = _enter(name, "import")
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _exit(frame)
+
+
+def install() -> None:
+    """
+    Start recording if the flag was given: tracemalloc and the import hook
+    """
+    if not ENABLED or builtins.__import__ is _profiled_import:
+        return
+    tracemalloc.start()
+    builtins.__import__ = _profiled_import
+
+
+def _folded(frame: _Frame, prefix: str, lines: List[str]) -> None:
+    path = f"{prefix};{frame.kind}:{frame.name}" if prefix else frame.name
+    own = frame.duration - sum(child.duration for child in frame.children)
+    if own > 0:
+        lines.append(f"{path} {int(own * 1_000_000)}")
+    for child in frame.children:
+        _folded(child, path, lines)
+
+
+def report() -> Dict:
+    """
+    Build the report of everything recorded so far
+    """
+    _root.duration = time.perf_counter() - _origin
+    with _tree_lock:
+        phases = [child.to_dict(_origin) for child in _root.children]
+    return {
+        "version": 1,
+        "argv": sys.argv,
+        "python": sys.version,
+        "total_ms": round(_root.duration * 1000, 3),
+        "traced_memory_bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+        "phases": phases,
+    }
+
+
+def finish(output_path: Optional[str] = None) -> Optional[Path]:
+    """
+    Stop recording and write the JSON report and the collapsed-stack file
+
+    Args:
+        output_path: Report path; the --profile-startup value or resources/startup_profile.json by default
+
+    Returns:
+        Path of the JSON report, or None when profiling is disabled
+    """
+    global _finished
+    if not ENABLED or _finished:
+        return None
+    data = report()
+    _finished = True
+    if builtins.__import__ is _profiled_import:
+        builtins.__import__ = _original_import
+    tracemalloc.stop()
+
+    if not output_path:
+        output_path = _output
+    if not output_path:
+        from resources import resources
+        output_path = Path(resources()) / "resources" / "startup_profile.json"
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+    lines: List[str] = []
+    for child in _root.children:
+        _folded(child, "startup", lines)
+    with open(output_path.with_suffix(".folded"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    print(f"Startup profile written to {output_path} ({data['total_ms']:.0f} ms)")
+    return output_path
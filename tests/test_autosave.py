@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# Добавляем корень репозитория в путь для импорта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autosave import AutosaveJournal, apply_record
+
+
+def make_project():
+    return {
+        "Wave 1": {
+            "Name": "Wave 1",
+            "Settings": {"Description": ""},
+            "Squad": {"Squad 1": {"Name": "Squad 1", "Total Squad": 10, "InSquad": [{"Name": "Scout"}]}},
+            "GlobalSettings": {"money": 400, "restartTime": 0},
+        },
+    }
+
+
+class TestApplyRecord(unittest.TestCase):
+    def setUp(self):
+        project = make_project()
+        project["Wave 1"].pop("GlobalSettings")
+        self.state = {"waves": project, "settings": None, "project_file": None}
+
+    def squad(self, name="Squad 1"):
+        return self.state["waves"]["Wave 1"]["Squad"][name]
+
+    def test_membership_ops(self):
+        """Добавление и удаление отрядов и наемников по позиции"""
+        for record in (
+            {"op": "add_squad", "wave": "Wave 1", "squad": "Squad 2", "data": {"Name": "Squad 2"}},
+            {"op": "add_mercenary", "wave": "Wave 1", "squad": "Squad 2", "index": 0, "data": {"Name": "Heavy"}},
+            {"op": "add_mercenary", "wave": "Wave 1", "squad": "Squad 2", "index": 0, "data": {"Name": "Medic"}},
+            {"op": "remove_mercenary", "wave": "Wave 1", "squad": "Squad 2", "index": 1},
+            {"op": "mercenary", "wave": "Wave 1", "squad": "Squad 1", "index": 0, "data": {"Name": "Pyro"}},
+            {"op": "squad", "wave": "Wave 1", "squad": "Squad 1", "data": {"Total Squad": 3}},
+        ):
+            apply_record(self.state, record)
+        self.assertEqual(self.squad("Squad 2"), {"Name": "Squad 2", "InSquad": [{"Name": "Medic"}]})
+        self.assertEqual(self.squad(), {"Name": "Squad 1", "Total Squad": 3, "InSquad": [{"Name": "Pyro"}]})
+
+        apply_record(self.state, {"op": "remove_squad", "wave": "Wave 1", "squad": "Squad 2"})
+        self.assertNotIn("Squad 2", self.state["waves"]["Wave 1"]["Squad"])
+
+    def test_stale_records_are_skipped(self):
+        """Записи о несуществующих волнах, отрядах и позициях ничего не меняют"""
+        before = json.loads(json.dumps(self.state))
+        for record in (
+            {"op": "mercenary", "wave": "Wave 9", "squad": "Squad 1", "index": 0, "data": {}},
+            {"op": "mercenary", "wave": "Wave 1", "squad": "Squad 1", "index": 5, "data": {}},
+            {"op": "remove_mercenary", "wave": "Wave 1", "squad": "Squad 9", "index": 0},
+            {"op": "add_squad", "wave": "Wave 9", "squad": "Squad 2", "data": {}},
+            {"op": "wave_settings", "wave": "Wave 9", "data": {}},
+        ):
+            apply_record(self.state, record)
+        self.assertEqual(self.state, before)
+
+
+class TestAutosaveJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.live = make_project()
+        self.journal = AutosaveJournal(self.directory, snapshot_provider=lambda: json.loads(json.dumps(self.live)),
+                                       compact_records=1000)
+        self.journal.start(json.loads(json.dumps(self.live)), "mission.json")
+        self.journal._saver.wait()
+
+    def tearDown(self):
+        self.journal.close(discard=False)
+        shutil.rmtree(self.directory)
+
+    def add_mercenary(self, name):
+        members = self.live["Wave 1"]["Squad"]["Squad 1"]["InSquad"]
+        members.append({"Name": name})
+        self.journal.record("add_mercenary", wave="Wave 1", squad="Squad 1", index=len(members) - 1,
+                            data={"Name": name})
+
+    def recover(self):
+        # Новый объект, как при следующем запуске после аварии
+        return AutosaveJournal(self.directory).recover()
+
+    def test_recover_after_crash(self):
+        self.add_mercenary("Soldier")
+        self.live["Wave 1"]["GlobalSettings"] = {"money": 900, "restartTime": 0}
+        self.journal.record("settings", data={"money": 900, "restartTime": 0})
+        project, project_file = self.recover()
+        self.assertEqual(project, self.live)
+        self.assertEqual(project_file, "mission.json")
+
+    def test_truncated_last_line(self):
+        self.add_mercenary("Soldier")
+        with open(self.journal._journal_path(self.journal.generation), "a", encoding="utf-8") as f:
+            f.write('{"op": "add_mercenary", "wave": "Wa')
+        project, _ = self.recover()
+        self.assertEqual(project, self.live)
+
+    def test_crash_before_compacted_snapshot_is_written(self):
+        """Снимок новой генерации не успел записаться: старый снимок и оба журнала"""
+        self.add_mercenary("Soldier")
+        self.journal._saver.save = lambda *args, **kwargs: None
+        self.journal.compact()
+        self.add_mercenary("Demoman")
+        self.assertEqual(len(self.journal._journals()), 2)
+        project, _ = self.recover()
+        self.assertEqual(project, self.live)
+
+    def test_crash_before_old_journals_are_removed(self):
+        """Снимок записан, но старый журнал не удален: его записи уже в снимке и не применяются повторно"""
+        self.add_mercenary("Soldier")
+        self.journal._remove_journals_before = lambda generation: None
+        self.journal.compact()
+        self.journal._saver.wait()
+        self.add_mercenary("Demoman")
+        self.assertEqual(len(self.journal._journals()), 2)
+        project, _ = self.recover()
+        self.assertEqual(project, self.live)
+
+    def test_compaction_removes_covered_journals(self):
+        self.add_mercenary("Soldier")
+        self.journal.compact()
+        self.journal._saver.wait()
+        self.assertEqual([generation for generation, _ in self.journal._journals()], [self.journal.generation])
+        self.assertEqual(self.recover()[0], self.live)
+
+    def test_clean_close_discards_session(self):
+        self.add_mercenary("Soldier")
+        self.journal.close()
+        self.assertFalse(self.journal.has_session())
+        self.assertIsNone(self.recover())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import contextlib
+
+# Добавляем корень репозитория в путь для импорта
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from pop_writer import PopEmitter, export_mission, render_mission
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+WEAPON_SLOTS = ("Primary Weapon", "Secondary Weapons", "Melee")
+
+
+class Weapon:
+    def __init__(self, stat):
+        self.stat = stat
+
+    def get(self):
+        return self.stat
+
+
+class Bot:
+    def __init__(self, stat):
+        self.stat = dict(stat)
+        for slot in WEAPON_SLOTS:
+            if self.stat.get(slot) is not None:
+                self.stat[slot] = Weapon(self.stat[slot])
+
+
+def load_mission():
+    """
+    Waves of the fixture in the form WaveManager keeps them: mercenaries with weapon objects
+    """
+    with open(os.path.join(FIXTURES, "pop_writer_mission.json"), "r", encoding="utf-8") as f:
+        waves = json.load(f)
+    for wave in waves.values():
+        for squad in wave["Squad"].values():
+            squad["InSquad"] = [Bot(stat) for stat in squad["InSquad"]]
+    return list(waves.values())
+
+
+class TestPopWriter(unittest.TestCase):
+    """
+    pop_writer_mission.pop was written by the exporter that pop_writer replaced
+    (General.createMission / createWaveSettings / createMercenary); the output must stay byte-identical
+    """
+
+    def setUp(self):
+        with open(os.path.join(FIXTURES, "pop_writer_mission.pop"), "r", encoding="utf-8", newline="") as f:
+            self.expected = f.read()
+        self.emitter = PopEmitter(lambda key: f"Cosmetic #{key}")
+
+    def test_render_matches_fixture(self):
+        # Сообщения о неожиданной структуре атрибутов в выводе теста не нужны
+        with contextlib.redirect_stdout(io.StringIO()):
+            text = render_mission(self.emitter, 800, 6, load_mission())
+        self.assertEqual(text, self.expected)
+
+    def test_export_matches_fixture(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "mission.pop")
+            with contextlib.redirect_stdout(io.StringIO()):
+                written = export_mission(path, self.emitter, 800, 6, load_mission())
+            # export_mission пишет в текстовом режиме, переводы строк зависят от платформы
+            with open(path, "r") as f:
+                text = f.read()
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(text, self.expected)
+        self.assertEqual(written, len(self.expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
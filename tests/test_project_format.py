@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# Добавляем корень репозитория в путь для импорта
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from project_format import (EncodedWave, LazyProject, convert_project, encode_project, is_binary_project,
+                            project_bytes, read_project)
+
+SAMPLE_PROJECT = os.path.join(ROOT, "scot_test.json")
+
+
+def load_sample():
+    with open(SAMPLE_PROJECT, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def with_second_wave(project):
+    second = json.loads(json.dumps(project[next(iter(project))]))
+    second.pop("GlobalSettings")
+    second["Name"] = "Wave 2"
+    second["Money"] = 777
+    return dict(project, **{"Wave 2": second})
+
+
+class TestProjectFormat(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_json_gfp_json_round_trip(self):
+        convert_project(SAMPLE_PROJECT, self.path("mission.gfp"))
+        convert_project(self.path("mission.gfp"), self.path("mission.json"))
+        self.assertTrue(is_binary_project(self.path("mission.gfp")))
+        self.assertFalse(is_binary_project(self.path("mission.json")))
+        with open(self.path("mission.json"), "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), load_sample())
+
+    def test_waves_are_decoded_on_access(self):
+        project = with_second_wave(load_sample())
+        lazy = LazyProject(encode_project(project))
+        self.assertEqual(list(lazy), list(project))
+        self.assertFalse(any(lazy.is_loaded(name) for name in lazy))
+
+        self.assertEqual(lazy["Wave 1"], project["Wave 1"])
+        self.assertTrue(lazy.is_loaded("Wave 1"))
+        self.assertFalse(lazy.is_loaded("Wave 2"))
+        self.assertEqual(dict(lazy), project)
+
+    def test_encoded_wave_is_written_without_decoding(self):
+        project = with_second_wave(load_sample())
+        lazy = LazyProject(encode_project(project))
+        encoded = lazy.encoded("Wave 2")
+        self.assertIsInstance(encoded, EncodedWave)
+        self.assertEqual(encoded.money, 777)
+
+        snapshot = {"Wave 1": lazy["Wave 1"], "Wave 2": encoded}
+        self.assertEqual(dict(LazyProject(project_bytes("mission.gfp", snapshot))), project)
+        self.assertEqual(json.loads(project_bytes("mission.json", snapshot)), project)
+        self.assertFalse(lazy.is_loaded("Wave 2"))
+
+    def test_read_project_formats(self):
+        self.assertIsInstance(read_project(SAMPLE_PROJECT), dict)
+        convert_project(SAMPLE_PROJECT, self.path("mission.gfp"))
+        self.assertIsInstance(read_project(self.path("mission.gfp")), LazyProject)
+
+    def test_unsupported_version(self):
+        data = bytearray(encode_project(load_sample()))
+        data[4] = 99
+        with self.assertRaises(ValueError):
+            LazyProject(bytes(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+import tracemalloc
+
+# Добавляем корень репозитория в путь для импорта
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import startup_profiler
+
+SIZE = 5_000_000
+
+
+class TestPhasePeaks(unittest.TestCase):
+    def setUp(self):
+        self.enabled = startup_profiler.ENABLED
+        startup_profiler.ENABLED = True
+        startup_profiler._root.children.clear()
+        tracemalloc.start()
+
+    def tearDown(self):
+        tracemalloc.stop()
+        startup_profiler._root.children.clear()
+        startup_profiler.ENABLED = self.enabled
+
+    def phases(self):
+        return {phase["name"]: phase for phase in self.walk(startup_profiler.report()["phases"])}
+
+    def walk(self, phases):
+        for phase in phases:
+            yield phase
+            yield from self.walk(phase["children"])
+
+    def test_child_peak_reaches_parent(self):
+        with startup_profiler.phase("outer"):
+            with startup_profiler.phase("child"):
+                data = bytearray(SIZE)
+                del data
+            with startup_profiler.phase("second"):
+                pass
+        phases = self.phases()
+        self.assertGreaterEqual(phases["child"]["peak_bytes"], SIZE)
+        self.assertGreaterEqual(phases["outer"]["peak_bytes"], SIZE)
+        self.assertLess(phases["second"]["peak_bytes"], SIZE)
+
+    def test_child_peak_is_relative_to_parent(self):
+        """Память, занятая родителем до вложенного участка, входит в пик родителя"""
+        with startup_profiler.phase("outer"):
+            kept = bytearray(SIZE)
+            with startup_profiler.phase("child"):
+                data = bytearray(SIZE)
+                del data
+            del kept
+        phases = self.phases()
+        self.assertLess(phases["child"]["peak_bytes"], 2 * SIZE)
+        self.assertGreaterEqual(phases["outer"]["peak_bytes"], 2 * SIZE)
+
+    @unittest.skipUnless(startup_profiler._HAS_RESET_PEAK, "tracemalloc.reset_peak() requires Python 3.9")
+    def test_parent_peak_before_child_survives_reset(self):
+        with startup_profiler.phase("outer"):
+            data = bytearray(SIZE)
+            del data
+            with startup_profiler.phase("child"):
+                pass
+        phases = self.phases()
+        self.assertGreaterEqual(phases["outer"]["peak_bytes"], SIZE)
+        self.assertLess(phases["child"]["peak_bytes"], SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
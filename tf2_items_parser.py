@@ -6,13 +6,47 @@ It allows loading items data, converting it to JSON format and filtering items b
 """
 import os
 import json
+import gc
+import marshal
+import struct
+import hashlib
 from pathlib import Path
 import re
-from typing import Dict, List, Optional, Any, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Iterator, TextIO
 
 class VDFParser:
-    """Parser for Valve Data Format (VDF) files"""
-    
+    """
+    Single-pass parser for Valve Data Format (VDF) files
+
+    The input is scanned once by a compiled tokenizer regex (the scanning loop
+    runs inside the C regex engine), tokens are consumed by an explicit stack
+    instead of recursion, so deeply nested sections and multi-megabyte files
+    such as items_game.txt are parsed without building a list of lines.
+    Handles several tokens per line, braces and `//` inside quoted strings,
+    escaped quotes, unquoted tokens and `[$PLATFORM]` conditionals.
+    """
+
+    # Размер блока при потоковом чтении файла
+    CHUNK_SIZE = 1 << 20
+
+    _TOKEN_RE = re.compile(r"""
+        \s+                              # пробелы и переводы строк
+      | //[^\n]*                         # комментарий до конца строки
+      | "(?P<quoted>[^"\\]*(?:\\.[^"\\]*)*)(?:"|\Z)  # строка в кавычках
+      | (?P<open>\{)
+      | (?P<close>\})
+      | (?P<cond>\[[^\]\n]*\])           # условие вида [$WIN32]
+      | (?P<bare>[^\s"{}\[\]]+)          # строка без кавычек
+      | (?P<bad>["\[\]])                 # незавершенная строка или условие
+    """, re.VERBOSE | re.DOTALL)
+
+    _ESCAPES = {'n': '\n', 't': '\t', '\\': '\\', '"': '"'}
+    _ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+
+    # Типы токенов
+    STRING, OPEN, CLOSE = 0, 1, 2
+
     @staticmethod
     def parse(content: str) -> dict:
         """
@@ -24,123 +58,517 @@ class VDFParser:
         Returns:
             Dict containing parsed data structure
         """
-        lines = content.strip().split('\n')
-        return VDFParser._parse_section(lines, 0)[0]
-    
+        return VDFParser._build(VDFParser.tokenize(content, final=True)[0])
+
     @staticmethod
-    def _parse_section(lines: List[str], start_idx: int) -> tuple:
+    def parse_stream(stream: TextIO, chunk_size: Optional[int] = None) -> dict:
         """
-        Recursively parse a VDF section
+        Parse VDF data from a text stream, reading it in fixed-size chunks
         
         Args:
-            lines: List of file lines
-            start_idx: Starting line index
+            stream: Text file object opened for reading
+            chunk_size: Number of characters read per chunk
             
         Returns:
-            Tuple of (parsed_dict, ending_index)
+            Dict containing parsed data structure
         """
-        result = {}
-        i = start_idx
-        current_key = None
+        return VDFParser._build(VDFParser.iter_tokens(stream, chunk_size or VDFParser.CHUNK_SIZE))
+
+    @staticmethod
+    def parse_file(file_path: str, encoding: str = 'utf-8') -> dict:
+        """
+        Parse a VDF file without loading it into memory as a whole
         
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            if not line or line.startswith('//'):
-                i += 1
-                continue
-                
-            if '}' in line:
-                return result, i
-                
-            if '{' in line:
-                if current_key:
-                    subsection, new_idx = VDFParser._parse_section(lines, i + 1)
-                    result[current_key] = subsection
-                    i = new_idx + 1
-                    current_key = None
-                continue
-                
-            parts = re.findall(r'"([^"]*)"', line)
-            if len(parts) >= 2:
-                current_key = parts[0]
-                value = parts[1]
-                result[current_key] = value
-            elif len(parts) == 1:
-                current_key = parts[0]
-            
-            i += 1
+        Args:
+            file_path: Path to the VDF file
+            encoding: File encoding
             
-        return result, i
+        Returns:
+            Dict containing parsed data structure
+        """
+        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+            return VDFParser.parse_stream(f)
 
-class ItemFilter:
-    """Helper class for filtering TF2 items"""
-    
     @staticmethod
-    def _get_prefab_data(prefabs: Dict, prefab_name: str, field: str) -> Optional[str]:
+    def tokenize(text: str, final: bool = True) -> Tuple[List[Tuple[int, Optional[str]]], int]:
         """
-        Recursively get data from prefab
+        Split VDF text into tokens
         
         Args:
-            prefabs: Dictionary of all prefabs
-            prefab_name: Name of the prefab to check
-            field: Field to look for
+            text: VDF text (whole document or a chunk of it)
+            final: False if more text follows; an incomplete token at the end
+                   of the chunk is then left unconsumed
             
         Returns:
-            Value if found, None otherwise
+            Tuple of (tokens, consumed_length), tokens are (type, value) pairs
+        """
+        STRING, OPEN, CLOSE = VDFParser.STRING, VDFParser.OPEN, VDFParser.CLOSE
+        unescape = VDFParser._unescape
+        tokens = []
+        append = tokens.append
+        length = len(text)
+        consumed = 0
+
+        for match in VDFParser._TOKEN_RE.finditer(text):
+            group = match.lastgroup
+            if not final and match.end() == length and group != 'open' and group != 'close':
+                # Токен может продолжаться в следующем блоке
+                break
+            if group is None or group == 'cond':
+                pass
+            elif group == 'quoted':
+                value = match.group('quoted')
+                if '\\' in value:
+                    value = unescape(value)
+                append((STRING, value))
+            elif group == 'open':
+                append((OPEN, None))
+            elif group == 'close':
+                append((CLOSE, None))
+            elif group == 'bare':
+                append((STRING, match.group('bare')))
+            elif not final and '\n' not in text[match.end():]:
+                # Токен может обрываться на границе блока
+                break
+            consumed = match.end()
+
+        return tokens, consumed
+
+    @staticmethod
+    def iter_tokens(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[int, Optional[str]]]:
         """
-        if prefab_name not in prefabs:
-            return None
-            
-        prefab = prefabs[prefab_name]
+        Lazily tokenize a text stream chunk by chunk
         
-        # Проверяем текущий префаб
-        if field in prefab:
-            return prefab[field]
+        Args:
+            stream: Text file object opened for reading
+            chunk_size: Number of characters read per chunk
             
-        # Проверяем базовый префаб, если есть
-        if 'prefab' in prefab:
-            return ItemFilter._get_prefab_data(prefabs, prefab['prefab'], field)
+        Yields:
+            (type, value) token pairs
+        """
+        pending = ''
+        while True:
+            chunk = stream.read(chunk_size)
+            final = not chunk
+            text = pending + chunk
+            tokens, consumed = VDFParser.tokenize(text, final=final)
+            yield from tokens
+            pending = text[consumed:]
+            if final:
+                return
+
+    @staticmethod
+    def _unescape(value: str) -> str:
+        escapes = VDFParser._ESCAPES
+        return VDFParser._ESCAPE_RE.sub(lambda m: escapes.get(m.group(1), m.group(0)), value)
+
+    @staticmethod
+    def _build(tokens: Iterable[Tuple[int, Optional[str]]]) -> dict:
+        """
+        Build nested dictionaries from a token stream
+        
+        Args:
+            tokens: Iterable of (type, value) pairs
             
-        return None
+        Returns:
+            Dict containing parsed data structure
+        """
+        STRING, OPEN = VDFParser.STRING, VDFParser.OPEN
+        root = {}
+        current = root
+        stack = []
+        key = None
+
+        for kind, value in tokens:
+            if kind == STRING:
+                if key is None:
+                    key = value
+                else:
+                    current[key] = value
+                    key = None
+            elif kind == OPEN:
+                if key is None:
+                    raise ValueError("Section without a key")
+                section = {}
+                current[key] = section
+                stack.append(current)
+                current = section
+                key = None
+            else:
+                if not stack:
+                    # Лишняя закрывающая скобка - игнорируем, как и раньше
+                    continue
+                current = stack.pop()
+                key = None
+
+        return root
+
+class ItemIndex:
+    """
+    Precomputed index over TF2 items with prefab chains already resolved
+
+    Every item is flattened once with the fields inherited from its prefabs
+    (an item may list several space-separated prefabs, later ones and the item
+    itself take priority; nested blocks such as used_by_classes are merged).
+    Inverted maps class -> items, item_slot -> items and equip_region -> items
+    turn the usual UI queries into set intersections instead of full scans.
+    """
+
+    # Сколько последних результатов query() хранится
+    MAX_CACHED_RESULTS = 256
+
+    def __init__(self, items: Dict, prefabs: Dict):
+        """
+        Build the index
+        
+        Args:
+            items: Dictionary of all items (items_game.items)
+            prefabs: Dictionary of all prefabs (items_game.prefabs)
+        """
+        self.items = items
+        self.prefabs = prefabs
+        self.flat: Dict[str, Dict] = {}
+        self.by_class: Dict[str, List[str]] = {}
+        self.by_slot: Dict[str, List[str]] = {}
+        self.by_region: Dict[str, List[str]] = {}
+        self._order: Dict[str, int] = {}
+        self._sets: Dict[Tuple[str, str], frozenset] = {}
+        self._results: "OrderedDict[Tuple, Tuple[str, ...]]" = OrderedDict()
+        self._resolved_prefabs: Dict[str, Dict] = {}
+        self._build()
 
     @staticmethod
-    def filter_by_criteria(items: Dict, criteria: Dict, prefabs: Dict) -> Dict:
+    def _merge(base: Dict, override: Dict) -> Dict:
+        """Merge two VDF blocks, values from `override` take priority"""
+        result = dict(base)
+        for key, value in override.items():
+            current = result.get(key)
+            if isinstance(value, dict) and isinstance(current, dict):
+                result[key] = ItemIndex._merge(current, value)
+            else:
+                result[key] = value
+        return result
+
+    def _resolve(self, block: Dict, chain: Tuple[str, ...] = ()) -> Dict:
         """
-        Filter items by multiple criteria
+        Merge a block with all of its prefabs
         
         Args:
-            items: Dictionary of items to filter
-            criteria: Dictionary of criteria {field: value}
-            prefabs: Dictionary of prefabs
+            block: Item or prefab dictionary
+            chain: Prefabs already being resolved (protects against cycles)
             
         Returns:
-            Filtered items dictionary
+            Flattened dictionary without the 'prefab' key
         """
+        prefab_names = block.get('prefab')
+        if not isinstance(prefab_names, str) or not prefab_names.strip():
+            return {k: v for k, v in block.items() if k != 'prefab'}
+
         result = {}
+        for name in prefab_names.split():
+            if name in chain or name not in self.prefabs:
+                continue
+            if name not in self._resolved_prefabs:
+                self._resolved_prefabs[name] = self._resolve(self.prefabs[name], chain + (name,))
+            result = self._merge(result, self._resolved_prefabs[name])
+        own = {k: v for k, v in block.items() if k != 'prefab'}
+        return self._merge(result, own)
+
+    @staticmethod
+    def _add(mapping: Dict[str, List[str]], key: Any, item_id: str) -> None:
+        if isinstance(key, str) and key:
+            mapping.setdefault(key.lower(), []).append(item_id)
+
+    def _build(self) -> None:
+        for position, (item_id, item) in enumerate(self.items.items()):
+            if not isinstance(item, dict):
+                continue
+            flat = self._resolve(item)
+            self.flat[item_id] = flat
+            self._order[item_id] = position
+
+            classes = flat.get('used_by_classes')
+            if isinstance(classes, dict):
+                for class_name, value in classes.items():
+                    if value == '1':
+                        self._add(self.by_class, class_name, item_id)
+
+            self._add(self.by_slot, flat.get('item_slot'), item_id)
+
+            regions = set()
+            if isinstance(flat.get('equip_region'), str):
+                regions.add(flat['equip_region'].lower())
+            if isinstance(flat.get('equip_regions'), dict):
+                regions.update(region.lower() for region in flat['equip_regions'])
+            for region in regions:
+                self._add(self.by_region, region, item_id)
+
+    def _candidates(self, field: str, value: Any) -> Optional[frozenset]:
+        """
+        Get the set of item ids matching one indexed criterion
         
-        for item_id, item in items.items():
-            matches = True
-            
-            for field, required_value in criteria.items():
-                value = None
-                
-                # Сначала проверяем сам предмет
-                if field in item:
-                    value = item[field]
-                # Затем проверяем в префабе
-                elif 'prefab' in item:
-                    value = ItemFilter._get_prefab_data(prefabs, item['prefab'], field)
-                    
-                if not value or value != required_value:
-                    matches = False
-                    break
+        Returns:
+            Frozenset of item ids, or None if the field is not indexed
+        """
+        if field == 'used_by_classes':
+            if isinstance(value, dict):
+                names = [name for name, flag in value.items() if flag == '1']
+            else:
+                names = [value]
+            keys = [('class', str(name).lower()) for name in names]
+            mapping = self.by_class
+        elif field == 'item_slot':
+            keys, mapping = [('slot', str(value).lower())], self.by_slot
+        elif field in ('equip_region', 'equip_regions'):
+            keys, mapping = [('region', str(value).lower())], self.by_region
+        else:
+            return None
+
+        result = None
+        for key in keys:
+            ids = self._sets.get(key)
+            if ids is None:
+                ids = self._sets[key] = frozenset(mapping.get(key[1], ()))
+            result = ids if result is None else result & ids
+        return result if result is not None else frozenset()
+
+    def query(self, criteria: Dict) -> List[str]:
+        """
+        Find items matching all criteria
+        
+        Args:
+            criteria: Dictionary of criteria {field: value}; used_by_classes
+                      accepts a class name or a {class_name: '1'} block
             
-            if matches:
-                result[item_id] = item
-                
+        Returns:
+            List of matching item ids in items_game order
+        """
+        cache_key = tuple(sorted((field, repr(value)) for field, value in criteria.items()))
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            self._results.move_to_end(cache_key)
+            return list(cached)
+
+        sets = []
+        other = {}
+        for field, value in criteria.items():
+            ids = self._candidates(field, value)
+            if ids is None:
+                other[field] = value
+            else:
+                sets.append(ids)
+
+        if sets:
+            sets.sort(key=len)
+            matched = sets[0].intersection(*sets[1:])
+            ids = sorted(matched, key=self._order.__getitem__)
+        else:
+            ids = list(self.flat)
+
+        if other:
+            ids = [
+                item_id for item_id in ids
+                if all(self.flat[item_id].get(field) and self.flat[item_id].get(field) == value
+                       for field, value in other.items())
+            ]
+        self._results[cache_key] = tuple(ids)
+        if len(self._results) > self.MAX_CACHED_RESULTS:
+            self._results.popitem(last=False)
+        return ids
+
+    def get_items(self, criteria: Dict) -> Dict:
+        """
+        Same as query(), but returns {item_id: item} with the original item dictionaries
+        """
+        return {item_id: self.items[item_id] for item_id in self.query(criteria)}
+
+class ItemNameIndex:
+    """
+    Prebuilt search index over item names
+
+    Keeps lowercase names, an original-name -> item map (get_item_by_name),
+    a word -> items inverted index and a trigram -> items index. Results are
+    ranked as exact, prefix, substring, all-words and fuzzy (trigram
+    similarity) matches. When a query extends the previous one
+    (search-as-you-type), substring and all-words matches are narrowed from
+    the previous result instead of rescanning.
+    """
+
+    FUZZY_THRESHOLD = 0.45
+    FUZZY_LIMIT = 50
+
+    def __init__(self, items: Dict):
+        """
+        Build the index
+        
+        Args:
+            items: Dictionary of all items (items_game.items)
+        """
+        self.items = items
+        self.names: Dict[str, str] = {}
+        self.raw_exact: Dict[str, str] = {}
+        self.words: Dict[str, List[str]] = {}
+        self.trigrams: Dict[str, List[str]] = {}
+        self._order: Dict[str, int] = {}
+        self._trigram_count: Dict[str, int] = {}
+        self._short: List[str] = []
+        self._word_trigrams: Dict[str, List[str]] = {}
+        self._word_cache: Dict[str, frozenset] = {}
+        self._last_query = ''
+        self._last_matches: List[str] = []
+        self._build()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return text.lower().strip()
+
+    @staticmethod
+    def _trigrams_of(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _build(self) -> None:
+        for position, (item_id, item) in enumerate(self.items.items()):
+            raw_name = item.get('name') if isinstance(item, dict) else None
+            if not isinstance(raw_name, str):
+                continue
+            name = raw_name.lower()
+            self.names[item_id] = name
+            self._order[item_id] = position
+            self.raw_exact.setdefault(raw_name, item_id)
+
+            for word in set(name.split()):
+                self.words.setdefault(word, []).append(item_id)
+
+            grams = self._trigrams_of(name)
+            self._trigram_count[item_id] = len(grams)
+            if not grams:
+                self._short.append(item_id)
+            for gram in grams:
+                self.trigrams.setdefault(gram, []).append(item_id)
+
+        for word in self.words:
+            for gram in self._trigrams_of(word):
+                self._word_trigrams.setdefault(gram, []).append(word)
+
+    def _ids_with_substring(self, text: str) -> List[str]:
+        """Ids of items whose lowercase name contains `text`"""
+        grams = self._trigrams_of(text)
+        if not grams:
+            return [item_id for item_id, name in self.names.items() if text in name]
+        postings = sorted((self.trigrams.get(gram, ()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return [item_id for item_id in candidates if text in self.names[item_id]]
+
+    def _ids_with_word_part(self, part: str) -> frozenset:
+        """Ids of items having a word that contains `part`"""
+        cached = self._word_cache.get(part)
+        if cached is not None:
+            return cached
+        grams = self._trigrams_of(part)
+        if grams:
+            postings = sorted((self._word_trigrams.get(gram, ()) for gram in grams), key=len)
+            words = set(postings[0]).intersection(*postings[1:])
+        else:
+            words = self.words.keys()
+        ids = set()
+        for word in words:
+            if part in word:
+                ids.update(self.words[word])
+        result = self._word_cache[part] = frozenset(ids)
         return result
 
+    def _fuzzy(self, query: str, exclude: set) -> List[str]:
+        grams = self._trigrams_of(query)
+        if not grams:
+            return []
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for item_id in self.trigrams.get(gram, ()):
+                shared[item_id] = shared.get(item_id, 0) + 1
+        scored = []
+        for item_id, count in shared.items():
+            if item_id in exclude:
+                continue
+            score = 2 * count / (len(grams) + self._trigram_count[item_id])
+            if score >= self.FUZZY_THRESHOLD:
+                scored.append((-score, self._order[item_id], item_id))
+        scored.sort()
+        return [item_id for _, _, item_id in scored[:self.FUZZY_LIMIT]]
+
+    def search(self, query: str, fuzzy: bool = True) -> List[str]:
+        """
+        Find items by name
+        
+        Args:
+            query: Search text (case-insensitive)
+            fuzzy: Append trigram-similar names after the direct matches
+            
+        Returns:
+            List of item ids ranked as exact, prefix, substring, all-words, fuzzy
+        """
+        query = self.normalize(query)
+        if not query:
+            return []
+        words = query.split()
+
+        if self._last_query and query.startswith(self._last_query):
+            # Запрос дополняет предыдущий - совпадения могут только сузиться
+            pool = self._last_matches
+        else:
+            pool = set(self._ids_with_substring(query))
+            word_sets = sorted((self._ids_with_word_part(word) for word in words), key=len)
+            pool.update(word_sets[0].intersection(*word_sets[1:]))
+            pool = sorted(pool, key=self._order.__getitem__)
+
+        exact, prefix, substring, all_words = [], [], [], []
+        for item_id in pool:
+            name = self.names[item_id]
+            if name == query:
+                exact.append(item_id)
+            elif name.startswith(query):
+                prefix.append(item_id)
+            elif query in name:
+                substring.append(item_id)
+            else:
+                item_words = name.split()
+                if all(any(word in item_word for item_word in item_words) for word in words):
+                    all_words.append(item_id)
+
+        matches = exact + prefix + substring + all_words
+        self._last_query = query
+        self._last_matches = sorted(matches, key=self._order.__getitem__)
+
+        if fuzzy:
+            matches += self._fuzzy(query, set(matches))
+        return matches
+
+    def find_contained(self, text: str) -> Optional[str]:
+        """
+        Find the first item (in items_game order) whose name is contained in `text`
+        
+        Args:
+            text: Text that may contain an item name, case-sensitive
+            
+        Returns:
+            Item id or None
+        """
+        lowered = text.lower()
+        counts: Dict[str, int] = {}
+        for gram in self._trigrams_of(lowered):
+            for item_id in self.trigrams.get(gram, ()):
+                counts[item_id] = counts.get(item_id, 0) + 1
+        candidates = [item_id for item_id, count in counts.items() if count == self._trigram_count[item_id]]
+        candidates.extend(self._short)
+        candidates.sort(key=self._order.__getitem__)
+        for item_id in candidates:
+            if self.items[item_id]['name'] in text:
+                return item_id
+        return None
+
 class TF2ItemsParser:
     """Main class for working with TF2 items data"""
     
@@ -301,30 +729,152 @@ class TF2ItemsParser:
         # Удаляем None значения для чистоты
         return {k: v for k, v in result.items() if v is not None}
     
-    def __init__(self, file_path: str):
+    # Сигнатура и версия формата файла кэша; при изменении структуры данных версию нужно увеличить
+    CACHE_MAGIC = b"GFIC"
+    CACHE_VERSION = 1
+
+    def __init__(self, file_path: str, cache_path: Optional[str] = None):
         """
         Initialize parser with items_game.txt file path
         
         Args:
             file_path: Path to items_game.txt file
+            cache_path: Optional path to the binary cache of parsed data
         """
         self.file_path = file_path
+        self.cache_path = cache_path
         self.data = None
+        self.index: Optional[ItemIndex] = None
+        self.name_index: Optional[ItemNameIndex] = None
         
     def load(self) -> None:
-        """Load and parse the items file"""
+        """Load and parse the items file, using the binary cache when it is up to date"""
         print(f"Attempting to load file: {self.file_path}")
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                print(f"File loaded, content length: {len(content)} bytes")
-            parsed_data = VDFParser.parse(content)
+            fingerprint = None
+            if self.cache_path:
+                fingerprint = self._source_fingerprint()
+                cached = self._read_cache(fingerprint)
+                if cached is not None:
+                    print(f"Data loaded from cache: {self.cache_path}")
+                    self.data = cached
+                    self.build_index()
+                    return
+
+            print(f"File size: {os.path.getsize(self.file_path)} bytes")
+            parsed_data = VDFParser.parse_file(self.file_path)
             print(f"Data parsed, keys: {list(parsed_data.keys() if parsed_data else [])}")
             self.data = parsed_data
+
+            if self.cache_path:
+                self._write_cache(fingerprint, parsed_data)
+            self.build_index()
         
         except Exception as e:
             print(f"Error loading file: {e}")
             raise
+
+    def build_index(self) -> Optional[ItemIndex]:
+        """
+        Build the prefab-resolved item index and the name search index for the loaded data
+        
+        Returns:
+            ItemIndex instance or None if no items data is loaded
+        """
+        self.index = None
+        self.name_index = None
+        if self.data and isinstance(self.data.get('items_game'), dict):
+            items_game = self.data['items_game']
+            self.index = ItemIndex(items_game.get('items', {}), items_game.get('prefabs', {}))
+            self.name_index = ItemNameIndex(items_game.get('items', {}))
+        return self.index
+
+    def _get_index(self) -> Optional[ItemIndex]:
+        if self.index is None:
+            self.build_index()
+        return self.index
+
+    def _get_name_index(self) -> ItemNameIndex:
+        if self.name_index is None:
+            self.build_index()
+        if self.name_index is None:
+            raise ValueError("No items data loaded")
+        return self.name_index
+
+    def _source_fingerprint(self) -> Dict:
+        """
+        Describe the current state of items_game.txt
+        
+        Returns:
+            Dictionary with size, mtime and content hash of the source file
+        """
+        stat = os.stat(self.file_path)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return {
+            'version': self.CACHE_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': digest.hexdigest(),
+        }
+
+    def _read_cache(self, fingerprint: Dict) -> Optional[Dict]:
+        """
+        Read parsed data from the cache file if it matches the source file
+        
+        Args:
+            fingerprint: Current fingerprint of the source file
+            
+        Returns:
+            Parsed data or None if the cache is missing or outdated
+        """
+        try:
+            with open(self.cache_path, 'rb') as f:
+                if f.read(len(self.CACHE_MAGIC)) != self.CACHE_MAGIC:
+                    return None
+                meta_size = struct.unpack('<I', f.read(4))[0]
+                if marshal.loads(f.read(meta_size)) != fingerprint:
+                    return None
+                payload = f.read()
+            # Сборщик мусора не нужен при создании сотен тысяч словарей из кэша
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return marshal.loads(payload)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+        except FileNotFoundError:
+            return None
+        except (EOFError, ValueError, TypeError, OSError, struct.error) as e:
+            print(f"Cache is corrupted, ignoring it: {e}")
+            return None
+
+    def _write_cache(self, fingerprint: Dict, data: Dict) -> None:
+        """
+        Atomically write parsed data to the cache file
+        
+        Args:
+            fingerprint: Fingerprint of the source file the data was parsed from
+            data: Parsed data
+        """
+        temp_path = f"{self.cache_path}.tmp"
+        try:
+            Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                meta = marshal.dumps(fingerprint)
+                f.write(self.CACHE_MAGIC)
+                f.write(struct.pack('<I', len(meta)))
+                f.write(meta)
+                marshal.dump(data, f)
+            os.replace(temp_path, self.cache_path)
+        except (OSError, ValueError) as e:
+            # Кэш необязателен - при ошибке просто работаем без него
+            print(f"Error writing cache file: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
         
     def save_json(self, output_path: str) -> None:
         """
@@ -384,63 +934,38 @@ class TF2ItemsParser:
         Get item by its name
     
         Args:
-            name: Item name
+            name: Item name; an exact name is preferred, otherwise the first
+                  item whose name is contained in `name` is returned
         
         Returns:
             Tuple of (index, item) if found, None otherwise
         """
-        items = self.get_all_items()
-        for index, item in items.items():
-            if 'name' in item and item['name'] in name:
-                return (index, item)
-        return None
+        if not isinstance(name, str):
+            return None
+        name_index = self._get_name_index()
+        index = name_index.raw_exact.get(name)
+        if index is None:
+            index = name_index.find_contained(name)
+        if index is None:
+            return None
+        return (index, name_index.items[index])
     
-    def get_items_by_name(self, name: str) -> List[Tuple[int, Dict]]:
+    def get_items_by_name(self, name: str, fuzzy: bool = True) -> List[Tuple[str, Dict]]:
         """
         Get items by name with flexible search
     
         Args:
             name: Item name to search for (supports partial matches)
+            fuzzy: Also return names similar to the search text
         
         Returns:
             List of tuples containing (item_index, item_dictionary) for all matching items
-            Results are sorted by relevance (exact matches first, then partial matches)
+            Results are sorted by relevance: exact, prefix, partial, all words, similar names
         """
-        items = self.get_all_items()
-        found_items = []
-        search_term = name.lower().strip()
-        
-        if not search_term:
-            return found_items
-        
-        exact_matches = []
-        partial_matches = []
-        
-        for index, item in items.items():
-            item_name = item['name'].lower()
-            
-            # Точное совпадение (игнорируя регистр)
-            if item_name == search_term:
-                exact_matches.append((index, item))
-                continue
-                
-            # Поиск по частичному совпадению
-            if search_term in item_name:
-                partial_matches.append((index, item))
-                continue
-                
-            # Поиск по отдельным словам
-            search_words = search_term.split()
-            item_words = item_name.split()
-            
-            # Проверяем, содержит ли название предмета все слова из поискового запроса
-            if all(any(search_word in item_word for item_word in item_words) 
-                for search_word in search_words):
-                partial_matches.append((index, item))
+        name_index = self._get_name_index()
+        items = name_index.items
+        return [(index, items[index]) for index in name_index.search(name, fuzzy=fuzzy)]
         
-        # Возвращаем сначала точные совпадения, потом частичные
-        return exact_matches + partial_matches
-    
     def get_items_by_class(self, class_name: str, item_slot: Optional[str] = None) -> Dict:
         """
         Get items for specific class, optionally filtered by item slot
@@ -452,17 +977,15 @@ class TF2ItemsParser:
         Returns:
             Dictionary of matching items
         """
-        if not self.data or 'items_game' not in self.data:
+        index = self._get_index()
+        if index is None:
             return {}
-            
-        items = self.data['items_game'].get('items', {})
-        prefabs = self.data['items_game'].get('prefabs', {})
         
         criteria = {'used_by_classes': {class_name.lower(): '1'}}
         if item_slot:
             criteria['item_slot'] = item_slot
             
-        return ItemFilter.filter_by_criteria(items, criteria, prefabs)
+        return index.get_items(criteria)
         
     def get_items_by_slot(self, slot: str) -> Dict:
         """
@@ -474,13 +997,11 @@ class TF2ItemsParser:
         Returns:
             Dictionary of matching items
         """
-        if not self.data or 'items_game' not in self.data:
+        index = self._get_index()
+        if index is None:
             return {}
-            
-        items = self.data['items_game'].get('items', {})
-        prefabs = self.data['items_game'].get('prefabs', {})
         
-        return ItemFilter.filter_by_criteria(items, {'item_slot': slot}, prefabs)
+        return index.get_items({'item_slot': slot})
         
     def filter_items(self, criteria: Dict) -> Dict:
         """
@@ -492,14 +1013,8 @@ class TF2ItemsParser:
         Returns:
             Dictionary of matching items
         """
-        if not self.data or 'items_game' not in self.data:
+        index = self._get_index()
+        if index is None:
             return {}
             
-        items = self.data['items_game'].get('items', {})
-        prefabs = self.data['items_game'].get('prefabs', {})
-        
-        # Преобразуем критерий класса в правильный формат
-        if 'used_by_classes' in criteria:
-            criteria['used_by_classes'] = {criteria['used_by_classes']: '1'}
-            
-        return ItemFilter.filter_by_criteria(items, criteria, prefabs)
+        return index.get_items(criteria)
@@ -49,6 +49,29 @@ class TextureManager:
             print(f"Error converting texture {vtf_path}: {e}")
             return None
             
+    def convert_vtf_data(self, data: bytes, output_path: str) -> Optional[str]:
+        """
+        Конвертирует VTF данные из памяти в PNG
+        
+        Args:
+            data: Содержимое VTF файла
+            output_path: Путь для сохранения PNG
+            
+        Returns:
+            Optional[str]: Путь к сконвертированному файлу или None при ошибке
+        """
+        try:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            
+            image = VTFParser.from_bytes(data).get_image()
+            image.save(output_path, 'PNG')
+            
+            return output_path
+            
+        except Exception as e:
+            print(f"Error converting texture data to {output_path}: {e}")
+            return None
+            
     def find_model_textures(self, model_pattern: str) -> List[str]:
         """
         Ищет текстуры для заданного паттерна моделей
@@ -81,18 +104,12 @@ class TextureManager:
             return self.texture_cache[vtf_path]
             
         try:
-            # Создаем временный путь для VTF
-            temp_vtf = str(self.output_dir / 'temp' / vtf_path)
-            os.makedirs(os.path.dirname(temp_vtf), exist_ok=True)
-            
-            # Извлекаем VTF
-            self.vpk.extract_file(vtf_path, temp_vtf)
-            
             # Определяем путь для PNG
             png_path = str(self.output_dir / vtf_path).replace('.vtf', '.png')
             
-            # Конвертируем
-            if self.convert_vtf(temp_vtf, png_path):
+            # Читаем VTF из VPK и конвертируем в памяти, без временного файла
+            data = self.vpk.get_file_view(vtf_path)
+            if self.convert_vtf_data(data, png_path):
                 self.texture_cache[vtf_path] = png_path
                 return png_path
                 
@@ -12,15 +12,22 @@ class VPKEntry:
     preload_data: bytes     # Предзагруженные данные
     crc32: int              # CRC32 файла
     
+    @property
+    def preload_size(self) -> int:
+        """Размер предзагруженных данных (preload_bytes может хранить как число, так и сами байты)"""
+        if isinstance(self.preload_bytes, int):
+            return self.preload_bytes
+        return len(self.preload_data or b'')
+
     @property
     def is_preloaded(self) -> bool:
         """Проверка, находятся ли все данные в предзагруженной секции"""
-        return self.entry_length == 0 and self.preload_bytes > 0
+        return self.entry_length == 0 and self.preload_size > 0
         
     @property
     def total_size(self) -> int:
         """Общий размер файла"""
-        return self.preload_bytes + self.entry_length
+        return self.preload_size + self.entry_length
 
     def __repr__(self) -> str:
         status = "preloaded" if self.is_preloaded else f"in archive {self.archive_index}"
@@ -1,7 +1,12 @@
 import os
+import mmap
 import struct
+import bisect
+import threading
+import fnmatch
 import logging
-from typing import List, Dict, Optional, BinaryIO, Generator, Set
+from collections import OrderedDict
+from typing import List, Dict, Optional, BinaryIO, Generator, Set, Union
 from pathlib import Path
 from .exceptions import VPKError, VPKParseError, VPKFileNotFoundError
 from .vpk_entry import VPKEntry
@@ -12,23 +17,21 @@ class VPKReader:
     """Класс для чтения VPK архивов Source Engine"""
     
     SIGNATURE = 0x55AA1234
+    HEADER_V1 = struct.Struct('<III')       # signature, version, tree_size
+    HEADER_V2 = struct.Struct('<IIIIIII')   # + размеры секций данных, MD5 и подписи
+    ENTRY = struct.Struct('<IHHIIH')        # crc, preload, archive, offset, length, terminator
+    DIR_ARCHIVE_INDEX = 0x7fff              # данные хранятся в самом _dir.vpk после дерева
     
-    def __init__(self, dir_path: str, search_dirs: list = None):
+    def __init__(self, dir_path: str, search_dirs: list = None, use_mmap: bool = True, max_open_archives: int = 16):
         """
         Инициализирует чтение VPK архива и опционально директории для поиска
         
         Args:
             dir_path: Путь к dir VPK файлу (например, pak01_dir.vpk)
             search_dirs: Список дополнительных директорий для поиска файлов
+            use_mmap: Отображать архивы в память и читать данные без копирования
+            max_open_archives: Сколько архивов держать открытыми одновременно
         """
-        self.dir_path = dir_path
-        self.search_dirs = search_dirs or []
-        self.entries: Dict[str, VPKEntry] = {}
-        self.archives: Dict[int, str] = {}  # index -> path
-        self._initialized = False
-        
-        # Инициализация при создании
-        self._initialize()
         self.dir_path = Path(dir_path)
         if not self.dir_path.exists():
             raise FileNotFoundError(f"VPK file not found: {dir_path}")
@@ -37,19 +40,28 @@ class VPKReader:
             raise VPKError(f"Not a directory VPK file: {dir_path}")
             
         self.base_path = str(self.dir_path).replace('_dir.vpk', '')
-        self.entries: Dict[str, VPKEntry] = {}
-        self._normalized_paths: Dict[str, str] = {}  # Кэш нормализованных путей
+        self.entries: Dict[str, VPKEntry] = {}  # нормализованный путь -> запись
+        self.archives: Dict[int, str] = {}  # index -> path
+        self._directories: Dict[str, List[str]] = {}  # директория -> нормализованные пути файлов
+        self._sorted_directories: List[str] = []  # для поиска по префиксу директории
         self._file_handle: Optional[BinaryIO] = None
-        self._archive_handles: Dict[int, BinaryIO] = {}  # Кэш открытых архивов
+        self.use_mmap = use_mmap
+        self.max_open_archives = max(1, max_open_archives)
+        # Пул открытых архивов (LRU): индекс -> (файл, mmap или None)
+        self._archive_handles: "OrderedDict[int, tuple]" = OrderedDict()
+        # Реентерабельная: чтение держит блокировку и вызывает _get_archive
+        self._archive_lock = threading.RLock()
+        self._data_offset = 0  # начало данных в _dir.vpk для DIR_ARCHIVE_INDEX
         self.search_dirs = [Path(d) for d in (search_dirs or [])]
+        self._initialized = False
         
         # Проверяем наличие архивных файлов
         archive_path = f"{self.base_path}_000.vpk"
         if not Path(archive_path).exists():
             raise VPKError(f"Archive file not found: {archive_path}")
         
-        # Читаем структуру архива
-        self._read_directory()
+        # Читаем структуру архива (один проход по дереву)
+        self._initialize()
     
     def __enter__(self):
         return self
@@ -64,12 +76,25 @@ class VPKReader:
             self._file_handle = None
         
         # Закрываем все кэшированные архивы
-        for handle in self._archive_handles.values():
+        with self._archive_lock:
+            for handle in self._archive_handles.values():
+                self._close_archive(handle)
+            self._archive_handles.clear()
+
+    @staticmethod
+    def _close_archive(handle: tuple):
+        """Закрывает файл архива и его отображение"""
+        file, mapped = handle
+        if mapped is not None:
             try:
-                handle.close()
-            except:
+                mapped.close()
+            except BufferError:
+                # Остались memoryview на данные - mmap закроется, когда их освободят
                 pass
-        self._archive_handles.clear()
+        try:
+            file.close()
+        except OSError:
+            pass
 
     def normalize_path(self, path: str) -> str:
         """
@@ -96,10 +121,11 @@ class VPKReader:
             return
             
         try:
-            self._read_header()
-            self._read_directory_tree()
+            self._read_directory()
             self._find_archives()
             self._initialized = True
+        except VPKError:
+            raise
         except Exception as e:
             logger.error(f"Ошибка при инициализации VPK: {str(e)}")
             raise VPKError(f"Ошибка инициализации: {str(e)}")
@@ -129,85 +155,185 @@ class VPKReader:
             logger.error(f"Ошибка при поиске архивов: {str(e)}")
             raise VPKError(f"Ошибка поиска архивов: {str(e)}")
             
-    def _read_from_archive(self, archive_index: int, offset: int, size: int) -> bytes:
-        """Чтение данных из архива"""
-        if archive_index not in self.archives:
-            raise VPKError(f"Архив не найден: {archive_index}")
-            
-        archive_path = self.archives[archive_index]
+    def _archive_path(self, archive_index: int) -> str:
+        """Путь к файлу архива по индексу"""
+        if archive_index == self.DIR_ARCHIVE_INDEX:
+            return str(self.dir_path)
+        return self.archives.get(archive_index) or f"{self.base_path}_{archive_index:03d}.vpk"
+
+    def _get_archive(self, archive_index: int) -> tuple:
+        """
+        Возвращает (файл, mmap) архива из пула, открывая его при необходимости
+        
+        Пул ограничен max_open_archives, дольше всех не использованный архив закрывается.
+        mmap равен None, если отображение выключено или невозможно (пустой файл).
+        """
+        with self._archive_lock:
+            handle = self._archive_handles.get(archive_index)
+            if handle is not None:
+                self._archive_handles.move_to_end(archive_index)
+                return handle
+
+            archive_path = self._archive_path(archive_index)
+            if not os.path.exists(archive_path):
+                raise VPKError(f"Архив не найден: {archive_path}")
+            file = open(archive_path, 'rb')
+            mapped = None
+            if self.use_mmap:
+                try:
+                    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    mapped = None
+            handle = (file, mapped)
+            self._archive_handles[archive_index] = handle
+
+            while len(self._archive_handles) > self.max_open_archives:
+                _, evicted = self._archive_handles.popitem(last=False)
+                self._close_archive(evicted)
+            return handle
+
+    def _read_from_archive(self, archive_index: int, offset: int, size: int) -> Union[bytes, memoryview]:
+        """
+        Чтение данных из архива
+        
+        В режиме mmap возвращает memoryview на отображение архива без копирования,
+        иначе - bytes, прочитанные через общий дескриптор из пула.
+        """
+        if archive_index == self.DIR_ARCHIVE_INDEX:
+            offset += self._data_offset
+        archive_path = self._archive_path(archive_index)
         try:
-            with open(archive_path, 'rb') as f:
-                f.seek(offset)
-                data = f.read(size)
-                if len(data) != size:
-                    raise VPKError(f"Неверный размер прочитанных данных: {len(data)} != {size}")
-                return data
+            # Архив берется из пула и читается под одной блокировкой: иначе другой поток
+            # может вытеснить и закрыть его в промежутке. Созданный memoryview не дает
+            # закрыть mmap и после выхода из блокировки
+            with self._archive_lock:
+                file, mapped = self._get_archive(archive_index)
+                if mapped is not None:
+                    if offset + size > len(mapped):
+                        raise VPKError(f"Неверный размер прочитанных данных: {max(0, len(mapped) - offset)} != {size}")
+                    return memoryview(mapped)[offset:offset + size]
+                file.seek(offset)
+                data = file.read(size)
+            if len(data) != size:
+                raise VPKError(f"Неверный размер прочитанных данных: {len(data)} != {size}")
+            return data
+        except VPKError:
+            raise
         except Exception as e:
             logger.error(f"Ошибка при чтении из архива {archive_path}: {str(e)}")
             raise VPKError(f"Ошибка чтения из архива: {str(e)}")
             
     def _read_directory(self):
-        """Читает структуру VPK архива"""
+        """Читает заголовок и дерево VPK архива за один проход"""
         print(f"\nЧтение VPK архива: {self.dir_path}")
         print("--------------------------------")
         with open(self.dir_path, 'rb') as f:
             # Читаем заголовок
-            signature = struct.unpack('<I', f.read(4))[0]
+            header = f.read(self.HEADER_V2.size)
+            if len(header) < self.HEADER_V1.size:
+                raise VPKParseError("Файл слишком мал для VPK")
+            signature, version, tree_size = self.HEADER_V1.unpack_from(header)
             print(f"Сигнатура: {hex(signature)}")
             if signature != self.SIGNATURE:
                 raise VPKParseError(f"Неверная сигнатура VPK: {hex(signature)}, ожидалась: {hex(self.SIGNATURE)}")
-            version = struct.unpack('<I', f.read(4))[0]
-            tree_size = struct.unpack('<I', f.read(4))[0]
             print(f"Версия VPK: {version}")
             print(f"Размер дерева: {tree_size:,} bytes")
             if version == 1:
-                pass
+                header_size = self.HEADER_V1.size
+                sections = (0, 0, 0, 0)
             elif version == 2:
-                file_data_section_size = struct.unpack('<I', f.read(4))[0]
-                archive_md5_section_size = struct.unpack('<I', f.read(4))[0]
-                other_md5_section_size = struct.unpack('<I', f.read(4))[0]
-                signature_section_size = struct.unpack('<I', f.read(4))[0]
+                header_size = self.HEADER_V2.size
+                sections = self.HEADER_V2.unpack_from(header)[3:]
             else:
                 raise VPKParseError(f"Unsupported VPK version: {version}")
-            print("\nЧтение структуры файлов:")
-            print("--------------------------------")
-            extension_count = 0
-            dir_count = 0
-            file_count = 0
+            self._header = (signature, version, tree_size)
+            (self._file_data_section_size, self._archive_md5_section_size,
+             self._other_md5_section_size, self._signature_section_size) = sections
+
+            self._data_offset = header_size + tree_size
+
+            # Все дерево читается одним вызовом
+            f.seek(header_size)
+            tree = f.read(tree_size)
+            if len(tree) != tree_size:
+                raise VPKParseError(f"Дерево обрезано: {len(tree)} из {tree_size} байт")
+
+        print("\nЧтение структуры файлов:")
+        print("--------------------------------")
+        extension_count, dir_count, file_count = self._parse_tree(tree)
+        print("\nСтатистика VPK архива:")
+        print(f"- Найдено расширений: {extension_count}")
+        print(f"- Найдено директорий: {dir_count}")
+        print(f"- Найдено файлов: {file_count}")
+        relevant = sum(len(paths) for name, paths in self._directories.items() if "models/bots" in name)
+        print(f"- Файлов моделей ботов: {relevant}")
+        self._sorted_directories = sorted(self._directories)
+
+    def _parse_tree(self, tree: bytes) -> tuple:
+        """
+        Разбирает дерево файлов VPK из памяти
+        
+        Строки ищутся через bytes.index, записи распаковываются
+        заранее скомпилированной структурой ENTRY.
+        
+        Args:
+            tree: Байты дерева (без заголовка)
+        Returns:
+            tuple: (количество расширений, директорий, файлов)
+        """
+        find = tree.index
+        unpack_entry = self.ENTRY.unpack_from
+        entry_size = self.ENTRY.size
+        normalize = self.normalize_path
+        entries = self.entries
+        directories = self._directories
+        extension_count = dir_count = file_count = 0
+        pos = 0
+
+        try:
             while True:
-                extension = self._read_string(f)
+                end = find(b'\0', pos)
+                extension = tree[pos:end].decode('utf-8', errors='replace')
+                pos = end + 1
                 if not extension:
                     break
                 extension_count += 1
+                suffix = f".{extension.lower()}" if extension != ' ' else ''
+
                 while True:
-                    directory = self._read_string(f)
+                    end = find(b'\0', pos)
+                    directory = tree[pos:end].decode('utf-8', errors='replace')
+                    pos = end + 1
                     if not directory:
                         break
                     dir_count += 1
-                    if directory.startswith("models/bots"):
+                    # Корректное формирование пути: ' ' означает корень архива
+                    dir_key = normalize(directory) if directory != ' ' else ''
+                    prefix = f"{dir_key}/" if dir_key else ''
+                    dir_files = directories.setdefault(dir_key, [])
+                    is_bots = dir_key.startswith("models/bots")
+                    if is_bots:
                         print(f"\nНайдена директория ботов: {directory}")
+
                     while True:
-                        filename = self._read_string(f)
-                        if not filename:
+                        end = find(b'\0', pos)
+                        if end == pos:
+                            pos += 1
                             break
-                        crc = struct.unpack('<I', f.read(4))[0]
-                        preload_bytes_size = struct.unpack('<H', f.read(2))[0]
-                        archive_index = struct.unpack('<H', f.read(2))[0]
-                        entry_offset = struct.unpack('<I', f.read(4))[0]
-                        entry_length = struct.unpack('<I', f.read(4))[0]
-                        terminator = struct.unpack('<H', f.read(2))[0]
+                        filename = tree[pos:end].decode('utf-8', errors='replace')
+                        pos = end + 1
+                        crc, preload_size, archive_index, entry_offset, entry_length, terminator = unpack_entry(tree, pos)
+                        pos += entry_size
                         if terminator != 0xFFFF:
                             raise VPKParseError(f"Invalid entry terminator: {hex(terminator)}")
-                        preload_bytes = f.read(preload_bytes_size) if preload_bytes_size > 0 else b''
-                        # Корректное формирование пути
-                        if directory != ' ':
-                            file_path = f"{directory}/{filename}"
+                        preload_bytes = tree[pos:pos + preload_size]
+                        pos += preload_size
+
+                        if '/' in filename or '\\' in filename:
+                            file_path = normalize(f"{prefix}{filename}{suffix}")
                         else:
-                            file_path = filename
-                        if extension != ' ':
-                            file_path = f"{file_path}.{extension}"
-                        file_path = self.normalize_path(file_path)
-                        entry = VPKEntry(
+                            file_path = f"{prefix}{filename.lower()}{suffix}"
+                        entries[file_path] = VPKEntry(
                             path=file_path,
                             archive_index=archive_index,
                             entry_offset=entry_offset,
@@ -216,26 +342,14 @@ class VPKReader:
                             preload_data=preload_bytes,
                             crc32=crc
                         )
-                        self.entries[file_path] = entry
+                        dir_files.append(file_path)
                         file_count += 1
-                        if "models/bots" in file_path:
+                        if is_bots:
                             print(f"  Файл: {file_path} (архив: {archive_index}, размер: {entry_length:,} bytes)")
-            print("\nСтатистика VPK архива:")
-            print(f"- Найдено расширений: {extension_count}")
-            print(f"- Найдено директорий: {dir_count}")
-            print(f"- Найдено файлов: {file_count}")
-            relevant = sum(1 for path in self.entries if "models/bots" in path)
-            print(f"- Файлов моделей ботов: {relevant}")
-    
-    def _read_string(self, f: BinaryIO) -> str:
-        """Читает null-terminated строку из файла"""
-        result = []
-        while True:
-            char = f.read(1)
-            if char == b'\0' or not char:
-                break
-            result.append(char.decode('utf-8'))
-        return ''.join(result)
+        except (ValueError, struct.error) as e:
+            raise VPKParseError(f"Дерево VPK повреждено на смещении {pos}: {e}")
+
+        return extension_count, dir_count, file_count
     
     def get_file_data(self, path: str) -> bytes:
         """
@@ -250,34 +364,101 @@ class VPKReader:
         Raises:
             VPKFileNotFoundError: Если файл не найден в архиве
         """
-        # Нормализуем путь
-        norm_path = self.normalize_path(path)
+        return bytes(self.get_file_view(path))
+
+    def get_file_view(self, path: str) -> Union[bytes, memoryview]:
+        """
+        Получает данные файла без лишнего копирования
         
-        # Ищем файл в entries
-        found_path = None
-        for entry_path in self.entries:
-            if self.normalize_path(entry_path) == norm_path:
-                found_path = entry_path
-                break
-                
-        if not found_path:
-            raise VPKFileNotFoundError(f"File not found in VPK: {path}")
-            
-        entry = self.entries[found_path]
+        Для файлов без предзагруженной части в режиме mmap возвращается memoryview
+        на отображение архива; он действителен, пока архив открыт в пуле.
         
-        # Если все данные предзагружены, возвращаем их
-        if entry.is_preloaded:
-            return entry.preload_bytes
+        Args:
+            path: Путь к файлу внутри архива
             
-        # Иначе читаем данные из архива
-        archive_path = f"{self.base_path}_{entry.archive_index:03d}.vpk"
+        Returns:
+            memoryview или bytes с данными файла
+            
+        Raises:
+            VPKFileNotFoundError: Если файл не найден в архиве
+        """
+        entry = self.get_entry(path)
+        if entry is None:
+            raise VPKFileNotFoundError(f"File not found in VPK: {path}")
+        return self.read_entry(entry)
+
+    def read_entry(self, entry: VPKEntry) -> Union[bytes, memoryview]:
+        """
+        Читает данные записи: предзагруженная часть + данные из архива
         
-        with open(archive_path, 'rb') as f:
-            f.seek(entry.entry_offset)
-            data = f.read(entry.entry_length)
+        Args:
+            entry: Запись файла
             
-        return entry.preload_bytes + data
+        Returns:
+            memoryview или bytes с данными файла
+        """
+        preload = entry.preload_data or b''
+        if entry.entry_length == 0:
+            return preload
+        data = self._read_from_archive(entry.archive_index, entry.entry_offset, entry.entry_length)
+        if preload:
+            return preload + bytes(data)
+        return data
     
+    def get_entry(self, path: str) -> Optional[VPKEntry]:
+        """
+        Возвращает запись файла по пути за O(1)
+        
+        Args:
+            path: Путь к файлу внутри архива (в любом регистре, с любыми слэшами)
+        Returns:
+            Optional[VPKEntry]: Запись файла или None, если файла нет
+        """
+        return self.entries.get(self.normalize_path(path))
+
+    def list_directory(self, directory: str, recursive: bool = False) -> List[str]:
+        """
+        Возвращает пути файлов в директории архива по индексу директорий
+        
+        Args:
+            directory: Путь к директории внутри архива
+            recursive: Включать ли файлы из поддиректорий
+        Returns:
+            List[str]: Нормализованные пути файлов
+        """
+        directory = self.normalize_path(directory)
+        if not recursive:
+            return list(self._directories.get(directory, ()))
+        return [path for name in self._iter_directories(directory) for path in self._directories[name]]
+
+    def _iter_directories(self, prefix: str) -> Generator[str, None, None]:
+        """Перебирает директории, равные prefix или вложенные в нее"""
+        if not prefix:
+            yield from self._sorted_directories
+            return
+        start = bisect.bisect_left(self._sorted_directories, prefix)
+        for name in self._sorted_directories[start:]:
+            if not name.startswith(prefix):
+                break
+            if len(name) == len(prefix) or name[len(prefix)] == '/':
+                yield name
+
+    def _match_candidates(self, pattern: str) -> List[str]:
+        """
+        Сужает набор путей-кандидатов для паттерна по литеральной части пути
+        
+        Args:
+            pattern: Нормализованный паттерн
+        Returns:
+            List[str]: Пути, среди которых нужно искать совпадения
+        """
+        wildcard = min((pattern.find(c) for c in '*?[' if c in pattern), default=-1)
+        if wildcard == -1:
+            return [pattern] if pattern in self.entries else []
+        # fnmatch-овская '*' совпадает и с '/', поэтому берем все вложенные директории
+        directory = pattern[:wildcard].rpartition('/')[0]
+        return [path for name in self._iter_directories(directory) for path in self._directories[name]]
+
     def find_files(self, pattern: str) -> Generator[str, None, None]:
         """
         Ищет файлы в архиве по паттерну и в search_dirs
@@ -285,10 +466,6 @@ class VPKReader:
         Args:
             pattern: Паттерн для поиска (например, "models/bots/*.mdl")
         """
-        import fnmatch
-        import logging
-        logger = logging.getLogger(__name__)
-        
         # Нормализуем паттерн
         pattern = self.normalize_path(pattern)
         logger.info(f"[VPKReader] Поиск файлов по паттерну: {pattern}")
@@ -296,10 +473,9 @@ class VPKReader:
         # Создаем множество для уникальных путей
         found_paths = set()
         
-        # Ищем в VPK
-        for path in self.entries.keys():
-            norm_path = self.normalize_path(path)
-            if fnmatch.fnmatch(norm_path, pattern):
+        # Ищем в VPK только среди путей из подходящих директорий
+        for path in self._match_candidates(pattern):
+            if fnmatch.fnmatchcase(path, pattern):
                 if path not in found_paths:  # Проверяем дубликаты
                     found_paths.add(path)
                     logger.info(f"[VPKReader] Найден файл: {path}")
@@ -330,9 +506,6 @@ class VPKReader:
         Raises:
             VPKError: Если файл не найден или возникла ошибка при извлечении
         """
-        import logging
-        logger = logging.getLogger(__name__)
-    
         logger.info(f"\n=== Начало извлечения файла {file_path} ===")
         try:
             # Нормализуем пути
@@ -342,24 +515,13 @@ class VPKReader:
             logger.info(f"Директория назначения: {abs_output_dir}")
             
             # Проверяем наличие файла в VPK
+            # Ключи entries уже нормализованы (нижний регистр, прямые слэши)
             if norm_file_path not in self.entries:
-                logger.info("Поиск файла в других регистрах...")
-                # Попробуем поискать файл без учета регистра
-                found = False
-                for entry_path in self.entries:
-                    if entry_path.lower() == norm_file_path.lower():
-                        file_path = entry_path
-                        found = True
-                        logger.info(f"Найден файл с другим регистром: {entry_path}")
-                        break
-                if not found:
-                    logger.error("Файл не найден в VPK")
-                    logger.info("Доступные файлы в этой директории:")
-                    dir_path = os.path.dirname(norm_file_path)
-                    for entry in self.entries:
-                        if entry.startswith(dir_path):
-                            logger.info(f"- {entry}")
-                    raise VPKFileNotFoundError(f"File not found in VPK: {file_path}")
+                logger.error("Файл не найден в VPK")
+                logger.info("Доступные файлы в этой директории:")
+                for entry in self.list_directory(os.path.dirname(norm_file_path), recursive=True):
+                    logger.info(f"- {entry}")
+                raise VPKFileNotFoundError(f"File not found in VPK: {file_path}")
             
             # Создаем директории для сохранения
             full_output_path = os.path.join(abs_output_dir, norm_file_path)
@@ -379,73 +541,33 @@ class VPKReader:
                 raise VPKError(f"Попытка path traversal: {file_path}")
             
             # Получаем метаданные файла
-            entry = self.entries[file_path]
+            entry = self.entries[norm_file_path]
             logger.info(f"Метаданные файла:")
             logger.info(f"- Индекс архива: {entry.archive_index}")
             logger.info(f"- Смещение: {entry.entry_offset}")
             logger.info(f"- Размер: {entry.entry_length}")
-            logger.info(f"- Размер предзагруженных данных: {len(entry.preload_bytes) if entry.preload_bytes else 0}")
+            logger.info(f"- Размер предзагруженных данных: {len(entry.preload_data or b'')}")
             
             try:
-                # Открываем архив с файлом
-                if entry.archive_index == 0x7fff:
-                    logger.info("Используем основной архив")
-                    archive = self._file_handle
-                else:
-                    archive_path = self.dir_path.parent / f"{self.dir_path.stem}_{entry.archive_index:03d}.vpk"
-                    logger.info(f"Открываем архив: {archive_path}")
-                    if not archive_path.exists():
-                        logger.error(f"Архив не найден: {archive_path}")
-                        raise VPKError(f"Архив не найден: {archive_path}")
-                    archive = open(archive_path, 'rb')
+                # Данные читаются через пул архивов, без повторного открытия файла
+                data = self.read_entry(entry)
+                with open(full_output_path, 'wb') as out_file:
+                    total_written = out_file.write(data)
+                logger.info(f"Всего записано: {total_written} байт")
+                del data
                 
-                try:
-                    # Извлекаем файл
-                    with open(full_output_path, 'wb') as out_file:
-                        total_written = 0
-                        
-                        # Записываем preload данные если есть
-                        if entry.preload_bytes:
-                            logger.info("Запись предзагруженных данных...")
-                            written = out_file.write(entry.preload_bytes)
-                            total_written += written
-                            logger.info(f"Записано предзагруженных данных: {written} байт")
-                        
-                        # Записываем основные данные
-                        if entry.entry_length > 0:
-                            logger.info("Запись основных данных...")
-                            archive.seek(entry.entry_offset)
-                            data = archive.read(entry.entry_length)
-                            if len(data) != entry.entry_length:
-                                logger.error(f"Прочитано {len(data)} байт, ожидалось {entry.entry_length}")
-                                raise VPKError(f"Неверный размер прочитанных данных")
-                                
-                            written = out_file.write(data)
-                            total_written += written
-                            logger.info(f"Записано основных данных: {written} байт")
-                    
-                    logger.info(f"Всего записано: {total_written} байт")
-                    
-                    # Проверяем результат
-                    if not os.path.exists(full_output_path):
-                        logger.error(f"Файл не был создан: {full_output_path}")
-                        raise VPKError(f"Файл не был создан: {full_output_path}")
-                        
-                    actual_size = os.path.getsize(full_output_path)
-                    expected_size = len(entry.preload_bytes or b'') + entry.entry_length
-                    if actual_size != expected_size:
-                        logger.error(f"Неверный размер файла: {actual_size} байт (ожидалось {expected_size})")
-                        raise VPKError(
-                            f"Неверный размер извлеченного файла: {actual_size} байт "
-                            f"(ожидалось {expected_size} байт)"
-                        )
-                    
-                    logger.info(f"Файл успешно извлечен: {full_output_path}")
-                    return full_output_path
+                # Проверяем результат
+                actual_size = os.path.getsize(full_output_path)
+                expected_size = len(entry.preload_data or b'') + entry.entry_length
+                if actual_size != expected_size:
+                    logger.error(f"Неверный размер файла: {actual_size} байт (ожидалось {expected_size})")
+                    raise VPKError(
+                        f"Неверный размер извлеченного файла: {actual_size} байт "
+                        f"(ожидалось {expected_size} байт)"
+                    )
                 
-                finally:
-                    if entry.archive_index != 0x7fff and archive != self._file_handle:
-                        archive.close()
+                logger.info(f"Файл успешно извлечен: {full_output_path}")
+                return full_output_path
                         
             except Exception as e:
                 logger.error(f"Ошибка при извлечении данных: {str(e)}")
@@ -504,7 +626,7 @@ class VPKReader:
             print(f"- CRC32: {hex(entry.crc32)}")
             
             # Проверяем архивный файл
-            archive_path = f"{self.base_path}_{entry.archive_index:03d}.vpk"
+            archive_path = self._archive_path(entry.archive_index)
             if os.path.exists(archive_path):
                 print(f"✓ Архивный файл найден: {archive_path}")
                 print(f"  Размер архива: {os.path.getsize(archive_path):,} байт")
@@ -516,99 +638,16 @@ class VPKReader:
             dir_path = os.path.dirname(norm_path)
             base_name = os.path.splitext(os.path.basename(norm_path))[0].lower()
             
-            for entry_path in self.entries:
-                entry_dir = os.path.dirname(entry_path)
-                entry_base = os.path.splitext(os.path.basename(entry_path))[0].lower()
-                
-                if dir_path == entry_dir or base_name in entry_base:
-                    print(f"- {entry_path}")
+            similar = set(self.list_directory(dir_path))
+            # Совпадение по имени ищем по директориям индекса, без нормализации каждого пути
+            for directory, paths in self._directories.items():
+                for entry_path in paths:
+                    entry_base = os.path.splitext(entry_path[len(directory):].lstrip('/'))[0]
+                    if base_name in entry_base:
+                        similar.add(entry_path)
+            for entry_path in sorted(similar):
+                print(f"- {entry_path}")
 
     def _get_archive_handle(self, archive_index: int) -> BinaryIO:
-        """Получает файловый дескриптор для архива, используя кэш"""
-        if archive_index == 0x7fff:
-            return self._file_handle
-            
-        if archive_index in self._archive_handles:
-            handle = self._archive_handles[archive_index]
-            handle.seek(0)  # Сбрасываем позицию на начало
-            return handle
-            
-        archive_path = self.dir_path.parent / f"{self.dir_path.stem}_{archive_index:03d}.vpk"
-        if not archive_path.exists():
-            raise VPKError(f"Архив не найден: {archive_path}")
-            
-        handle = open(archive_path, 'rb')
-        self._archive_handles[archive_index] = handle
-        return handle
-
-    def _read_header(self):
-        """Чтение заголовка VPK"""
-        with open(self.dir_path, 'rb') as f:
-            signature = struct.unpack('<I', f.read(4))[0]
-            if signature != self.SIGNATURE:
-                raise VPKParseError(f"Неверная сигнатура VPK: {hex(signature)}")
-            version = struct.unpack('<I', f.read(4))[0]
-            tree_size = struct.unpack('<I', f.read(4))[0]
-            self._header = (signature, version, tree_size)
-            # Для версии 2 читаем дополнительные поля
-            if version == 2:
-                self._file_data_section_size = struct.unpack('<I', f.read(4))[0]
-                self._archive_md5_section_size = struct.unpack('<I', f.read(4))[0]
-                self._other_md5_section_size = struct.unpack('<I', f.read(4))[0]
-                self._signature_section_size = struct.unpack('<I', f.read(4))[0]
-            else:
-                self._file_data_section_size = 0
-                self._archive_md5_section_size = 0
-                self._other_md5_section_size = 0
-                self._signature_section_size = 0
-
-    def _read_directory_tree(self):
-        """Чтение дерева файлов VPK"""
-        with open(self.dir_path, 'rb') as f:
-            # Пропускаем заголовок
-            version = self._header[1]
-            header_size = 8 if version == 1 else 28
-            f.seek(header_size)
-            while True:
-                extension = self._read_cstring(f)
-                if not extension:
-                    break
-                while True:
-                    path = self._read_cstring(f)
-                    if not path:
-                        break
-                    while True:
-                        filename = self._read_cstring(f)
-                        if not filename:
-                            break
-                        full_path = os.path.join(path, filename).replace('\\', '/').strip('/')
-                        if extension:
-                            full_path = f"{full_path}.{extension}"
-                        crc32 = struct.unpack('<I', f.read(4))[0]
-                        preload_bytes = struct.unpack('<H', f.read(2))[0]
-                        archive_index = struct.unpack('<H', f.read(2))[0]
-                        entry_offset = struct.unpack('<I', f.read(4))[0]
-                        entry_length = struct.unpack('<I', f.read(4))[0]
-                        terminator = struct.unpack('<H', f.read(2))[0]
-                        preload_data = f.read(preload_bytes) if preload_bytes > 0 else b''
-                        entry = VPKEntry(
-                            path=full_path,
-                            archive_index=archive_index,
-                            entry_offset=entry_offset,
-                            entry_length=entry_length,
-                            preload_bytes=preload_bytes,
-                            preload_data=preload_data,
-                            crc32=crc32
-                        )
-                        self.entries[full_path.lower()] = entry
-                        if terminator != 0xFFFF:
-                            raise VPKParseError(f"Неверный терминатор для {full_path}: {hex(terminator)}")
-
-    def _read_cstring(self, f: BinaryIO) -> str:
-        chars = []
-        while True:
-            c = f.read(1)
-            if c == b'\x00' or c == b'':
-                break
-            chars.append(c)
-        return b''.join(chars).decode('utf-8', errors='replace')
+        """Получает файловый дескриптор для архива из пула"""
+        return self._get_archive(archive_index)[0]
@@ -1,8 +1,28 @@
 # -*- coding: utf-8 -*-
 
+from typing import List, NamedTuple
+
 from .buffer import Buffer
 
 
+class MipLevel(NamedTuple):
+    """
+    A single level of the mipmap chain (first frame, first face, first slice)
+
+    Attributes:
+        * level: the mipmap level, 0 being the hi-res image (integer)
+        * width: the level width (integer)
+        * height: the level height (integer)
+        * offset: the position of the level data in the VTF file (integer)
+        * size: the size of the level data in bytes (integer)
+    """
+    level: int
+    width: int
+    height: int
+    offset: int
+    size: int
+
+
 class Header:
     """
     A class to parse a VTF file's header data, according to Valve's specifications:
@@ -13,19 +33,38 @@ class Header:
         * height: the hi-res image height (integer)
         * image_format: an id refering to the image format used for the hi-res image (integer)
         * version: the VTF version (string)
+        * flags: the texture flags (integer)
+        * frames: the number of animation frames (integer)
+        * mipmap_count: the number of mipmap levels, including the hi-res image (integer)
+        * lowres_image_format: an id refering to the image format of the low-res thumbnail (integer)
+        * lowres_width: the low-res thumbnail width (integer)
+        * lowres_height: the low-res thumbnail height (integer)
+        * depth: the texture depth (integer)
+        * mipmaps: the mipmap chain, from the hi-res image down to the smallest level (list of MipLevel)
     """
 
+    # Resource tags for VTF 7.3+
+    RESOURCE_LOWRES = b"\x01\x00\x00"
+    RESOURCE_HIGHRES = b"\x30\x00\x00"
+
+    FLAG_ENVMAP = 0x4000
+    NO_IMAGE = 0xFFFFFFFF
+
     def __init__(self, buffer: Buffer):
         signature = buffer.read_char(4)
         version_major = buffer.read_uint32()
         version_minor = buffer.read_uint32()
 
-        buffer.skip(4)
+        self.header_size = buffer.read_uint32()
 
         self.width = buffer.read_ushort()
         self.height = buffer.read_ushort()
 
-        buffer.skip(4 + 2 + 2 + 4 + 4 * 3 + 4 + 4)
+        self.flags = buffer.read_uint32()
+        self.frames = buffer.read_ushort()
+        self.first_frame = buffer.read_ushort()
+
+        buffer.skip(4 + 4 * 3 + 4 + 4)
 
         self.image_format = buffer.read_uint32()
 
@@ -36,3 +75,59 @@ class Header:
             raise TypeError("Incompatible VTF version")
 
         self.version = f"{version_major}.{version_minor}"
+
+        self.mipmap_count = buffer.read_uint8()
+        self.lowres_image_format = buffer.read_uint32()
+        self.lowres_width = buffer.read_uint8()
+        self.lowres_height = buffer.read_uint8()
+        self.depth = buffer.read_ushort()
+
+        self._resources = {}
+        if version_minor >= 3:
+            buffer.skip(3)
+            resource_count = buffer.read_uint32()
+            buffer.skip(8)
+            for _ in range(resource_count):
+                tag = buffer.read_char(3)
+                buffer.skip(1)
+                self._resources[tag] = buffer.read_uint32()
+
+        self.mipmaps = self._build_mipmaps()
+
+    @property
+    def faces(self) -> int:
+        """
+        The number of faces per frame: 6 for environment maps, 1 otherwise
+        """
+        return 6 if self.flags & self.FLAG_ENVMAP else 1
+
+    def _build_mipmaps(self) -> List[MipLevel]:
+        """
+        Compute the offset and size of each mipmap level. Levels are stored
+        from the smallest to the largest, each holding all frames, faces and slices.
+        :return: the mipmap chain, hi-res level first
+        """
+        # Импорт здесь: модули форматов сами импортируют Header
+        from .image_formats import get_parser
+
+        image_parser = get_parser(self.image_format)
+        if image_parser is None:
+            return []
+
+        offset = self._resources.get(self.RESOURCE_HIGHRES)
+        if offset is None:
+            offset = self.header_size
+            lowres_parser = get_parser(self.lowres_image_format)
+            if self.lowres_image_format != self.NO_IMAGE and lowres_parser and self.lowres_width:
+                offset += lowres_parser(self, None, self.lowres_width, self.lowres_height).image_size
+
+        mipmaps = []
+        for level in reversed(range(max(self.mipmap_count, 1))):
+            width = max(1, self.width >> level)
+            height = max(1, self.height >> level)
+            depth = max(1, self.depth >> level)
+            size = image_parser(self, None, width, height).image_size
+            mipmaps.append(MipLevel(level, width, height, offset, size))
+            offset += size * max(self.frames, 1) * self.faces * depth
+        mipmaps.reverse()
+        return mipmaps
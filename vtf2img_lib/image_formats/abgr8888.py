@@ -5,7 +5,4 @@ from .rgba8888 import RGBA8888
 
 class ABGR8888(RGBA8888):
     id = 1
-
-    @staticmethod
-    def _sort_pixel_rgba(pixel):
-        return [pixel[3], pixel[2], pixel[1], pixel[0]]
+    CHANNEL_ORDER = (3, 2, 1, 0)
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from typing import List
+from typing import List, Optional, Union
 
 from PIL import Image
 import sys
@@ -34,16 +34,36 @@ class AbstractFormat:
     def image_size(self) -> int:
         raise NotImplementedError
 
-    def __init__(self, header: Header, buffer: Buffer):
+    def __init__(self, header: Header, buffer: Buffer, width: Optional[int] = None, height: Optional[int] = None):
+        """
+        :param header: the VTF header
+        :param buffer: the VTF data
+        :param width: the width of the image to decode, the hi-res width by default
+        :param height: the height of the image to decode, the hi-res height by default
+        """
         self.header = header
         self.buffer = buffer
+        self.width = header.width if width is None else width
+        self.height = header.height if height is None else height
 
-    def read(self) -> Image:
-        position = (self.buffer.getbuffer().nbytes) - self.image_size
-        self.buffer.seek(position)
+    def read(self, offset: Optional[int] = None) -> Image:
+        """
+        Decode the image
+        :param offset: the position of the image data, the last `image_size` bytes of the buffer by default
+        :return: a Pillow's Image instance
+        """
+        if offset is None:
+            offset = (self.buffer.getbuffer().nbytes) - self.image_size
+        self.buffer.seek(offset)
         rgba_pixels = self._convert_to_rgba()
-        rgba_pixels = bytes(rgba_pixels)
-        return Image.frombytes("RGBA", (self.header.width, self.header.height), rgba_pixels)
+        if isinstance(rgba_pixels, list):
+            rgba_pixels = bytes(rgba_pixels)
+        # Массив/буфер RGBA передается в Pillow без дополнительного копирования в bytes
+        return Image.frombuffer("RGBA", (self.width, self.height), rgba_pixels, "raw", "RGBA", 0, 1)
 
-    def _convert_to_rgba(self) -> List[int]:
+    def _convert_to_rgba(self) -> Union[List[int], bytes, "np.ndarray"]:
+        """
+        Decode the image at the current buffer position
+        :return: RGBA pixels as a flat list of ints, a bytes-like object or a contiguous uint8 array
+        """
         raise NotImplementedError
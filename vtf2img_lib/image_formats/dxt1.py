@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 
-import itertools
 import math
 
+import numpy as np
+
 from .abstract_format import AbstractFormat
 
 
@@ -12,63 +13,73 @@ class DXT1(AbstractFormat):
 
     # adapted from the C program vtf2png by Harry Jeffery
     # https://github.com/eXeC64/vtf2png
+    # All blocks are decoded at once with NumPy: the compressed data is viewed
+    # as a structured array, palettes and indices are computed per block and
+    # the 4x4 tiles are rearranged into an (height, width, 4) RGBA array.
+
+    BLOCK_DTYPE = np.dtype([("c0", "<u2"), ("c1", "<u2"), ("ci", "<u4")])
 
     @property
     def image_size(self):
-        return math.ceil(self.header.width / 4) * math.ceil(self.header.height / 4) * 8
-
-    @staticmethod
-    def rgb565_to_rgb888(pixel):
-        r = (pixel >> 11) & 31
-        r = (r << 3) | (r >> 2)
-
-        g = (pixel >> 5) & 63
-        g = (g << 2) | (g >> 4)
-
-        b = (pixel >> 0) & 31
-        b = (b << 3) | (b >> 2)
-        return r, g, b
-
-    def decode_dxt_colors(self, x, y, c0, c1, ci, decoded):
-        r = [0, 0, 0, 0]
-        g = [0, 0, 0, 0]
-        b = [0, 0, 0, 0]
+        return math.ceil(self.width / 4) * math.ceil(self.height / 4) * 8
 
-        r[0], g[0], b[0] = self.rgb565_to_rgb888(c0)
-        r[1], g[1], b[1] = self.rgb565_to_rgb888(c1)
-
-        r[2] = (4 * r[0] + 2 * r[1] + 3) // 6
-        g[2] = (4 * g[0] + 2 * g[1] + 3) // 6
-        b[2] = (4 * b[0] + 2 * b[1] + 3) // 6
+    @property
+    def _blocks_shape(self):
+        return math.ceil(self.height / 4), math.ceil(self.width / 4)
 
-        r[3] = (2 * r[0] + 4 * r[1] + 3) // 6
-        g[3] = (2 * g[0] + 4 * g[1] + 3) // 6
-        b[3] = (2 * b[0] + 4 * b[1] + 3) // 6
+    def _read_blocks(self, dtype):
+        blocks_y, blocks_x = self._blocks_shape
+        raw = self.buffer.read(blocks_y * blocks_x * dtype.itemsize)
+        return np.frombuffer(raw, dtype=dtype, count=blocks_y * blocks_x)
 
-        for y0 in range(4):
-            for x0 in range(4):
-                decoded[y + y0][4 * x + 4 * x0 + 0] = r[ci & 3]
-                decoded[y + y0][4 * x + 4 * x0 + 1] = g[ci & 3]
-                decoded[y + y0][4 * x + 4 * x0 + 2] = b[ci & 3]
-                ci >>= 2
-        return decoded
+    @staticmethod
+    def rgb565_to_rgb888(pixels):
+        """
+        Expand RGB565 values to RGB888
+        :param pixels: an integer array of RGB565 values
+        :return: an (..., 3) int32 array
+        """
+        pixels = pixels.astype(np.int32)
+        r = (pixels >> 11) & 31
+        g = (pixels >> 5) & 63
+        b = pixels & 31
+        return np.stack(((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)), axis=-1)
+
+    @classmethod
+    def decode_dxt_colors(cls, c0, c1, ci):
+        """
+        Decode the color part of DXT blocks
+        :param c0: first endpoint of each block (RGB565)
+        :param c1: second endpoint of each block (RGB565)
+        :param ci: 32-bit 2bpp index of each block
+        :return: an (blocks, 16, 3) uint8 array, pixels in row-major order inside a block
+        """
+        color0 = cls.rgb565_to_rgb888(c0)
+        color1 = cls.rgb565_to_rgb888(c1)
+        palette = np.stack((
+            color0,
+            color1,
+            (4 * color0 + 2 * color1 + 3) // 6,
+            (2 * color0 + 4 * color1 + 3) // 6,
+        ), axis=1).astype(np.uint8)
+
+        shifts = np.arange(16, dtype=np.uint32) * 2
+        indices = (ci.astype(np.uint32)[:, None] >> shifts) & 3
+        return palette[np.arange(len(ci))[:, None], indices]
+
+    def _untile(self, pixels):
+        """
+        Rearrange per-block pixels into an image
+        :param pixels: an (blocks, 16, 4) uint8 array
+        :return: a contiguous (height, width, 4) uint8 array
+        """
+        blocks_y, blocks_x = self._blocks_shape
+        image = pixels.reshape(blocks_y, blocks_x, 4, 4, 4).transpose(0, 2, 1, 3, 4)
+        image = image.reshape(blocks_y * 4, blocks_x * 4, 4)
+        return np.ascontiguousarray(image[:self.height, :self.width])
 
     def _convert_to_rgba(self):
-        decoded = [[0xFF] * 4 * self.header.width for _ in range(self.header.height)]
-        for y in range(0, self.header.height, 4):
-            for x in range(0, self.header.width, 4):
-                c0 = self.buffer.read_uint8()
-                c0 |= self.buffer.read_uint8() << 8
-                c1 = self.buffer.read_uint8()
-                c1 |= self.buffer.read_uint8() << 8
-                ci = 0
-                for i in range(0, 25, 8):
-                    ci |= self.buffer.read_uint8() << i
-
-                self.decode_dxt_colors(x, y, c0, c1, ci, decoded)
-
-                for y0 in range(4):
-                    for x0 in range(4):
-                        decoded[y + y0][4 * x + 4 * x0 + 3] = 0xFF
-
-        return list(itertools.chain(*decoded))
+        blocks = self._read_blocks(self.BLOCK_DTYPE)
+        pixels = np.full((len(blocks), 16, 4), 0xFF, dtype=np.uint8)
+        pixels[:, :, :3] = self.decode_dxt_colors(blocks["c0"], blocks["c1"], blocks["ci"])
+        return self._untile(pixels)
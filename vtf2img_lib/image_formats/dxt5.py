@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 
-import itertools
 import math
 
+import numpy as np
+
 from .dxt1 import DXT1
 
 
@@ -13,44 +14,48 @@ class DXT5(DXT1):
     # adapted from the C program vtf2png by Harry Jeffery
     # https://github.com/eXeC64/vtf2png
 
+    BLOCK_DTYPE = np.dtype([
+        ("a0", "u1"), ("a1", "u1"), ("ai", "u1", (6,)),
+        ("c0", "<u2"), ("c1", "<u2"), ("ci", "<u4"),
+    ])
+
     @property
     def image_size(self):
-        return math.ceil(self.header.width / 4) * math.ceil(self.header.height / 4) * 16
+        return math.ceil(self.width / 4) * math.ceil(self.height / 4) * 16
+
+    @staticmethod
+    def decode_dxt5_alpha(a0, a1, ai):
+        """
+        Decode the alpha part of DXT5 blocks
+        :param a0: first alpha endpoint of each block
+        :param a1: second alpha endpoint of each block
+        :param ai: (blocks, 6) bytes of 3bpp alpha indices
+        :return: an (blocks, 16) uint8 array, pixels in row-major order inside a block
+        """
+        a0 = a0.astype(np.int32)[:, None]
+        a1 = a1.astype(np.int32)[:, None]
+
+        steps7 = np.arange(6, dtype=np.int32)
+        interpolated7 = ((6 - steps7) * a0 + (1 + steps7) * a1) // 7
+        steps5 = np.arange(4, dtype=np.int32)
+        interpolated5 = ((4 - steps5) * a0 + (1 + steps5) * a1) // 5
+        limits = np.broadcast_to(np.array([0x00, 0xFF], dtype=np.int32), (len(a0), 2))
+        palette = np.where(
+            a0 > a1,
+            np.concatenate((a0, a1, interpolated7), axis=1),
+            np.concatenate((a0, a1, interpolated5, limits), axis=1),
+        ).astype(np.uint8)
+
+        bits = np.zeros(len(ai), dtype=np.uint64)
+        for i in range(6):
+            bits |= ai[:, i].astype(np.uint64) << np.uint64(8 * i)
+        shifts = np.arange(16, dtype=np.uint64) * np.uint64(3)
+        indices = ((bits[:, None] >> shifts) & np.uint64(7)).astype(np.intp)
+        return palette[np.arange(len(ai))[:, None], indices]
 
     def _convert_to_rgba(self):
-        decoded = [[0xFF] * 4 * self.header.width for _ in range(self.header.height)]
-        for y in range(0, self.header.height, 4):
-            for x in range(0, self.header.width, 4):
-                alpha = [0x00] * 8
-                alpha[0] = self.buffer.read_uint8()
-                alpha[1] = self.buffer.read_uint8()
-
-                if alpha[0] > alpha[1]:
-                    for i in range(6):
-                        alpha[2 + i] = (((6 - i) * alpha[0]) + ((1 + i) * alpha[1])) // 7
-                else:
-                    for i in range(4):
-                        alpha[2 + i] = (((4 - i) * alpha[0]) + ((1 + i) * alpha[1])) // 5
-                    alpha[6] = 0x00
-                    alpha[7] = 0xFF
-
-                ai = 0
-                for i in range(0, 41, 8):
-                    ai |= self.buffer.read_uint8() << i
-
-                for y0 in range(4):
-                    for x0 in range(4):
-                        decoded[y + y0][4 * x + 4 * x0 + 3] = alpha[ai & 7]
-                        ai >>= 3
-
-                c0 = self.buffer.read_uint8()
-                c0 |= self.buffer.read_uint8() << 8
-                c1 = self.buffer.read_uint8()
-                c1 |= self.buffer.read_uint8() << 8
-                ci = 0
-                for i in range(0, 25, 8):
-                    ci |= self.buffer.read_uint8() << i
-
-                self.decode_dxt_colors(x, y, c0, c1, ci, decoded)
-
-        return list(itertools.chain(*decoded))
+        blocks = self._read_blocks(self.BLOCK_DTYPE)
+        pixels = np.empty((len(blocks), 16, 4), dtype=np.uint8)
+        pixels[:, :, 3] = self.decode_dxt5_alpha(blocks["a0"], blocks["a1"], blocks["ai"])
+        pixels[:, :, :3] = self.decode_dxt_colors(blocks["c0"], blocks["c1"], blocks["ci"])
+        return self._untile(pixels)
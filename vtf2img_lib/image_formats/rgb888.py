@@ -6,3 +6,4 @@ from .rgba8888 import RGBA8888
 class RGB888(RGBA8888):
     id = 2
     has_alpha = False
+    CHANNEL_ORDER = (0, 1, 2)
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
 from .abstract_format import AbstractFormat
 
 
@@ -7,25 +9,24 @@ class RGBA8888(AbstractFormat):
     id = 0
     has_alpha = True
 
+    # Indices of the source channels that give R, G, B (and A) of the output pixel
+    CHANNEL_ORDER = (0, 1, 2, 3)
+
     @property
     def _pixel_size(self):
         return 4 if self.has_alpha else 3
 
     @property
     def image_size(self):
-        return self.header.width * self.header.height * self._pixel_size
-
-    @staticmethod
-    def _sort_pixel_rgba(pixel):
-        return pixel
+        return self.width * self.height * self._pixel_size
 
     def _convert_to_rgba(self):
-        decoded = []
-        for y in range(self.header.height):
-            for x in range(self.header.width):
-                pixel = [self.buffer.read_uint8() for _ in range(self._pixel_size)]
-                pixel = self._sort_pixel_rgba(pixel)
-                if not self.has_alpha:
-                    pixel.append(0xFF)
-                decoded.extend(pixel)
-        return decoded
+        height, width = self.height, self.width
+        raw = self.buffer.read(self.image_size)
+        pixels = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, self._pixel_size)
+        if self.has_alpha:
+            return np.ascontiguousarray(pixels[:, :, self.CHANNEL_ORDER])
+        rgba = np.empty((height, width, 4), dtype=np.uint8)
+        rgba[:, :, :3] = pixels[:, :, self.CHANNEL_ORDER]
+        rgba[:, :, 3] = 0xFF
+        return rgba
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
+from typing import Optional, Union
+
 from PIL import Image
 
 from .buffer import Buffer
-from .header import Header
+from .header import Header, MipLevel
 from .image_formats import get_parser
 
 
@@ -11,18 +13,35 @@ class Parser:
     """
     Parse a VTF file to extract its header information and its hi-res image.
 
+    The VTF data is read once (from disk or from memory) and kept in a single
+    buffer shared by the header and the image decoder.
+
     Attributes:
         * header: a Header instance for the current VTF file
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: Optional[str] = None, data: Optional[Union[bytes, bytearray, memoryview]] = None):
         """
         Create a new Parser instance for the given VTF file
         :param path: the path to the VTF file
+        :param data: the VTF file content, used instead of `path` when given
         """
+        if path is None and data is None:
+            raise ValueError("Either a path or VTF data is required")
         self.path = path
+        self._data = data
+        self._buffer = None
         self._header = None
 
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> "Parser":
+        """
+        Create a new Parser instance for VTF data already in memory (e.g. read from a VPK)
+        :param data: the VTF file content
+        :return: a Parser instance
+        """
+        return cls(data=data)
+
     @property
     def header(self):
         if not self._header:
@@ -30,9 +49,14 @@ class Parser:
         return self._header
 
     def _get_buffer(self) -> Buffer:
-        with open(self.path, "rb") as f:
-            data = f.read()
-        return Buffer(data)
+        if self._buffer is None:
+            if self._data is None:
+                with open(self.path, "rb") as f:
+                    self._data = f.read()
+            self._buffer = Buffer(self._data)
+            # Buffer держит собственную копию данных
+            self._data = None
+        return self._buffer
 
     def _parse_header(self) -> Header:
         """
@@ -40,13 +64,37 @@ class Parser:
         :return: a Header instance
         """
         buffer = self._get_buffer()
+        buffer.seek(0)
         return Header(buffer)
 
-    def get_image(self) -> Image:
+    def get_mipmap(self, max_size: Optional[int] = None) -> Optional[MipLevel]:
+        """
+        Select the smallest mipmap level whose largest side is at least `max_size`
+        :param max_size: the requested size in pixels, the hi-res level when omitted
+        :return: a MipLevel instance, or None when the mipmap chain is unknown
+        """
+        mipmaps = self.header.mipmaps
+        if not mipmaps:
+            return None
+        if max_size is None:
+            return mipmaps[0]
+        for mipmap in reversed(mipmaps):
+            if max(mipmap.width, mipmap.height) >= max_size:
+                return mipmap
+        return mipmaps[0]
+
+    def get_image(self, max_size: Optional[int] = None) -> Image:
         """
-        Parse the hi-res image from the VTF file
+        Parse an image from the VTF file. Only the selected mipmap level is decoded.
+        :param max_size: the requested size in pixels; the smallest mipmap level at
+            or above this size is decoded instead of the hi-res image
         :return: a Pillow's Image instance
         """
+        header = self.header
         buffer = self._get_buffer()
-        image_parser = get_parser(self.header.image_format)(self.header, buffer)
-        return image_parser.read()
+        mipmap = self.get_mipmap(max_size)
+        if mipmap is None or mipmap.offset + mipmap.size > buffer.getbuffer().nbytes:
+            # Цепочка мипмапов не совпала с файлом: читаем hi-res с конца, как раньше
+            return get_parser(header.image_format)(header, buffer).read()
+        image_parser = get_parser(header.image_format)(header, buffer, mipmap.width, mipmap.height)
+        return image_parser.read(mipmap.offset)